@@ -0,0 +1,225 @@
+"""
+Deterministic generator of synthetic game files for benchmarks.
+
+Every game is built move by move for a given board setup and outcome,
+so the same setup and outcome always give the same game file.
+"""
+
+import heapq
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from game_solver.bitboard import has_run
+
+# Cells (column, row) of a winning line of a given length, by direction
+LINES = {
+    "vertical": lambda length: [(0, row) for row in range(length)],
+    "horizontal": lambda length: [(column, 0) for column in range(length)],
+    "right_diagonal": lambda length: [(index, index) for index in range(length)],
+    "left_diagonal": lambda length: [
+        (index, length - 1 - index) for index in range(length)
+    ],
+}
+
+WIN_OUTCOMES = tuple(
+    f"player_{player}_win_{direction}" for player in (1, 2) for direction in LINES
+)
+ERROR_OUTCOMES = (
+    "incomplete_game",
+    "illegal_continue",
+    "illegal_row",
+    "illegal_column",
+    "illegal_game",
+    "illegal_file",
+    "file_error",
+)
+OUTCOMES = WIN_OUTCOMES + ("draw",) + ERROR_OUTCOMES
+
+# Content of a game file that can't be decoded as text
+UNREADABLE_GAME = b"\xff\xfe\x00\x00\xc3\x28"
+
+
+class Position:
+    """
+    A board that keeps one bitmask per player, used to
+    make sure that generated moves don't win by accident.
+    """
+
+    def __init__(self, width: int, height: int, winning_moves: int) -> None:
+        self.width = width
+        self.height = height
+        self.winning_moves = winning_moves
+        self.stride = height + 1
+        self.shifts = (1, self.stride, self.stride + 1, self.stride - 1)
+        self.heights = [0] * width
+        self.masks = [0, 0]
+        self.moves: List[int] = []
+
+    @property
+    def player(self) -> int:
+        """The player (1 or 2) that makes the next move"""
+        return len(self.moves) % 2 + 1
+
+    def can_play(self, column: int) -> bool:
+        return self.heights[column] < self.height
+
+    def is_winning_move(self, column: int) -> bool:
+        """Check if the next move in a column wins the game"""
+        bit = 1 << (column * self.stride + self.heights[column])
+        mask = self.masks[self.player - 1] | bit
+        return any(has_run(mask, shift, self.winning_moves) for shift in self.shifts)
+
+    def play(self, column: int) -> None:
+        bit = 1 << (column * self.stride + self.heights[column])
+        self.masks[self.player - 1] |= bit
+        self.heights[column] += 1
+        self.moves.append(column + 1)
+
+
+def get_draw_owner(column: int, row: int) -> int:
+    """
+    Get the player that owns a cell of a drawn board. Pairs of columns
+    alternate between the players from row to row, which never gives
+    more than two pieces of the same player in a row in any direction.
+    """
+    return (column // 2 + row) % 2 + 1
+
+
+@lru_cache(maxsize=1)
+def generate_draw_moves(width: int, height: int) -> Tuple[int, ...]:
+    """
+    Get moves (counted from 1) filling up the board, so that every
+    piece ends up with its drawn board owner. The lowest open cell
+    owned by the player is always taken, so the board is filled up
+    row by row, as far as the players allow.
+    """
+    # Open columns, by the player that owns the next cell in them
+    columns = {1: [], 2: []}
+    for column in range(width):
+        columns[get_draw_owner(column, 0)].append((0, column))
+
+    moves = []
+    for move in range(width * height):
+        player = move % 2 + 1
+        if not columns[player]:
+            # One player owns more cells than the other can make moves
+            raise ValueError(f"Can't fill a {width} x {height} board with a draw")
+
+        row, column = heapq.heappop(columns[player])
+        moves.append(column + 1)
+        if row + 1 < height:
+            heapq.heappush(columns[3 - player], (row + 1, column))
+    return tuple(moves)
+
+
+def generate_win_moves(
+    width: int, height: int, winning_moves: int, player: int, direction: str
+) -> List[int]:
+    """
+    Get moves (counted from 1) in which a player wins with a line in
+    a given direction. The winning line starts at the bottom left
+    corner. The other moves fill up columns below the line, or are
+    played in the remaining columns without winning the game.
+    """
+    line = LINES[direction](winning_moves)
+    if any(column >= width or row >= height for column, row in line):
+        raise ValueError(f"A {direction} line doesn't fit on the board")
+
+    targets: Dict[int, Set[int]] = {}
+    for column, row in line:
+        targets.setdefault(column, set()).add(row)
+    spare_columns = [column for column in range(width) if column not in targets]
+
+    position = Position(width, height, winning_moves)
+    while True:
+        if position.player == player:
+            for column, rows in targets.items():
+                if position.heights[column] in rows:
+                    position.play(column)
+                    rows.remove(position.heights[column] - 1)
+                    break
+            else:
+                position.play(get_filler_column(position, targets, spare_columns))
+                continue
+
+            if not any(targets.values()):
+                # The line is complete
+                return position.moves
+        else:
+            position.play(get_filler_column(position, targets, spare_columns))
+
+
+def get_filler_column(
+    position: Position, targets: Dict[int, Set[int]], spare_columns: List[int]
+) -> int:
+    """
+    Get a column for a move that does not win the game or take a cell
+    of the winning line. Columns below the line are filled up first.
+    """
+    below_line = [
+        column
+        for column, rows in targets.items()
+        if rows and position.heights[column] < min(rows)
+    ]
+    spare = sorted(spare_columns, key=lambda column: position.heights[column])
+    for column in below_line + spare:
+        if position.can_play(column) and not position.is_winning_move(column):
+            return column
+    raise ValueError("No moves left that don't win the game")
+
+
+def generate_game(
+    width: int, height: int, winning_moves: int, outcome: str
+) -> Optional[bytes]:
+    """
+    Generate the content of a game file with a given outcome.
+    Returns None if the outcome can't be generated on the board.
+    """
+    if outcome == "file_error":
+        return UNREADABLE_GAME
+
+    header = f"{width} {height} {winning_moves}\n"
+    try:
+        moves = generate_moves(width, height, winning_moves, outcome)
+    except ValueError:
+        return None
+
+    if outcome == "illegal_game":
+        header = f"{width} {height} {max(width, height) + 1}\n"
+    if outcome == "illegal_file":
+        moves.append("x")
+    return (header + "".join(f"{move}\n" for move in moves)).encode()
+
+
+def generate_moves(
+    width: int, height: int, winning_moves: int, outcome: str
+) -> List[int]:
+    """Get the moves of a game with a given outcome"""
+    if outcome.startswith("player_"):
+        player = int(outcome[len("player_")])
+        direction = outcome[len("player_1_win_") :]
+        return generate_win_moves(width, height, winning_moves, player, direction)
+
+    if outcome == "illegal_continue":
+        moves = generate_win_moves(width, height, winning_moves, 1, "vertical")
+        return moves + [moves[-1]]
+
+    if winning_moves < 3:
+        # The drawn board has two pieces of the same player in a row
+        raise ValueError("Games with less than 3 winning moves can't be drawn")
+
+    # Drawn games are cached, as most outcomes start with one
+    draw = list(generate_draw_moves(width, height))
+    if outcome == "draw":
+        return draw
+    if outcome == "illegal_row":
+        # Every column is full after a draw
+        return draw + [1]
+
+    # Other games play the first half of a drawn game
+    half = draw[: len(draw) // 2]
+    if outcome == "illegal_column":
+        return half + [width + 1]
+    if outcome in ("incomplete_game", "illegal_game", "illegal_file"):
+        return half
+    raise ValueError(f"Unknown outcome: {outcome}")
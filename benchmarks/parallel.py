@@ -0,0 +1,101 @@
+"""
+Time solving sample positions with the sequential solver and with the
+parallel solver, and report the speed-up of the parallel solver.
+
+    python -m benchmarks.parallel --workers 8
+    python -m benchmarks.parallel --workers 32 --plies 2
+
+Exits with status 1 if the parallel solver gets a different score from
+the sequential solver for any position.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+from game_solver.bitboard import BitBoard
+from game_solver.solver import ParallelSolver, Position, Solution, Solver
+
+# Positions on a 7 x 6 board with 4 winning moves, after the moves
+# (counted from 1), that take from a tenth of a second up to about
+# ten seconds to solve with one process
+POSITIONS = (
+    [7, 5, 6, 4, 5, 7, 4, 5, 2, 6, 4, 6, 4, 7, 2, 4],
+    [4, 4, 4, 4, 4, 4, 3, 3, 3, 3],
+    [4, 4, 3, 5, 4, 4, 5, 3, 3, 2],
+)
+
+
+def get_position(moves: List[int]) -> Position:
+    """Get the position after the moves on a 7 x 6 board"""
+    board = BitBoard(7, 6, 4, None)
+    board.run(moves)
+    return Position.from_board(board)
+
+
+def time_solver(create: Callable[[], Solver]) -> Tuple[Solution, float]:
+    """Get the solution of a solver and the time in seconds it took"""
+    start = time.perf_counter()
+    solution = create().solve()
+    return solution, time.perf_counter() - start
+
+
+def compare_solvers(
+    moves: List[int], workers: int, plies: Optional[int] = None
+) -> Tuple[Solution, Solution, float, float]:
+    """
+    Solve a position with one process and with a pool of processes.
+    Gets both solutions and the time each took.
+    """
+    solution, sequential = time_solver(lambda: Solver(get_position(moves)))
+    parallel_solution, parallel = time_solver(
+        lambda: ParallelSolver(get_position(moves), workers, plies)
+    )
+    return solution, parallel_solution, sequential, parallel
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Connect4 parallel solver benchmark")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of processes of the parallel solver",
+    )
+    parser.add_argument(
+        "--plies",
+        type=int,
+        help="Number of moves to split the search after (fits the workers by default)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    workers = f"{args.workers} workers"
+    print(f"{'Moves':>6}{'Score':>7}{'1 worker':>12}{workers:>12}{'Speed-up':>10}")
+    mismatches = 0
+    for moves in POSITIONS:
+        solution, parallel_solution, sequential, parallel = compare_solvers(
+            moves, args.workers, args.plies
+        )
+        if parallel_solution.score != solution.score:
+            mismatches += 1
+            print(
+                f"Mismatch after {moves}: score {parallel_solution.score}, "
+                f"expected {solution.score}"
+            )
+        print(
+            f"{len(moves):>6}{solution.score:>7}{sequential:>11.2f}s"
+            f"{parallel:>11.2f}s{sequential / parallel:>9.1f}x",
+            flush=True,
+        )
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare checking games through the exception-based API
+(Game.initialise) with the status code API (Game.play).
+
+    python -m benchmarks.status_codes
+"""
+
+import timeit
+from typing import Callable, List
+
+from game_solver.config import GameCode
+from game_solver.game import Game, GameError, GameOver
+
+# Short 7 x 6 games with 4 pieces to win, which
+# finish with every status that is not a file error
+GAMES = {
+    GameCode.PLAYER_1_WIN: [1, 2, 1, 2, 1, 2, 1],
+    GameCode.PLAYER_2_WIN: [1, 2, 1, 2, 1, 2, 3, 2],
+    GameCode.INCOMPLETE_GAME: [1, 2, 3],
+    GameCode.ILLEGAL_CONTINUE: [1, 2, 1, 2, 1, 2, 1, 2],
+    GameCode.ILLEGAL_ROW: [1, 1, 1, 1, 1, 1, 1],
+    GameCode.ILLEGAL_COLUMN: [8],
+    GameCode.ILLEGAL_FILE: [1, 0],
+}
+REPEATS = 20000
+
+
+def get_lines(moves: List[int]) -> List[str]:
+    """Get the lines of a game file"""
+    return ["7 6 4\n"] + [f"{move}\n" for move in moves]
+
+
+def check_with_exceptions(lines: List[str]) -> GameCode:
+    try:
+        Game(iter(lines)).initialise()
+    except (GameOver, GameError) as game_over:
+        return game_over.status
+
+
+def check_with_status_codes(lines: List[str]) -> GameCode:
+    return Game(iter(lines)).play()
+
+
+def time_checker(checker: Callable[[List[str]], GameCode], lines: List[str]) -> float:
+    """Get the time in microseconds that it takes to check a game"""
+    return timeit.timeit(lambda: checker(lines), number=REPEATS) / REPEATS * 1e6
+
+
+def main() -> None:
+    print(f"{'Status':<20}{'Exceptions':>12}{'Status codes':>14}{'Speed-up':>10}")
+    for status, moves in GAMES.items():
+        lines = get_lines(moves)
+        assert check_with_exceptions(lines) == check_with_status_codes(lines) == status
+
+        exceptions = time_checker(check_with_exceptions, lines)
+        status_codes = time_checker(check_with_status_codes, lines)
+        print(
+            f"{status.name:<20}{exceptions:>10.2f}us{status_codes:>12.2f}us"
+            f"{exceptions / status_codes:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
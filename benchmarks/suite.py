@@ -0,0 +1,230 @@
+"""
+Time checking generated games on boards of every size, end to end
+and per phase, and compare the results with a stored baseline.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.2
+
+Exits with status 1 if any timing is slower than the baseline by more
+than the threshold. Boards above --max-cells are left out, which keeps
+quick runs on small boards.
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from benchmarks.generator import OUTCOMES, generate_game
+from check_game import start_checking
+from game_solver.config import ENGINE_NAMES
+from game_solver.engines import get_engine
+from game_solver.game import Game, GameBoard, GameError, parse_moves
+
+# Board setups (width, height, winning moves), from the standard
+# board up to boards with a million cells
+SETUPS = (
+    (7, 6, 4),
+    (7, 6, 6),
+    (20, 20, 4),
+    (20, 20, 10),
+    (100, 100, 4),
+    (100, 100, 50),
+    (1000, 1000, 4),
+    (1000, 1000, 100),
+)
+
+# Every timing is the best average out of this many repeats
+REPEATS = 3
+
+# Each repeat calls the timed function until this many seconds pass
+MIN_TIME = 0.05
+
+# Functions that take longer than this many seconds are not repeated
+MAX_REPEAT_TIME = 1.0
+
+# Timings that are slower than the baseline by more than this fraction
+# are reported as regressions
+DEFAULT_THRESHOLD = 0.2
+
+# Phases timed for every game, besides the end to end check
+PHASES = ("setup", "parse", "run")
+
+
+def measure(prepare: Callable[[], object], run: Callable[[object], object]) -> float:
+    """
+    Get the shortest average time in seconds that `run` takes, out of
+    several repeats. `prepare` is called before every call to `run`,
+    which gets its result, and is not timed. Slow functions are only
+    timed once.
+    """
+    best = float("inf")
+    for _ in range(REPEATS):
+        total, calls = 0.0, 0
+        while total < MIN_TIME:
+            argument = prepare()
+            start = time.perf_counter()
+            run(argument)
+            total += time.perf_counter() - start
+            calls += 1
+        best = min(best, total / calls)
+        if total > MAX_REPEAT_TIME:
+            break
+    return best
+
+
+def split_game(content: bytes) -> Tuple[str, str]:
+    """Split a game file into the header and the move section"""
+    header, _, moves = content.decode().partition("\n")
+    return header + "\n", moves
+
+
+def setup_board(header: str, engine: Type[GameBoard]) -> Optional[GameBoard]:
+    """Create a board for a game, or None if the game setup is not valid"""
+    try:
+        return Game(io.StringIO(header), engine).setup()
+    except GameError:
+        return None
+
+
+def time_game(file: Path, content: bytes, engine: Type[GameBoard]) -> Dict[str, float]:
+    """
+    Time checking a game file end to end, and time its phases:
+    reading the header and creating the board, parsing the moves
+    and playing the parsed moves.
+    """
+    timings = {
+        "check": measure(lambda: file, lambda file: start_checking(file, engine))
+    }
+    try:
+        header, move_data = split_game(content)
+    except UnicodeError:
+        # Unreadable games never get past reading the file
+        return timings
+
+    timings["setup"] = measure(
+        lambda: header, lambda header: setup_board(header, engine)
+    )
+    timings["parse"] = measure(lambda: move_data, parse_moves)
+    moves, _ = parse_moves(move_data)
+    if setup_board(header, engine) is not None:
+        timings["run"] = measure(
+            lambda: setup_board(header, engine), lambda board: board.run(moves)
+        )
+    return timings
+
+
+def run_suite(
+    engine_name: str, max_cells: int, directory: Path
+) -> Dict[str, Dict[str, float]]:
+    """
+    Time every generated game on a board with up to `max_cells` cells.
+    Games are written to a directory to be checked end to end.
+    """
+    engine = get_engine(engine_name)
+    results = {}
+    for width, height, winning_moves in SETUPS:
+        if width * height > max_cells:
+            continue
+
+        for outcome in OUTCOMES:
+            content = generate_game(width, height, winning_moves, outcome)
+            if content is None:
+                continue
+
+            name = f"{width}x{height}x{winning_moves}/{outcome}"
+            file = directory / f"{width}x{height}x{winning_moves}_{outcome}.txt"
+            file.write_bytes(content)
+            results[name] = {"moves": content.count(b"\n") - 1}
+            results[name].update(time_game(file, content, engine))
+            print(f"{name:<45}{results[name]['check'] * 1e6:>14.1f}us", flush=True)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """
+    Compare timings with a baseline. Returns a description of every
+    timing that is slower than the baseline by more than `threshold`.
+    Games and phases missing from either side are not compared.
+    """
+    regressions = []
+    for name, timings in results.items():
+        for phase in ("check",) + PHASES:
+            old = baseline.get(name, {}).get(phase)
+            new = timings.get(phase)
+            if old and new and new > old * (1 + threshold):
+                regressions.append(
+                    f"{name} {phase}: {old * 1e6:.1f}us -> {new * 1e6:.1f}us "
+                    f"({new / old - 1:+.0%})"
+                )
+    return regressions
+
+
+def show_scaling(results: Dict[str, Dict[str, float]]) -> None:
+    """Print the time per move of drawn games, by board size"""
+    print(f"{'Drawn game':<20}{'Moves':>10}{'Per move':>14}")
+    for name, timings in results.items():
+        setup, _, outcome = name.partition("/")
+        if outcome == "draw":
+            per_move = timings["check"] / timings["moves"] * 1e6
+            print(f"{setup:<20}{timings['moves']:>10}{per_move:>12.2f}us")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Connect4 benchmark suite")
+    parser.add_argument("--engine", choices=ENGINE_NAMES, default="default")
+    parser.add_argument(
+        "--max-cells",
+        type=int,
+        default=10**6,
+        help="Leave out boards with more cells than this",
+    )
+    parser.add_argument("--output", type=str, help="Write the results to a JSON file")
+    parser.add_argument(
+        "--baseline", type=str, help="Compare the results with a JSON results file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slow-down (as a fraction) above which a timing is a regression",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        results = run_suite(args.engine, args.max_cells, Path(directory))
+
+    report = {
+        "engine": args.engine,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    show_scaling(results)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline["results"], args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
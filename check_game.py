@@ -1,26 +1,354 @@
+import asyncio
+import io
+import operator
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
+from typing import List, Optional, Tuple, Type
 
-from game_solver.config import GameCode
-from game_solver.game import Game
-from game_solver.helpers import ArgParser, show_summary
+from game_solver.batch import check_batch, collect_files
+from game_solver.binary import convert_text_games
+from game_solver.book import OpeningBook
+from game_solver.cache import ResultCache, get_cache_key
+from game_solver.config import UNFINISHED_STATUSES, GameCode
+from game_solver.container import check_container
+from game_solver.engines import get_engine
+from game_solver.follow import GameFollower
+from game_solver.game import Game, GameBoard, GameError, parse_moves
+from game_solver.helpers import (
+    ArgParser,
+    show_batch_summary,
+    show_cache_summary,
+    show_solution,
+    show_summary,
+)
+from game_solver.profiler import Profiler
+from game_solver.server import serve
+from game_solver.snapshot import SnapshotStore, get_digest
+from game_solver.solver import Solution, solve_game
 
 
-def start_checking(file: Path) -> str:
-    """Use the game file to make moves and play the game"""
+def start_checking(
+    file: Path,
+    engine: Type[GameBoard] = GameBoard,
+    cache: ResultCache = None,
+    snapshots: SnapshotStore = None,
+) -> str:
+    """
+    Use the game file to make moves and play the game. Results of
+    games that have been checked before are taken from the cache,
+    and games with a board snapshot only play the moves after it.
+    """
+    return check_file(file, engine, cache, snapshots=snapshots)[0]
+
+
+def check_file(
+    file: Path,
+    engine: Type[GameBoard] = GameBoard,
+    cache: ResultCache = None,
+    open_windows: bool = False,
+    stop_early: bool = False,
+    threats: bool = False,
+    snapshots: SnapshotStore = None,
+) -> Tuple[GameCode, Optional[int], Optional[int], Optional[Tuple[int, int]]]:
+    """
+    Check a game file and get its status, the line of the invalid move
+    that made it an illegal file, the move from which nobody can win,
+    if the windows each player can still complete are counted, and the
+    player who could force a win with the move from which they could,
+    if threats are tracked. Only statuses are cached, so the rest is
+    not known for results taken from the cache.
+    """
+    if cache is not None:
+        return check_cached(file, engine, cache), None, None, None
+    if snapshots is not None:
+        status, invalid_line = check_resumed(file, engine, snapshots)
+        return status, invalid_line, None, None
+
     try:
         with file.open(mode="r") as fp:
-            game = Game(fp)
-            return game.play()
+            game = Game(fp, engine, open_windows, stop_early, threats)
+            status = game.play()
+            return status, game.invalid_line, game.no_win_move, game.forced_win
     except (OSError, IOError, UnicodeError):
+        return GameCode.FILE_ERROR, None, None, None
+
+
+def check_cached(file: Path, engine: Type[GameBoard], cache: ResultCache) -> str:
+    """Check a game file, looking up its result in the cache first"""
+    try:
+        data = file.read_bytes()
+    except (OSError, IOError):
+        return GameCode.FILE_ERROR
+
+    key = get_cache_key(data, engine)
+    if (status := cache.get(key)) is not None:
+        return status
+
+    try:
+        # Decode the content in the same way as opening the file as text
+        with io.TextIOWrapper(io.BytesIO(data)) as fp:
+            status = Game(fp, engine).play()
+    except UnicodeError:
+        # Not cached as the result depends on the default encoding
         return GameCode.FILE_ERROR
 
+    cache.put(key, status)
+    return status
+
+
+def decode(data: bytes) -> str:
+    """Decode the content of a file in the same way as opening it as text"""
+    with io.TextIOWrapper(io.BytesIO(data)) as fp:
+        return fp.read()
+
+
+def run_lines(board: GameBoard, data: str) -> GameCode:
+    """Make the moves on lines of a game file and get the game status"""
+    moves, invalid = parse_moves(data)
+    if invalid is not None:
+        moves.append(None)
+    return board.run(moves)
+
+
+def check_resumed(
+    file: Path, engine: Type[GameBoard], snapshots: SnapshotStore
+) -> Tuple[GameCode, Optional[int]]:
+    """
+    Check a game file, carrying on from the snapshot of its board that
+    was taken the last time it was checked, so that only the moves
+    appended since then are played. Gets the status and the line of
+    the invalid move, if there is one. A new snapshot is taken after
+    the last complete line with a valid move, as the last line may
+    still be written to.
+    """
+    path = str(file.resolve())
+    try:
+        data = file.read_bytes()
+    except (OSError, IOError):
+        return GameCode.FILE_ERROR, None
+
+    # Moves start after the header line
+    offset = data.find(b"\n") + 1 or len(data)
+    header = data[:offset]
+    snapshot = None
+    if (stored := snapshots.get(path)) is not None:
+        stored_offset, digest, stored_snapshot = stored
+        # Files that have been rewritten since are checked again
+        if stored_offset <= len(data) and get_digest(data[:stored_offset]) == digest:
+            offset, snapshot = stored_offset, stored_snapshot
+
+    end = max(offset, data.rfind(b"\n") + 1)
+    try:
+        setup = decode(header).rstrip("\n")
+        complete, rest = decode(data[offset:end]), decode(data[end:])
+    except UnicodeError:
+        return GameCode.FILE_ERROR, None
+
+    game = Game(None, engine)
+    try:
+        board = game.create_board(*game.parse_header(setup))
+    except GameError as game_error:
+        return game_error.status, None
+    if snapshot is not None:
+        board.restore_snapshot(snapshot)
+
+    moves = board.total_moves
+    status = run_lines(board, complete)
+    if played := board.total_moves - moves:
+        lines = data[offset:end].split(b"\n")
+        # Lone carriage returns are new lines in text, so lines can't be
+        # told apart by their offsets
+        if len(lines) == complete.count("\n") + 1:
+            offset += sum(map(len, lines[:played])) + played
+            snapshot = board.get_snapshot()
+            snapshots.put(path, offset, get_digest(data[:offset]), snapshot)
+
+    if rest and status in UNFINISHED_STATUSES:
+        status = run_lines(board, rest)
+    return status, board.invalid_line
+
+
+def start_solving(
+    file: Path,
+    time_limit: Optional[float] = None,
+    workers: int = 1,
+    book_file: Optional[Path] = None,
+) -> None:
+    """
+    Solve the game after the moves in a game file with a pool of
+    worker processes and print the solution, or the best move found
+    within the time limit. Positions are looked up in the opening
+    book file, if one is given.
+    """
+    try:
+        with (
+            OpeningBook(book_file) if book_file is not None else nullcontext()
+        ) as book, file.open(mode="r") as fp:
+            solution = solve_game(fp, time_limit, workers, book)
+    except (OSError, IOError, UnicodeError, ValueError):
+        solution = Solution(GameCode.FILE_ERROR)
+    show_solution(solution.status, solution.score, solution.best_move, solution.depth)
+
+
+def start_batch(
+    patterns: List[str],
+    engine: Type[GameBoard],
+    workers: int,
+    cache: ResultCache = None,
+    snapshots: SnapshotStore = None,
+) -> None:
+    """Check every game file matching the patterns and print the results"""
+    files = collect_files(patterns)
+    checker = partial(start_checking, engine=engine, cache=cache, snapshots=snapshots)
+    statuses = Counter()
+    if cache is not None:
+        counters = cache.get_counters()
+
+    start = time.perf_counter()
+    for file, status in check_batch(files, checker, workers):
+        statuses[status] += 1
+        print(f"{file}: {status.name}")
+
+    show_batch_summary(statuses, time.perf_counter() - start)
+    if cache is not None:
+        # Worker processes count their own hits and misses in the cache file
+        hits, misses = map(operator.sub, cache.get_counters(), counters)
+        show_cache_summary(hits, misses)
+
+
+def start_following(patterns: List[str], engine: Type[GameBoard]) -> None:
+    """
+    Follow every game file matching the patterns as moves are appended
+    to them and print every change of their status, until they are all
+    finished or following is interrupted
+    """
+    with GameFollower(collect_files(patterns), engine) as follower:
+        try:
+            for file, status, moves in follower.follow():
+                print(f"{file}: {status.name} after {moves} moves", flush=True)
+        except KeyboardInterrupt:
+            pass
+
+
+def start_conversion(patterns: List[str], output: Path) -> None:
+    """Convert every game file matching the patterns into a binary archive"""
+    files = collect_files(patterns)
+    skipped = convert_text_games(files, output)
+    for file in skipped:
+        print(f"{file}: skipped")
+    print(f"Converted {len(files) - len(skipped)} games into {output}")
+
+
+def start_container(
+    file: Path, engine: Type[GameBoard], lockstep: bool = False
+) -> None:
+    """Check every game in a container file and print the results"""
+    statuses = Counter()
+    results = check_container(file, engine, lockstep)
+
+    start = time.perf_counter()
+    try:
+        for index, status in enumerate(results, 1):
+            statuses[status] += 1
+            print(f"{index}: {status.name}")
+    except (OSError, IOError, UnicodeError, ValueError):
+        statuses[GameCode.FILE_ERROR] += 1
+        show_summary(GameCode.FILE_ERROR)
+
+    show_batch_summary(statuses, time.perf_counter() - start)
+
+
+def start_serving(address: str, engine: Type[GameBoard], workers: int) -> None:
+    """Run a server checking games sent to it until it is interrupted"""
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        # Games are still checked off the event loop
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    with executor:
+        try:
+            asyncio.run(serve(address, engine, executor))
+        except KeyboardInterrupt:
+            pass
+
+
+def dispatch(
+    arg_parser: ArgParser, engine: Type[GameBoard], workers: Optional[int] = None
+) -> None:
+    """
+    Check games in the mode chosen by the arguments. The number
+    of worker processes is taken from the arguments, unless given.
+    """
+    if (patterns := arg_parser.get_batch_patterns()) and (
+        output := arg_parser.get_conversion_output()
+    ):
+        start_conversion(patterns, output)
+        return
+
+    if follow_patterns := arg_parser.get_follow_patterns():
+        start_following(follow_patterns, engine)
+        return
+
+    if address := arg_parser.get_serve_address():
+        start_serving(address, engine, workers or arg_parser.get_workers())
+        return
+
+    cache = None
+    if cache_path := arg_parser.get_cache_path():
+        cache = ResultCache(cache_path, arg_parser.get_cache_size())
+
+    snapshots = None
+    if snapshot_path := arg_parser.get_snapshot_path():
+        snapshots = SnapshotStore(snapshot_path)
+
+    if patterns:
+        start_batch(
+            patterns, engine, workers or arg_parser.get_workers(), cache, snapshots
+        )
+        return
+
+    if container := arg_parser.get_container():
+        start_container(container, engine, arg_parser.get_lockstep())
+        return
+
+    file = arg_parser.get_path()
+    if arg_parser.get_solve():
+        start_solving(
+            file,
+            arg_parser.get_time_limit(),
+            workers or arg_parser.get_workers(),
+            arg_parser.get_book_path(),
+        )
+        return
+
+    status, invalid_line, no_win_move, forced_win = check_file(
+        file,
+        engine,
+        cache,
+        arg_parser.get_open_windows(),
+        arg_parser.get_stop_early(),
+        arg_parser.get_threats(),
+        snapshots,
+    )
+    show_summary(status, invalid_line, no_win_move, forced_win)
+
 
 def main() -> None:
     arg_parser = ArgParser()
-    file = arg_parser.get_path()
+    engine = get_engine(arg_parser.get_engine_name())
+    if not arg_parser.get_profile():
+        dispatch(arg_parser, engine)
+        return
 
-    status = start_checking(file)
-    show_summary(status)
+    # Games are checked in this process, so that they can be profiled
+    with Profiler(engine) as profiler:
+        dispatch(arg_parser, engine, workers=1)
+    print(profiler.report())
 
 
 if __name__ == "__main__":
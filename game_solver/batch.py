@@ -0,0 +1,65 @@
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from game_solver.config import GameCode
+
+# The largest number of files sent to a worker process in one go
+MAX_CHUNK_SIZE = 256
+
+
+def collect_files(patterns: Iterable[str]) -> List[Path]:
+    """
+    Expand directories and glob patterns into a sorted list of files.
+    Directories are searched recursively. Anything else that is not
+    a glob pattern is treated as a path to a single game file.
+    """
+    files = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            files.update(file for file in path.rglob("*") if file.is_file())
+        elif glob.has_magic(pattern):
+            files.update(
+                Path(file)
+                for file in glob.iglob(pattern, recursive=True)
+                if Path(file).is_file()
+            )
+        else:
+            # Keep missing files so that they are reported as file errors
+            files.add(path)
+    return sorted(files)
+
+
+def get_chunk_size(total_files: int, workers: int) -> int:
+    """
+    Get the number of files to submit to a worker process in one task.
+    Every worker gets a few chunks so that the work stays balanced,
+    while the chunks are large enough to avoid per-file overheads.
+    """
+    chunk_size = total_files // (workers * 4)
+    return max(1, min(chunk_size, MAX_CHUNK_SIZE))
+
+
+def check_batch(
+    files: List[Path],
+    checker: Callable[[Path], GameCode],
+    workers: int,
+    chunk_size: Optional[int] = None,
+) -> Iterator[Tuple[Path, GameCode]]:
+    """
+    Check every game file with a pool of worker processes.
+    Results are yielded in the same order as the files.
+    """
+    if workers <= 1:
+        # Not worth starting a process pool for a single worker
+        for file in files:
+            yield file, checker(file)
+        return
+
+    if chunk_size is None:
+        chunk_size = get_chunk_size(len(files), workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from zip(files, pool.map(checker, files, chunksize=chunk_size))
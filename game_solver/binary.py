@@ -0,0 +1,245 @@
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Type
+
+from game_solver.config import GameCode
+from game_solver.game import Game, GameBoard, GameError
+from game_solver.vectorized import LOCKSTEP_BATCH_SIZE, check_lockstep_stream
+
+# File layout (all values are little-endian):
+#  - file header: magic, format version, number of games, index offset
+#  - game records: width, height, winning moves, move size, number
+#    of moves, followed by the moves and padding to an even offset
+#  - index: offset of every game record as uint64
+MAGIC = b"C4GB"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHxxQQ")
+GAME_HEADER = struct.Struct("<IIIHxxI")
+INDEX_TYPECODE = "Q"
+
+# The largest value that can be stored in a game header field
+MAX_HEADER_VALUE = 2**32 - 1
+
+# Array typecodes for moves, by the number of bytes taken up by each move
+MOVE_TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+
+def get_move_size(width: int) -> int:
+    """
+    Get the number of bytes needed to store every move on a board.
+    Moves to the right of the board are stored as `width + 1`.
+    """
+    for size in sorted(MOVE_TYPECODES):
+        if width + 1 < 2 ** (8 * size):
+            return size
+    raise ValueError(f"Board is too wide to be stored: {width}")
+
+
+def to_little_endian(values: array) -> bytes:
+    """Get the bytes of an array in little-endian order"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_text_game(file_pointer: Iterable[str]) -> Tuple[int, int, int, List[int]]:
+    """
+    Read a text game into its setup and a list of moves that
+    gives the same game result when played. Invalid setups are
+    stored as zeros and an invalid move is stored as 0, which
+    ends the game. Moves to the right of the board all have the
+    same result and are stored as `width + 1`.
+    """
+    lines = iter(file_pointer)
+    header = next(lines).rstrip("\n")
+    try:
+        width, height, winning_moves = Game(None).parse_header(header)
+    except GameError:
+        return 0, 0, 0, []
+
+    if min(width, height, winning_moves) <= 0:
+        # Invalid setup. The moves can never be played.
+        return 0, 0, 0, []
+
+    if max(width, height, winning_moves) > MAX_HEADER_VALUE:
+        raise ValueError(f"Game setup is too large to be stored: {header}")
+
+    moves = []
+    for line in lines:
+        try:
+            move = int(line.rstrip("\n"))
+        except ValueError:
+            moves.append(0)
+            break
+
+        if move <= 0:
+            moves.append(0)
+            break
+        moves.append(min(move, width + 1))
+    return width, height, winning_moves, moves
+
+
+class BinaryWriter:
+    """
+    A class for writing games into a binary archive. Use
+    it as a context manager to write the index on exit.
+    """
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        self.offsets = array(INDEX_TYPECODE)
+        self.file_object: BinaryIO = None
+
+    def __enter__(self) -> "BinaryWriter":
+        self.file_object = self.file.open(mode="wb")
+        # Leave space for the file header until the index is written
+        self.file_object.write(bytes(FILE_HEADER.size))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            if exc_info[0] is None:
+                self.write_index()
+        finally:
+            self.file_object.close()
+
+    def add_game(
+        self, width: int, height: int, winning_moves: int, moves: List[int]
+    ) -> None:
+        """Write a game record to the archive"""
+        move_size = get_move_size(width)
+        self.offsets.append(self.file_object.tell())
+
+        data = to_little_endian(array(MOVE_TYPECODES[move_size], moves))
+        self.file_object.write(
+            GAME_HEADER.pack(width, height, winning_moves, move_size, len(moves))
+        )
+        self.file_object.write(data)
+        if len(data) % 2:
+            # Keep every game record aligned to two bytes
+            self.file_object.write(b"\0")
+
+    def write_index(self) -> None:
+        """Write the offsets of every game and the file header"""
+        index_offset = self.file_object.tell()
+        self.file_object.write(to_little_endian(self.offsets))
+        self.file_object.seek(0)
+        self.file_object.write(
+            FILE_HEADER.pack(MAGIC, VERSION, len(self.offsets), index_offset)
+        )
+
+
+class BinaryReader:
+    """
+    A class for reading games from a memory-mapped binary archive.
+    Moves are returned as memoryview slices of the archive, so no
+    moves are copied. Release the slices before closing the reader.
+    """
+
+    def __init__(self, file: Path) -> None:
+        with file.open(mode="rb") as fp:
+            self.buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.buffer)
+
+        try:
+            header = FILE_HEADER.unpack_from(self.view)
+        except struct.error:
+            # Too short to have a header
+            header = None
+
+        if header is None or header[:2] != (MAGIC, VERSION):
+            self.view.release()
+            self.buffer.close()
+            raise ValueError(f"File is not a binary game archive: {file}")
+
+        _, _, total_games, index_offset = header
+        index_end = index_offset + total_games * array(INDEX_TYPECODE).itemsize
+        self.index = self.view[index_offset:index_end].cast(INDEX_TYPECODE)
+
+    def __enter__(self) -> "BinaryReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, game: int) -> Tuple[int, int, int, memoryview]:
+        """Get the setup and moves of a game"""
+        offset = self.index[game]
+        width, height, winning_moves, move_size, total_moves = GAME_HEADER.unpack_from(
+            self.view, offset
+        )
+        start = offset + GAME_HEADER.size
+        end = start + total_moves * move_size
+        moves = self.view[start:end].cast(MOVE_TYPECODES[move_size])
+        return width, height, winning_moves, moves
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, memoryview]]:
+        for game in range(len(self)):
+            yield self[game]
+
+    def close(self) -> None:
+        self.index.release()
+        self.view.release()
+        self.buffer.close()
+
+
+def play_binary_game(
+    width: int,
+    height: int,
+    winning_moves: int,
+    moves: memoryview,
+    engine: Type[GameBoard] = GameBoard,
+) -> GameCode:
+    """Play a game read from a binary archive"""
+    game = Game(None, engine)
+    try:
+        board = game.create_board(width, height, winning_moves)
+    except GameError as game_error:
+        return game_error.status
+    # Invalid moves are stored as 0, which is not a valid column
+    return board.run(moves)
+
+
+def check_binary_archive(
+    file: Path, engine: Type[GameBoard] = GameBoard
+) -> Iterator[GameCode]:
+    """A generator which checks every game in a binary archive"""
+    with BinaryReader(file) as reader:
+        for width, height, winning_moves, moves in reader:
+            with moves:
+                yield play_binary_game(width, height, winning_moves, moves, engine)
+
+
+def check_binary_archive_lockstep(
+    file: Path, batch_size: int = LOCKSTEP_BATCH_SIZE
+) -> Iterator[GameCode]:
+    """
+    A generator which checks every game in a binary archive,
+    checking games with the same setup together in lockstep.
+    """
+    with BinaryReader(file) as reader:
+        yield from check_lockstep_stream(reader, batch_size)
+
+
+def convert_text_games(files: Iterable[Path], output: Path) -> List[Path]:
+    """
+    Convert text game files into a binary archive. Returns the files
+    that could not be read or stored, which are left out of the archive.
+    """
+    skipped = []
+    with BinaryWriter(output) as writer:
+        for file in files:
+            try:
+                with file.open(mode="r") as fp:
+                    game = read_text_game(fp)
+                writer.add_game(*game)
+            except (OSError, IOError, UnicodeError, StopIteration, ValueError):
+                skipped.append(file)
+    return skipped
@@ -0,0 +1,59 @@
+from game_solver.game import GameBoard
+
+
+def has_run(mask: int, shift: int, length: int) -> bool:
+    """
+    Check if a bitmask has `length` bits set in a row, where
+    consecutive bits in the row are `shift` positions apart.
+    """
+    # Each pass doubles the run length that a set bit represents.
+    # A bit that survives `mask &= mask >> (run * shift)` marks the
+    # start of a run that is twice as long as before.
+    run = 1
+    while run * 2 <= length:
+        mask &= mask >> (run * shift)
+        run *= 2
+
+    if run < length:
+        # Cover the remainder by overlapping two runs of length `run`
+        mask &= mask >> ((length - run) * shift)
+    return mask != 0
+
+
+class BitBoard(GameBoard):
+    """
+    A game board that keeps one bitmask per player instead of
+    a grid. Each column takes up `height + 1` bits, where the
+    extra sentinel bit at the top is never set. This stops lines
+    from wrapping around from one column into the next, so
+    wins can be detected with shifts and bitwise ANDs.
+    """
+
+    def init_cells(self) -> None:
+        """Create an empty bitmask for each player (1 and 2)"""
+        self.masks = [0, 0]
+
+        # Distance between two neighbouring bits along vertical,
+        # horizontal, right diagonal and left diagonal lines.
+        stride = self.height + 1
+        self.stride = stride
+        self.shifts = (1, stride, stride + 1, stride - 1)
+
+    def set_piece(self, column: int, row: int) -> None:
+        """Mark the current player's piece on their bitmask"""
+        self.masks[self.current_player - 1] |= 1 << (column * self.stride + row)
+
+    def get_piece(self, column: int, row: int) -> int:
+        """Get the player whose piece is in a cell"""
+        return 1 if self.masks[0] >> (column * self.stride + row) & 1 else 2
+
+    def check_for_wins(self) -> None:
+        """Check if the game has been won"""
+        if self.total_moves >= 2 * self.winning_moves - 1:
+            # Only start checking for wins if the first player has
+            # managed to put the lowest possible winning moves
+            mask = self.masks[self.current_player - 1]
+            for shift in self.shifts:
+                if has_run(mask, shift, self.winning_moves):
+                    self.winner = self.current_player
+                    return
@@ -0,0 +1,252 @@
+"""
+Build an opening book of the scores and best moves of every position
+in the first moves of a game, and look positions up in it.
+
+    python -m game_solver.book 7 6 4 --depth 8 --output book.c4ob
+"""
+
+import argparse
+import mmap
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from game_solver.binary import to_little_endian
+from game_solver.config import DEFAULT_TABLE_MEMORY
+from game_solver.solver import Position, Solver
+from game_solver.transposition import TranspositionTable
+
+# File layout (all values are little-endian):
+#  - file header: magic, format version, width, height, winning moves,
+#    depth and number of positions
+#  - keys of the positions as uint64, in ascending order
+#  - scores of the positions as int8, in the same order
+#  - best moves (columns counted from 0) as uint8, in the same order
+MAGIC = b"C4OB"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHHHHHxxQ")
+KEY_TYPECODE = "Q"
+SCORE_TYPECODE = "b"
+MOVE_TYPECODE = "B"
+
+# The default number of moves of the positions kept in a book
+DEFAULT_BOOK_DEPTH = 8
+
+
+def get_book_key(position: Position) -> Tuple[int, bool]:
+    """
+    Get the key of a position in a book, which is the same for the
+    position mirrored left to right. Also tells if the key is the hash
+    of the mirrored position, whose best move is mirrored too.
+    """
+    mirror_hash = position.get_mirror_hash()
+    if mirror_hash < position.hash:
+        return mirror_hash, True
+    return position.hash, False
+
+
+def get_book_positions(
+    width: int, height: int, winning_moves: int, depth: int
+) -> Dict[int, Tuple[Tuple[int, ...], bool]]:
+    """
+    Get every position after up to `depth` moves that is not over yet,
+    leaving out mirrored positions. Gets the columns played to reach
+    each position and if it is mirrored, by its key.
+    """
+    position = Position(width, height, winning_moves)
+    positions = {}
+
+    def add_positions(path: Tuple[int, ...]) -> None:
+        key, mirrored = get_book_key(position)
+        if key in positions:
+            # Reached by another move order, or mirrored
+            return
+        positions[key] = path, mirrored
+        if len(path) == depth:
+            return
+
+        possible = position.possible()
+        wins = position.winning_cells(position.current) & possible
+        for column in range(width):
+            cell = possible & position.column_masks[column]
+            if cell and not cell & wins:
+                position.play(column)
+                add_positions(path + (column,))
+                position.undo(column)
+
+    add_positions(())
+    return positions
+
+
+class BookWriter:
+    """
+    A class for writing the scores and best moves of positions into an
+    opening book. Positions are sorted by key when the book is written.
+    """
+
+    def __init__(self, width: int, height: int, winning_moves: int, depth: int) -> None:
+        if width > 2**8 or (width * height + 1) // 2 >= 2**7:
+            raise ValueError(
+                f"Board is too large for an opening book: {width} x {height}"
+            )
+        self.setup = (width, height, winning_moves)
+        self.depth = depth
+        self.entries: Dict[int, Tuple[int, int]] = {}
+
+    def add_position(self, key: int, score: int, best_move: int) -> None:
+        """Add the score and best move (counted from 0) of a position"""
+        self.entries[key] = score, best_move
+
+    def write(self, file: Path) -> None:
+        """Write the positions into a book file"""
+        keys = sorted(self.entries)
+        with file.open(mode="wb") as fp:
+            fp.write(
+                FILE_HEADER.pack(MAGIC, VERSION, *self.setup, self.depth, len(keys))
+            )
+            fp.write(to_little_endian(array(KEY_TYPECODE, keys)))
+            fp.write(array(SCORE_TYPECODE, (self.entries[key][0] for key in keys)))
+            fp.write(array(MOVE_TYPECODE, (self.entries[key][1] for key in keys)))
+
+
+def build_book(
+    width: int,
+    height: int,
+    winning_moves: int,
+    depth: int,
+    output: Path,
+    table_memory: int = DEFAULT_TABLE_MEMORY,
+) -> int:
+    """
+    Solve every position after up to `depth` moves and write them into
+    an opening book. Positions with the most moves are solved first,
+    and one transposition table is kept for all of them, so positions
+    with fewer moves find the scores after them in the table. Returns
+    the number of positions in the book.
+    """
+    writer = BookWriter(width, height, winning_moves, depth)
+    table = TranspositionTable(table_memory)
+    positions = get_book_positions(width, height, winning_moves, depth)
+    for key, (path, mirrored) in sorted(
+        positions.items(), key=lambda item: -len(item[1][0])
+    ):
+        position = Position(width, height, winning_moves)
+        for column in path:
+            position.play(column)
+        solution = Solver(position, table=table).solve()
+        best_move = solution.best_move - 1
+        if mirrored:
+            best_move = width - 1 - best_move
+        writer.add_position(key, solution.score, best_move)
+
+    writer.write(output)
+    return len(positions)
+
+
+class OpeningBook:
+    """
+    A memory-mapped opening book, where positions are found by binary
+    search over the sorted keys, so the book is never read into memory
+    as a whole. Positions of other games, or with more moves than the
+    depth of the book, are never looked up.
+    """
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        with file.open(mode="rb") as fp:
+            try:
+                self.buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                raise ValueError(f"File is not an opening book: {file}")
+        self.view = memoryview(self.buffer)
+
+        try:
+            magic, version, *setup, depth, total = FILE_HEADER.unpack_from(self.view)
+        except struct.error:
+            raise ValueError(f"File is not an opening book: {file}")
+
+        key_size = array(KEY_TYPECODE).itemsize
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or len(self.view) != FILE_HEADER.size + total * (key_size + 2)
+        ):
+            raise ValueError(f"File is not an opening book: {file}")
+
+        self.setup = tuple(setup)
+        self.depth = depth
+        keys_end = FILE_HEADER.size + total * key_size
+        self.keys = self.view[FILE_HEADER.size : keys_end].cast(KEY_TYPECODE)
+        self.scores = self.view[keys_end : keys_end + total].cast(SCORE_TYPECODE)
+        self.moves = self.view[keys_end + total :].cast(MOVE_TYPECODE)
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def get(self, position: Position) -> Optional[Tuple[int, int]]:
+        """
+        Get the score and best move (counted from 0) of a position,
+        or None if it is not in the book
+        """
+        if position.moves > self.depth or self.setup != (
+            position.width,
+            position.height,
+            position.winning_moves,
+        ):
+            return None
+
+        key, mirrored = get_book_key(position)
+        index = bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return None
+
+        best_move = self.moves[index]
+        if mirrored:
+            best_move = position.width - 1 - best_move
+        return self.scores[index], best_move
+
+    def close(self) -> None:
+        for view in (self.keys, self.scores, self.moves, self.view):
+            view.release()
+        self.buffer.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Connect4 opening book builder")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("winning_moves", type=int)
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=DEFAULT_BOOK_DEPTH,
+        help="Largest number of moves of the positions in the book",
+    )
+    parser.add_argument("--output", type=str, required=True, help="Book file to write")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    start = time.perf_counter()
+    total = build_book(
+        args.width, args.height, args.winning_moves, args.depth, Path(args.output)
+    )
+    print(
+        f"Wrote {total} positions into {args.output} "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
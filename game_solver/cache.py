@@ -0,0 +1,143 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Type
+
+from game_solver.config import DEFAULT_CACHE_SIZE, GameCode
+from game_solver.game import GameBoard
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    status INTEGER NOT NULL,
+    used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0), ('size', 0);
+"""
+
+
+def get_cache_key(data: bytes, engine: Type[GameBoard] = GameBoard) -> bytes:
+    """
+    Get the cache key of a game file's content. Line endings are
+    normalised, so the same game saved on Windows has the same key.
+    Engines are part of the key as they are checked separately.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(engine.__name__.encode())
+    digest.update(b"\0")
+    digest.update(data.replace(b"\r\n", b"\n"))
+    return digest.digest()
+
+
+class ResultCache:
+    """
+    An on-disk cache of game results, keyed by a hash of the game
+    file content. The least recently used results are evicted once
+    the cache holds more than `max_size` results. Hits and misses are
+    counted by every cache object and stored in the cache file, so that
+    caches used by worker processes are counted too.
+
+    The database connection is opened on first use and is not pickled,
+    so a cache can be sent to worker processes.
+    """
+
+    def __init__(self, file: Path, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.file = file
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> dict:
+        return {"file": self.file, "max_size": self.max_size}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["file"], state["max_size"])
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the database connection, creating the cache file if needed"""
+        if self._connection is None:
+            connection = sqlite3.connect(str(self.file), timeout=30)
+            # Readers and writers in other processes do not block each other
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: bytes) -> Optional[GameCode]:
+        """Get the result of a game and mark it as recently used"""
+        with self.connection as connection:
+            row = connection.execute(
+                "SELECT status FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                connection.execute(
+                    "UPDATE stats SET value = value + 1 WHERE name = 'misses'"
+                )
+                return None
+
+            self.hits += 1
+            connection.execute(
+                "UPDATE results SET used = ? WHERE key = ?", (time.time_ns(), key)
+            )
+            connection.execute("UPDATE stats SET value = value + 1 WHERE name = 'hits'")
+        return GameCode(row[0])
+
+    def put(self, key: bytes, status: GameCode) -> None:
+        """Store the result of a game, evicting the least recently used results"""
+        with self.connection as connection:
+            inserted = connection.execute(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?)",
+                (key, int(status), time.time_ns()),
+            ).rowcount
+            if not inserted:
+                # Another process has stored the same game in the meantime
+                return
+
+            # The size is kept in the stats so that results are not counted
+            size = self.get_stat("size") + 1
+            if size > self.max_size:
+                connection.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY used LIMIT ?)",
+                    (size - self.max_size,),
+                )
+                size = self.max_size
+            connection.execute(
+                "UPDATE stats SET value = ? WHERE name = 'size'", (size,)
+            )
+
+    def get_stat(self, name: str) -> int:
+        """Get a value from the stats stored in the cache file"""
+        (value,) = self.connection.execute(
+            "SELECT value FROM stats WHERE name = ?", (name,)
+        ).fetchone()
+        return value
+
+    def __len__(self) -> int:
+        return self.get_stat("size")
+
+    def get_counters(self) -> Tuple[int, int]:
+        """Get the total number of hits and misses stored in the cache file"""
+        return self.get_stat("hits"), self.get_stat("misses")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
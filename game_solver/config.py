@@ -48,3 +48,37 @@ GAME_OUTPUT_MESSAGES = {
         " >> The file cannot be found, opened or read for some reason."
     ),
 }
+
+# Statuses of games that carry on if more moves are made
+UNFINISHED_STATUSES = (
+    GameCode.DRAW,
+    GameCode.PLAYER_1_WIN,
+    GameCode.PLAYER_2_WIN,
+    GameCode.INCOMPLETE_GAME,
+)
+
+# Directions (column, row) of the lines that can win the game:
+# vertical, horizontal, right diagonal and left diagonal
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Names of the board engines that can be used to check games
+ENGINE_NAMES = ("default", "bitboard", "runlength", "flat", "sparse")
+
+# Suffix of binary game archives
+BINARY_SUFFIX = ".c4b"
+
+# The default number of game results kept in a result cache
+DEFAULT_CACHE_SIZE = 100_000
+
+# The default memory budget of a solver's transposition table, in bytes
+DEFAULT_TABLE_MEMORY = 2**24
+
+# Boards with more cells than this are checked on a sparse board, which
+# only keeps the cells with pieces, whatever engine has been chosen
+SPARSE_CELL_THRESHOLD = 10**8
+
+# The shortest and longest time in seconds between two checks of a
+# followed game file for new moves. Files are checked less often the
+# longer they go without new moves.
+FOLLOW_MIN_INTERVAL = 0.1
+FOLLOW_MAX_INTERVAL = 2.0
@@ -0,0 +1,108 @@
+import json
+from itertools import chain, takewhile
+from pathlib import Path
+from typing import Iterator, List, TextIO, Type
+
+from game_solver.binary import check_binary_archive, check_binary_archive_lockstep
+from game_solver.config import BINARY_SUFFIX, GameCode
+from game_solver.game import Game, GameBoard, GameError, GameOver
+
+# Containers with this suffix hold one JSON game record per line.
+# Containers with the binary suffix are binary game archives, and
+# any other container holds text games separated by blank lines.
+JSON_LINES_SUFFIX = ".jsonl"
+
+
+def is_not_blank(line: str) -> bool:
+    """Check if a line has anything other than whitespace"""
+    return bool(line.strip())
+
+
+def read_text_games(file_pointer: TextIO) -> Iterator[Iterator[str]]:
+    """
+    A generator which returns the lines of every game in a text
+    container. Games have the same format as single game files and
+    are separated by one or more blank lines. Each game is read
+    lazily from the file and only one line is held in memory.
+    """
+    for line in file_pointer:
+        if not is_not_blank(line):
+            # Skip blank lines between the games
+            continue
+
+        game = chain([line], takewhile(is_not_blank, file_pointer))
+        yield game
+
+        # Skip moves that were not read because the game ended early
+        for _ in game:
+            pass
+
+
+def read_json_moves(moves: List[int]) -> Iterator[int]:
+    """A generator which returns validated moves from a JSON game record"""
+    for move in moves:
+        if not isinstance(move, int) or isinstance(move, bool) or move <= 0:
+            # Moves should only be denoted by a positive integer
+            raise GameError(8)
+        yield move
+
+
+def play_json_game(line: str, engine: Type[GameBoard] = GameBoard) -> GameCode:
+    """
+    Play a game described by a JSON record such as
+    {"dims": [7, 6, 4], "moves": [4, 4, 3]}
+    """
+    game = Game(None, engine)
+    try:
+        record = json.loads(line)
+        width, height, winning_moves = record["dims"]
+        if not all(type(value) is int for value in (width, height, winning_moves)):
+            raise GameError(8)
+
+        board = game.create_board(width, height, winning_moves)
+        board.play_moves(read_json_moves(record["moves"]))
+    except (GameOver, GameError) as game_over:
+        return game_over.status
+    except (ValueError, KeyError, TypeError):
+        # The record is not valid JSON or does not describe a game
+        return GameCode.ILLEGAL_FILE
+
+
+def check_text_container(
+    file_pointer: TextIO, engine: Type[GameBoard] = GameBoard
+) -> Iterator[GameCode]:
+    """A generator which checks every game in a text container"""
+    for lines in read_text_games(file_pointer):
+        yield Game(lines, engine).play()
+
+
+def check_json_container(
+    file_pointer: TextIO, engine: Type[GameBoard] = GameBoard
+) -> Iterator[GameCode]:
+    """A generator which checks every game in a JSON Lines container"""
+    for line in file_pointer:
+        if is_not_blank(line):
+            yield play_json_game(line, engine)
+
+
+def check_container(
+    file: Path, engine: Type[GameBoard] = GameBoard, lockstep: bool = False
+) -> Iterator[GameCode]:
+    """
+    A generator which checks every game in a container file as it is
+    read. The container format is chosen based on the file suffix.
+    Games in binary archives can be checked in lockstep with NumPy.
+    """
+    if file.suffix == BINARY_SUFFIX and lockstep:
+        yield from check_binary_archive_lockstep(file)
+        return
+
+    if file.suffix == BINARY_SUFFIX:
+        yield from check_binary_archive(file, engine)
+        return
+
+    with file.open(mode="r") as fp:
+        if file.suffix == JSON_LINES_SUFFIX:
+            yield from check_json_container(fp, engine)
+        else:
+            yield from check_text_container(fp, engine)
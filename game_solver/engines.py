@@ -0,0 +1,20 @@
+from typing import Dict, Type
+
+from game_solver.bitboard import BitBoard
+from game_solver.flatboard import FlatBoard
+from game_solver.game import GameBoard
+from game_solver.runlength import RunLengthBoard
+from game_solver.sparse import SparseBoard
+
+ENGINES: Dict[str, Type[GameBoard]] = {
+    "default": GameBoard,
+    "bitboard": BitBoard,
+    "runlength": RunLengthBoard,
+    "flat": FlatBoard,
+    "sparse": SparseBoard,
+}
+
+
+def get_engine(name: str) -> Type[GameBoard]:
+    """Get a game board class by its engine name"""
+    return ENGINES[name]
@@ -0,0 +1,60 @@
+from game_solver.config import DIRECTIONS
+from game_solver.game import GameBoard
+
+
+class FlatBoard(GameBoard):
+    """
+    A game board that keeps every cell in a single bytearray, one byte
+    per cell, column by column. Lines through the newest piece are read
+    as strided slices of the array, and a win is found by searching a
+    line for a winning number of the current player's pieces in a row.
+    """
+
+    __slots__ = ("cells", "winning_lines")
+
+    def init_cells(self) -> None:
+        """Create empty cells in a flat array"""
+        self.cells = bytearray(self.width * self.height)
+        # A winning line of pieces of each player (1 and 2)
+        self.winning_lines = {
+            player: bytes([player]) * self.winning_moves for player in (1, 2)
+        }
+
+    def set_piece(self, column: int, row: int) -> None:
+        """Mark the current player's piece on the board"""
+        self.cells[column * self.height + row] = self.current_player
+
+    def get_piece(self, column: int, row: int) -> int:
+        """Get the player whose piece is in a cell"""
+        return self.cells[column * self.height + row]
+
+    def get_line(self, column_step: int, row_step: int) -> bytearray:
+        """
+        Get the cells in a line through the newest piece, going in a
+        direction. Only cells that could be in a winning line with the
+        newest piece are included, up to the edges of the board.
+        """
+        before = after = self.winning_moves - 1
+        for position, step, size in (
+            (self.current_column, column_step, self.width),
+            (self.current_row, row_step, self.height),
+        ):
+            if step:
+                # The number of cells to the edges of the board
+                low, high = position, size - 1 - position
+                before = min(before, low if step > 0 else high)
+                after = min(after, high if step > 0 else low)
+
+        index = self.current_column * self.height + self.current_row
+        if before == after == 0:
+            # Nothing else fits in the line (and the stride may be 0)
+            return self.cells[index : index + 1]
+
+        stride = column_step * self.height + row_step
+        return self.cells[index - before * stride : index + after * stride + 1 : stride]
+
+    def _check_lines_for_wins(self) -> None:
+        """Check if the game has been won"""
+        winning_line = self.winning_lines[self.current_player]
+        if any(winning_line in self.get_line(*direction) for direction in DIRECTIONS):
+            self.winner = self.current_player
@@ -0,0 +1,212 @@
+import heapq
+import os
+import time
+from itertools import count
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple, Type
+
+from game_solver.config import (
+    FOLLOW_MAX_INTERVAL,
+    FOLLOW_MIN_INTERVAL,
+    UNFINISHED_STATUSES,
+    GameCode,
+)
+from game_solver.game import Game, GameBoard, GameError, parse_moves
+
+# Open files kept free for everything else the process does
+SPARE_FILES = 64
+
+
+def raise_file_limit(files: int) -> None:
+    """
+    Raise the limit of files the process can have open, if it can,
+    so that every followed file can be kept open
+    """
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows, where the limit is much higher
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = files + SPARE_FILES
+    if soft == resource.RLIM_INFINITY or soft >= needed:
+        return
+    if hard != resource.RLIM_INFINITY:
+        needed = min(needed, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+    except (ValueError, OSError):
+        # Files that can't be opened are reported as file errors
+        pass
+
+
+class FollowedGame:
+    """
+    A game file that moves are appended to while it is followed. The
+    file is kept open, and every time it grows only the new content is
+    read and its moves are made on a board kept in memory. Moves are
+    only made once their line is complete, so a line that is still
+    being written is kept until the rest of it has been appended.
+    """
+
+    def __init__(self, file: Path, engine: Type[GameBoard] = GameBoard) -> None:
+        self.file = file
+        self.engine = engine
+        self.file_pointer: Optional[TextIO] = None
+        # The size of the file when it was last read
+        self.size = 0
+        # The start of a line that is still being written
+        self.pending = ""
+        self.board: Optional[GameBoard] = None
+        self.status: Optional[GameCode] = None
+
+    @property
+    def finished(self) -> bool:
+        """Check if the status can't change whatever moves are appended"""
+        return self.status is not None and self.status not in UNFINISHED_STATUSES
+
+    @property
+    def total_moves(self) -> int:
+        """Get the number of moves made so far"""
+        return self.board.total_moves if self.board is not None else 0
+
+    def open(self) -> None:
+        """Open the file, without translating line endings"""
+        self.file_pointer = self.file.open(mode="r", newline="")
+
+    def close(self) -> None:
+        if self.file_pointer is not None:
+            self.file_pointer.close()
+            self.file_pointer = None
+
+    def restart(self) -> None:
+        """Start the game again from the start of the file"""
+        self.file_pointer.seek(0)
+        self.size = 0
+        self.pending = ""
+        self.board = None
+
+    def poll(self) -> Optional[GameCode]:
+        """
+        Read the content appended to the file since it was last read and
+        make its moves. Gets the new status if it has changed. Files that
+        have shrunk have been rewritten, so their game is started again.
+        """
+        try:
+            if self.file_pointer is None:
+                self.open()
+            size = os.fstat(self.file_pointer.fileno()).st_size
+            if size == self.size:
+                return None
+            if size < self.size:
+                self.restart()
+            self.size = size
+            data = self.pending + self.file_pointer.read()
+        except (OSError, IOError, UnicodeError):
+            return self.set_status(GameCode.FILE_ERROR)
+
+        end = data.rfind("\n") + 1
+        self.pending = data[end:]
+        if not end:
+            return None
+        return self.set_status(self.play(data[:end]))
+
+    def play(self, data: str) -> GameCode:
+        """Make the moves on complete lines of the file and get the status"""
+        if self.board is None:
+            header, _, data = data.partition("\n")
+            game = Game(None, self.engine)
+            try:
+                self.board = game.create_board(*game.parse_header(header))
+            except GameError as game_error:
+                return game_error.status
+
+        moves, invalid = parse_moves(data)
+        if invalid is not None:
+            moves.append(None)
+        return self.board.run(moves)
+
+    def set_status(self, status: GameCode) -> Optional[GameCode]:
+        """Set the status of the game and get it if it has changed"""
+        if status == self.status:
+            return None
+        self.status = status
+        return status
+
+
+class GameFollower:
+    """
+    A class for following many game files at once from one process.
+    Files are checked for new content with a single fstat call, and
+    each file is checked less and less often while it has no new moves,
+    from FOLLOW_MIN_INTERVAL up to FOLLOW_MAX_INTERVAL seconds, so that
+    thousands of idle files take little CPU time. Files are no longer
+    followed once their status can't change.
+    """
+
+    def __init__(
+        self,
+        files: Iterable[Path],
+        engine: Type[GameBoard] = GameBoard,
+        min_interval: float = FOLLOW_MIN_INTERVAL,
+        max_interval: float = FOLLOW_MAX_INTERVAL,
+    ) -> None:
+        self.games = [FollowedGame(file, engine) for file in files]
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        # Games by the time they are checked next, with the time between
+        # their checks. The counter keeps games in order on equal times.
+        self.order = count()
+        self.schedule: List[Tuple[float, int, float, FollowedGame]] = []
+        raise_file_limit(len(self.games))
+
+    def __enter__(self) -> "GameFollower":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add(self, game: FollowedGame, when: float, interval: float) -> None:
+        """Schedule the next check of a game"""
+        heapq.heappush(self.schedule, (when, next(self.order), interval, game))
+
+    def poll(self, now: float) -> Iterator[Tuple[Path, GameCode, int]]:
+        """
+        Check every game that is due and get the file, the new status
+        and the number of moves of those whose status has changed
+        """
+        while self.schedule and self.schedule[0][0] <= now:
+            _, _, interval, game = heapq.heappop(self.schedule)
+            size = game.size
+            if (status := game.poll()) is not None:
+                yield game.file, status, game.total_moves
+
+            if game.finished:
+                game.close()
+                continue
+            # Games with new content are checked again soon
+            if game.size != size:
+                interval = self.min_interval
+            else:
+                interval = min(interval * 2, self.max_interval)
+            self.add(game, now + interval, interval)
+
+    def follow(self) -> Iterator[Tuple[Path, GameCode, int]]:
+        """
+        Follow the games until every one of them is finished and get
+        the file, the new status and the number of moves every time
+        the status of a game changes
+        """
+        now = time.monotonic()
+        for game in self.games:
+            self.add(game, now, self.min_interval)
+
+        while self.schedule:
+            yield from self.poll(time.monotonic())
+            if self.schedule:
+                time.sleep(max(0, self.schedule[0][0] - time.monotonic()))
+
+    def close(self) -> None:
+        for game in self.games:
+            game.close()
@@ -1,8 +1,82 @@
 from itertools import cycle
-from typing import List, Optional, TextIO, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Type
 
-from game_solver.config import GameCode
+from game_solver.config import SPARSE_CELL_THRESHOLD, GameCode
 from game_solver.helpers import sliding_window
+from game_solver.prepass import find_illegal_move, has_winning_line
+from game_solver.snapshot import BoardSnapshot
+from game_solver.threats import ThreatTracker
+from game_solver.windows import WindowCounter
+
+# Moves start on the second line of a game file, after the header
+FIRST_MOVE_LINE = 2
+
+# Maps ASCII digits to their values
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+def parse_move(line: str) -> Optional[int]:
+    """Parse a move from a line in the game file, or None if it is invalid"""
+    try:
+        return int(line.rstrip("\n"))
+    except ValueError:
+        # Moves should only be denoted by a digit
+        return None
+
+
+def parse_single_digit_moves(data: str) -> Optional[List[int]]:
+    """
+    Parse the moves from the move section of a game file when every
+    move is a single digit on its own line, which is the case for
+    boards with fewer than 10 columns. Returns None for any other data.
+    """
+    if not data.endswith("\n"):
+        data += "\n"
+
+    digits = data[::2]
+    new_lines = data[1::2]
+    if (
+        len(digits) == len(new_lines)
+        and new_lines.count("\n") == len(new_lines)
+        and digits.isascii()
+        and digits.isdecimal()
+    ):
+        return list(digits.encode().translate(DIGITS))
+
+
+def parse_moves(data: str) -> Tuple[List[int], Optional[int]]:
+    """
+    Parse every move from the move section of a game file in one go.
+    Returns the moves up to the first invalid one and the index of the
+    invalid move, or None if all moves are valid.
+    """
+    if (moves := parse_single_digit_moves(data)) is not None:
+        if 0 in moves:
+            # It doesn't make sense to have a column <= 0
+            invalid = moves.index(0)
+            return moves[:invalid], invalid
+        return moves, None
+
+    lines = data.split("\n")
+    if lines[-1] == "":
+        # The last line ended with a new line
+        lines.pop()
+
+    try:
+        moves = list(map(int, lines))
+    except ValueError:
+        # Find the first line that is not a digit
+        moves = list(map(parse_move, lines))
+        invalid = moves.index(None)
+        moves = moves[:invalid]
+    else:
+        invalid = None
+
+    if moves and min(moves) <= 0:
+        # It doesn't make sense to have a column <= 0
+        invalid = next(index for index, move in enumerate(moves) if move <= 0)
+        moves = moves[:invalid]
+    return moves, invalid
 
 
 class GameOver(Exception):
@@ -17,10 +91,14 @@ class GameOver(Exception):
 
 
 class GameError(Exception):
-    """An exception to indicate that there was an error in the game"""
+    """
+    An exception to indicate that there was an error in the game.
+    Invalid moves also report the line they are on in the game file.
+    """
 
-    def __init__(self, status: GameCode) -> None:
+    def __init__(self, status: GameCode, line: Optional[int] = None) -> None:
         self.status = GameCode(status)
+        self.line = line
 
 
 class GameChecker:
@@ -86,11 +164,11 @@ class GameChecker:
             # managed to put the lowest possible winning moves
             self._check_lines_for_wins()
 
-    def check_line_for_win(self, line: List[int]) -> None:
-        """Check if the current player has won based on a given line"""
+    def is_winning_line(self, line: List[int]) -> bool:
+        """Check if a given line has been won by the current player"""
         if len(line) < self.winning_moves:
             # The line isn't long enough to be able to win
-            return
+            return False
 
         for offset in range(1, self.winning_moves + 1):
             # Loop backwards through line positions starting
@@ -101,23 +179,30 @@ class GameChecker:
             if line[-offset] != self.current_player:
                 # There's a piece belonging to another player. You
                 # won't get a winning number of pieces in a row
-                return
+                return False
 
         # The line has been checked successfully without:
         # 1. running out of positions on the board
         # 2. without having any blank or other player's pieces in a row
-        # The current player has won the game.
-        self.winner = self.current_player
-        raise GameOver(self.winner)
+        return True
+
+    def check_line_for_win(self, line: List[int]) -> None:
+        """Check if the current player has won based on a given line"""
+        if self.is_winning_line(line):
+            # The current player has won the game.
+            self.winner = self.current_player
+            raise GameOver(self.winner)
+
+    def get_vertical_line(self) -> List[int]:
+        """Get a line of pieces in a column with the one recently added"""
+        return self.board[self.current_column][: self.current_row + 1]
 
     def check_vertical_line(self) -> None:
         """
         Check if the player has one by looking at
         the column that has a new piece
         """
-        #  Get a line of pieces in a column with the one recently added
-        line = self.board[self.current_column][: self.current_row + 1]
-        self.check_line_for_win(line)
+        self.check_line_for_win(self.get_vertical_line())
 
     def get_diagonal_line(self, orientation: str = "right") -> Optional[int]:
         """
@@ -136,6 +221,10 @@ class GameChecker:
             for psn in range(self.max_diagonal_length):
                 row = self.current_row - psn
                 column = column_value(psn)
+                if row < 0 or column < 0:
+                    # Ran out of cols/rows on the left or at the bottom.
+                    # Negative indices would wrap around the board
+                    break
                 line.append(self.board[column][row])
         except IndexError:
             # Ran out of cols/rows.
@@ -160,6 +249,13 @@ class GameChecker:
         line = self.get_diagonal_line(orientation="left")
         self.check_line_for_win(line)
 
+    def get_horizontal_line(self) -> List[int]:
+        """Get the part of the row around the new piece that can be won"""
+        return [
+            self.board[column][self.current_row]
+            for column in range(self.first_column, self.last_column)
+        ]
+
     def check_horizontal_lines(self) -> None:
         """
         Check if the player has won by looking at the horizonal
@@ -170,16 +266,28 @@ class GameChecker:
         # Apply a sliding window along row to find every possible
         # line and check if it has a winning combination.
 
-        row = [
-            self.board[column][self.current_row]
-            for column in range(self.first_column, self.last_column)
-        ]
-
         # Get every possible line of length self.winning_moves
         # by applying a slidng window to the row
-        for line in sliding_window(row, self.winning_moves):
+        for line in sliding_window(self.get_horizontal_line(), self.winning_moves):
             self.check_line_for_win(line)
 
+    def get_left_diagonal_upper_line(self) -> List[int]:
+        """Get the left diagonal pointing upwards around the new piece"""
+        # Steps up the diagonal from the new piece, which has to stay
+        # within both the columns and the rows that can be won
+        first = max(
+            self.current_column - self.last_column + 1,
+            self.first_row - self.current_row,
+        )
+        last = min(
+            self.current_column - self.first_column + 1,
+            self.last_row - self.current_row,
+        )
+        return [
+            self.board[self.current_column - step][self.current_row + step]
+            for step in range(first, last)
+        ]
+
     def check_left_diagonal_upper_line(self) -> None:
         """
         Check if the player has won by looking at the left
@@ -192,16 +300,27 @@ class GameChecker:
         # the left diagonal to find  every possible line. Check if
         # it has a winning combination.
 
-        row = [
-            self.board[col][row]
-            for col, row in zip(
-                reversed(range(self.first_column, self.last_column)),
-                range(self.first_row, self.last_row),
-            )
-        ]
+        row = self.get_left_diagonal_upper_line()
         for line in sliding_window(row, self.winning_moves):
             self.check_line_for_win(line)
 
+    def get_right_diagonal_upper_line(self) -> List[int]:
+        """Get the right diagonal pointing upwards around the new piece"""
+        # Steps up the diagonal from the new piece, which has to stay
+        # within both the columns and the rows that can be won
+        first = max(
+            self.first_column - self.current_column,
+            self.first_row - self.current_row,
+        )
+        last = min(
+            self.last_column - self.current_column,
+            self.last_row - self.current_row,
+        )
+        return [
+            self.board[self.current_column + step][self.current_row + step]
+            for step in range(first, last)
+        ]
+
     def check_right_diagonal_upper_line(self) -> None:
         """
         Check if the player has won by looking at the right
@@ -211,27 +330,31 @@ class GameChecker:
         # Similar to check_left_diagonal_upper_line, apply a sliding
         # window to check all possible lines.
 
-        row = [
-            self.board[col][row]
-            for col, row in zip(
-                range(self.first_column, self.last_column),
-                range(self.first_row, self.last_row),
-            )
-        ]
+        row = self.get_right_diagonal_upper_line()
         for line in sliding_window(row, self.winning_moves):
             self.check_line_for_win(line)
 
+    def get_lines(self) -> Iterator[List[int]]:
+        """
+        A generator which returns every line around the new piece that
+        could have been won, in the same order as they are checked by
+        the check_*_line(s) methods.
+        """
+        yield self.get_vertical_line()
+        yield self.get_diagonal_line(orientation="left")
+        yield self.get_diagonal_line(orientation="right")
+        yield from sliding_window(self.get_horizontal_line(), self.winning_moves)
+        yield from sliding_window(
+            self.get_left_diagonal_upper_line(), self.winning_moves
+        )
+        yield from sliding_window(
+            self.get_right_diagonal_upper_line(), self.winning_moves
+        )
+
     def _check_lines_for_wins(self) -> None:
         """Check if the game has been won"""
-        try:
-            self.check_vertical_line()
-            self.check_left_diagonal_line()
-            self.check_right_diagonal_line()
-            self.check_horizontal_lines()
-            self.check_left_diagonal_upper_line()
-            self.check_right_diagonal_upper_line()
-        except GameOver as exception:
-            self.winner = exception.status.value
+        if any(map(self.is_winning_line, self.get_lines())):
+            self.winner = self.current_player
 
 
 class GameBoard(GameChecker):
@@ -239,6 +362,11 @@ class GameBoard(GameChecker):
     A class to setup the game board and carry out the moves.
     """
 
+    # Whether every line of winning_moves pieces through the newest piece
+    # is found, and nothing else. Engines that don't can't have games
+    # checked for wins without playing them move by move.
+    finds_all_wins = True
+
     def __init__(
         self, width: int, height: int, winning_moves: int, file_object
     ) -> None:
@@ -246,110 +374,405 @@ class GameBoard(GameChecker):
         self.winning_moves = winning_moves
         self.player = cycle(range(1, 3))  #  Alternate player turn (1 or 2)
 
-        self.board = [[None for row in range(height)] for col in range(width)]
         self.winner = None
 
         self.current_player = None
         self.current_column = None
         self.current_row = None
         self.total_moves = 0
+        # The line in the game file with an invalid move, if there is one
+        self.invalid_line = None
+        # The open windows of each player, if they are counted, and
+        # the move from which neither player can win any more
+        self.windows = None
+        self.stop_early = False
+        self.no_win_move = None
+        # The threats of each player, if they are tracked, and the
+        # player who can force a win with the move it has been since
+        self.threats = None
+        self.forced_win = None
 
-        # The maximum number of items in a diagonal line to check
-        self.max_diagonal_length = min(height, width)
         self.width = width
         self.height = height
+        self.init_heights()
+        self.init_cells()
+
+    def init_heights(self) -> None:
+        """Create the number of pieces in each column, i.e. the next free row"""
+        self.heights = [0] * self.width
+
+    def init_cells(self) -> None:
+        """Create the empty cells of the board"""
+        self.board = [[None for row in range(self.height)] for col in range(self.width)]
+        # The maximum number of items in a diagonal line to check
+        self.max_diagonal_length = min(self.height, self.width)
+
+    def track_windows(self, stop_early: bool = False) -> None:
+        """
+        Count the windows that each player can still complete, to find
+        the move from which neither player can win. Wins are not checked
+        after that move. If `stop_early` is set, the game is stopped
+        there as a draw, so later moves are not checked at all.
+        """
+        self.windows = WindowCounter(self.width, self.height, self.winning_moves)
+        self.stop_early = stop_early
+
+    def track_threats(self) -> None:
+        """
+        Keep track of the threats of both players, to find the move
+        from which a player can force a win with double or stacked
+        threats, or by winning with the next piece
+        """
+        self.threats = ThreatTracker(self.width, self.height, self.winning_moves)
 
     def start_game(self) -> None:
         """
         Start the game and make moves until the game is
         finished or until the there is an error.
         """
-        for move in self.get_moves():
+        self.play_moves(self.get_moves())
+
+    def play_moves(self, moves: Iterable[int]) -> None:
+        """
+        Make the given moves until the game is finished
+        or until the there is an error.
+        """
+        for move in moves:
             self.make_move(move)
+            if self.stop_early and self.no_win_move is not None:
+                raise GameOver(GameCode.DRAW)
         self.finish_game()
 
+    def run(self, moves: Optional[Iterable[Optional[int]]] = None) -> GameCode:
+        """
+        Make moves until the game is finished or until there is an
+        error and return the game status. Unlike start_game, it does
+        not raise exceptions. Moves are read from the file, unless
+        they are given. Moves that are None or not positive are invalid.
+        """
+        if moves is None:
+            moves = self.read_moves()
+
+        for move in moves:
+            if move is None or move <= 0:
+                # Every move before this one has been made
+                self.invalid_line = FIRST_MOVE_LINE + self.total_moves
+                return GameCode.ILLEGAL_FILE
+
+            if (status := self.play_move(move)) is not None:
+                return status
+            if self.stop_early and self.no_win_move is not None:
+                # Nobody can win, whatever the rest of the moves are
+                return GameCode.DRAW
+        return self.get_status()
+
     def make_move(self, move: int) -> None:
         """
         Make a move by adding a piece and checking for wins
         """
-        if self.winner is None:
-            self.add_piece(move)
+        if (status := self.play_move(move)) is not None:
+            raise GameError(status)
+
+    def play_move(self, move: int) -> Optional[GameCode]:
+        """
+        Make a move by adding a piece and checking for wins.
+        Returns the error status if the move cannot be made.
+        """
+        if self.winner is not None:
+            # Trying to make an illegal move
+            return GameCode.ILLEGAL_CONTINUE
+
+        if (status := self.place_piece(move)) is not None:
+            return status
+        # Once nobody can win any more, there is no win to check for
+        if self.windows is None or not self.count_windows():
             self.check_for_wins()
+        if self.threats is not None:
+            self.find_threats()
+
+    def count_windows(self) -> bool:
+        """
+        Close the windows through the newest piece for the other player.
+        Returns True if neither player can win any more.
+        """
+        if self.no_win_move is not None:
+            return True
+
+        self.windows.add_piece(
+            self.current_column, self.current_row, self.current_player
+        )
+        if self.windows.no_win_possible:
+            # A piece that completes a line keeps a window open, so
+            # the game hasn't been won with this move either
+            self.no_win_move = self.total_moves
+            return True
+        return False
+
+    def find_threats(self) -> None:
+        """
+        Update the threats with the newest piece and keep the move from
+        which a player can force a win, for as long as they can
+        """
+        self.threats.add_piece(
+            self.current_column, self.current_row, self.current_player
+        )
+        if self.winner is not None:
+            winner = self.winner
         else:
-            # Trying to make an illegal move
-            raise GameError(4)
+            winner = self.threats.get_forced_winner(self.current_player)
+
+        if winner is None:
+            self.forced_win = None
+        elif self.forced_win is None or self.forced_win[0] != winner:
+            self.forced_win = winner, self.total_moves
 
     def add_piece(self, move: int) -> None:
         """
         Make a move and mark it on the board.
         """
+        if (status := self.place_piece(move)) is not None:
+            raise GameError(status)
+
+    def place_piece(self, move: int) -> Optional[GameCode]:
+        """
+        Make a move and mark it on the board. Returns
+        the error status if the piece cannot be placed.
+        """
         column = move - 1
-        try:
-            # Find the first blank position along the column for next move
-            row = next(x for x, psn in enumerate(self.board[column]) if psn is None)
-        except StopIteration:
-            # Illegal row. The column is already full.
-            raise GameError(5)
-        except IndexError:
+        if column >= self.width:
             # Illegal column. Column chosen outside the board
-            raise GameError(6)
-        else:
-            self.current_column = column
-            self.current_row = row
-            self.total_moves += 1
-            self.current_player = next(self.player)
-            self.board[column][row] = self.current_player
+            return GameCode.ILLEGAL_COLUMN
+
+        # The first blank position along the column for next move
+        row = self.heights[column]
+        if row == self.height:
+            # Illegal row. The column is already full.
+            return GameCode.ILLEGAL_ROW
+
+        self.current_column = column
+        self.current_row = row
+        self.total_moves += 1
+        self.current_player = next(self.player)
+        self.heights[column] += 1
+        self.set_piece(column, row)
+
+    def set_piece(self, column: int, row: int) -> None:
+        """Mark the current player's piece on the board"""
+        self.board[column][row] = self.current_player
+
+    def legal_moves(self) -> List[int]:
+        """Get the moves (columns) that still have space for a piece"""
+        return [
+            column + 1
+            for column, height in enumerate(self.heights)
+            if height < self.height
+        ]
+
+    def get_piece(self, column: int, row: int) -> int:
+        """Get the player whose piece is in a cell"""
+        return self.board[column][row]
+
+    def get_heights(self) -> Dict[int, int]:
+        """Get the number of pieces in every column with pieces"""
+        return {column: height for column, height in enumerate(self.heights) if height}
+
+    def get_snapshot(self) -> BoardSnapshot:
+        """Take a snapshot of the pieces on the board and the winner"""
+        heights = self.get_heights()
+        players = bytes(
+            self.get_piece(column, row)
+            for column, height in heights.items()
+            for row in range(height)
+        )
+        return BoardSnapshot(heights, players, self.winner)
+
+    def restore_snapshot(self, snapshot: BoardSnapshot) -> None:
+        """
+        Put the pieces of a snapshot on an empty board, without checking
+        for wins, so that the game carries on from where it was taken
+        """
+        players = iter(snapshot.players)
+        for column, height in snapshot.heights.items():
+            for row in range(height):
+                self.current_player = next(players)
+                self.set_piece(column, row)
+            self.heights[column] = height
+
+        self.total_moves = len(snapshot.players)
+        self.winner = snapshot.winner
+        self.current_column = self.current_row = None
+        self.current_player = None
+        self.player = cycle(range(1, 3))
+        if self.total_moves:
+            # Player 1 made the last move if the number of moves is odd
+            self.current_player = 2 - self.total_moves % 2
+        if self.current_player == 1:
+            next(self.player)
 
     def get_moves(self) -> List[int]:
         """A generator which returns next player moves"""
-        for next_move in self.file_object:
-            next_move = next_move.rstrip("\n")
-            try:
-                next_move = int(next_move)
-            except ValueError:
-                # Moves should only be denoted by a digit
-                raise GameError(8)
-
-            if next_move <= 0:
-                # It doesn't make sense to have a column <= 0
-                raise GameError(8)
+        for line, next_move in enumerate(self.file_object, FIRST_MOVE_LINE):
+            next_move = parse_move(next_move)
+            if next_move is None or next_move <= 0:
+                # Moves should only be denoted by a digit and
+                # it doesn't make sense to have a column <= 0
+                raise GameError(8, line=line)
             else:
                 yield next_move
 
-    def finish_game(self) -> None:
+    def read_moves(self) -> Iterable[Optional[int]]:
+        """
+        Read the moves from the file. Files are read and parsed in one
+        go, while other line iterators are parsed one line at a time.
+        The first invalid move, if any, is returned as None.
+        """
+        if not hasattr(self.file_object, "read"):
+            return map(parse_move, self.file_object)
+
+        moves, invalid = parse_moves(self.file_object.read())
+        if invalid is not None:
+            moves.append(None)
+        return moves
+
+    def get_status(self) -> GameCode:
         """
         Perform final evaluations at the end
         of the game to determine output code
         """
         if self.winner is None and self.total_moves < self.width * self.height:
             # Game is not finished, but no further moves were made
-            raise GameError(3)
+            return GameCode.INCOMPLETE_GAME
         elif self.winner is None:
-            # Draw
-            raise GameOver(0)
+            return GameCode.DRAW
         else:
-            # Game winner
-            raise GameOver(self.winner)
+            return GameCode(self.winner)
+
+    def finish_game(self) -> None:
+        """
+        Perform final evaluations at the end
+        of the game and raise the output code
+        """
+        status = self.get_status()
+        if status == GameCode.INCOMPLETE_GAME:
+            raise GameError(status)
+        else:
+            # Draw or game winner
+            raise GameOver(status)
 
 
 class Game:
-    def __init__(self, file_pointer: TextIO) -> None:
+    def __init__(
+        self,
+        file_pointer: TextIO,
+        engine: Type[GameBoard] = GameBoard,
+        open_windows: bool = False,
+        stop_early: bool = False,
+        threats: bool = False,
+    ) -> None:
         self.file_pointer = file_pointer
+        self.engine = engine
+        # Whether the boards count the windows each player can still
+        # complete, and stop the game once nobody can win
+        self.open_windows = open_windows
+        self.stop_early = stop_early
+        # Whether the boards keep track of the threats of both players
+        self.threats = threats
+        # The line in the game file with the invalid move that made
+        # the game an illegal file, once it has been played
+        self.invalid_line = None
+        # The move from which nobody can win, if windows are counted
+        self.no_win_move = None
+        # The player who can force a win and the move from which they
+        # can, if threats are tracked
+        self.forced_win = None
+
+    @property
+    def tracking(self) -> bool:
+        """Check if the boards keep track of more than the game status"""
+        return self.open_windows or self.stop_early or self.threats
 
-    def play(self) -> None:
+    def play(self) -> GameCode:
+        """Play the game and return its status"""
         try:
-            self.initialise()
-        except (GameOver, GameError) as game_over:
-            # Change game_status exception object into a string
-            return game_over.status
+            if hasattr(self.file_pointer, "read"):
+                return self.play_file()
+            board = self.setup()
+        except GameError as game_error:
+            return game_error.status
+        return self.run_board(board)
+
+    def play_file(self) -> GameCode:
+        """
+        Play the game from a file and return its status. All moves are
+        parsed and checked for illegal columns and rows before a board
+        is created, so that games with an illegal move that comes before
+        anyone could have won are not played at all. Games whose boards
+        track windows or threats are always played, as those are only
+        known once the moves have been made.
+        """
+        header = next(self.file_pointer).rstrip("\n")
+        width, height, winning_moves = self.parse_header(header)
+        self.validate_board_setup(width, height, winning_moves)
+
+        moves, invalid = parse_moves(self.file_pointer.read())
+        illegal = None if self.tracking else find_illegal_move(width, height, moves)
+        if illegal is not None:
+            status, index = illegal
+            if index < 2 * winning_moves - 1:
+                # Nobody can have won before the illegal move
+                return status
+
+            if self.engine.finds_all_wins:
+                won = has_winning_line(width, height, winning_moves, moves[:index])
+                if won is not None:
+                    return GameCode.ILLEGAL_CONTINUE if won else status
+        elif invalid is not None:
+            moves.append(None)
+        return self.run_board(self.create_board(width, height, winning_moves), moves)
+
+    def run_board(
+        self, board: GameBoard, moves: Optional[Iterable[Optional[int]]] = None
+    ) -> GameCode:
+        """
+        Run the game on a board and keep the line of an invalid move, the
+        move from which nobody can win and the move from which a player
+        can force a win
+        """
+        status = board.run(moves)
+        self.invalid_line = board.invalid_line
+        self.no_win_move = board.no_win_move
+        self.forced_win = board.forced_win
+        return status
 
     def initialise(self) -> None:
+        board = self.setup()
+        board.start_game()
+
+    def setup(self) -> GameBoard:
+        """Read the file header and create a board to play the game on"""
         header = next(self.file_pointer).rstrip("\n")
         width, height, winning_moves = self.parse_header(header)
+        return self.create_board(width, height, winning_moves)
 
+    def create_board(self, width: int, height: int, winning_moves: int) -> GameBoard:
+        """
+        Validate the game setup and create a board to play it on.
+        Huge boards are created as sparse boards, as the cells of
+        other engines wouldn't fit in memory.
+        """
         self.validate_board_setup(width, height, winning_moves)
-        board = GameBoard(width, height, winning_moves, self.file_pointer)
-        board.start_game()
+        engine = self.engine
+        if width * height > SPARSE_CELL_THRESHOLD:
+            # Imported here, as the sparse board is based on GameBoard
+            from game_solver.sparse import SparseBoard
+
+            engine = SparseBoard
+        board = engine(width, height, winning_moves, self.file_pointer)
+        if self.open_windows:
+            board.track_windows(self.stop_early)
+        if self.threats:
+            board.track_threats()
+        return board
 
     def parse_header(self, header: str) -> Tuple[int]:
         """
@@ -1,9 +1,17 @@
 import argparse
+import os
+from collections import Counter
 from itertools import tee
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Generator, List, Optional, Tuple
 
-from game_solver.config import GAME_OUTPUT_MESSAGES, GameCode
+from game_solver.config import (
+    BINARY_SUFFIX,
+    DEFAULT_CACHE_SIZE,
+    ENGINE_NAMES,
+    GAME_OUTPUT_MESSAGES,
+    GameCode,
+)
 
 
 class ArgParser:
@@ -12,14 +20,276 @@ class ArgParser:
     def __init__(self) -> None:
         parser = argparse.ArgumentParser(description="Connect4")
         parser.add_argument(
-            "filename", type=str, help="Filename describing the game play"
+            "filename",
+            type=str,
+            nargs="?",
+            help="Filename describing the game play",
+        )
+        parser.add_argument(
+            "--engine",
+            type=str,
+            choices=ENGINE_NAMES,
+            default="default",
+            help="Board engine used to check the game",
+        )
+        parser.add_argument(
+            "--batch",
+            type=str,
+            nargs="+",
+            metavar="DIR|GLOB",
+            help="Check every game file in the given directories or glob patterns",
+        )
+        parser.add_argument(
+            "--follow",
+            type=str,
+            nargs="+",
+            metavar="DIR|GLOB",
+            help="Follow game files as moves are appended to them and print "
+            "every change of their status",
+        )
+        parser.add_argument(
+            "--container",
+            type=str,
+            help="Check every game in a multi-game container file",
+        )
+        parser.add_argument(
+            "--lockstep",
+            action="store_true",
+            help="Check games in a binary --container in lockstep with NumPy",
+        )
+        parser.add_argument(
+            "--convert",
+            type=str,
+            metavar="OUTPUT",
+            help="Convert the --batch game files into a binary archive",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes used to check games in batch mode or --solve",
+        )
+        parser.add_argument(
+            "--cache",
+            type=str,
+            metavar="FILE",
+            help="Cache game results in a file, so that repeated games are not replayed",
+        )
+        parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=DEFAULT_CACHE_SIZE,
+            help="Largest number of game results kept in the --cache",
+        )
+        parser.add_argument(
+            "--snapshots",
+            type=str,
+            metavar="FILE",
+            help="Keep snapshots of game boards in a file, so that game files "
+            "appended to since they were last checked only play the new moves",
+        )
+        parser.add_argument(
+            "--serve",
+            type=str,
+            metavar="HOST:PORT|SOCKET",
+            help="Run a server checking games sent to a TCP address or Unix socket",
+        )
+        parser.add_argument(
+            "--solve",
+            action="store_true",
+            help="Solve the game after the moves in the game file, with perfect play",
+        )
+        parser.add_argument(
+            "--time-limit",
+            type=float,
+            metavar="MS",
+            help="Give the best move found within a time limit when solving",
+        )
+        parser.add_argument(
+            "--book",
+            type=str,
+            metavar="FILE",
+            help="Look positions up in an opening book when solving",
+        )
+        parser.add_argument(
+            "--open-windows",
+            action="store_true",
+            help="Count the lines each player can still win and report the move "
+            "from which nobody can win",
+        )
+        parser.add_argument(
+            "--stop-early",
+            action="store_true",
+            help="Stop checking a game as a draw once nobody can win, "
+            "with --open-windows",
+        )
+        parser.add_argument(
+            "--threats",
+            action="store_true",
+            help="Track the threats of both players and report the move from "
+            "which a player could force a win",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Print the number of calls and time spent in every phase of checks",
         )
         self.args = parser.parse_args()
 
+        if not any(
+            (
+                self.args.filename,
+                self.args.batch,
+                self.args.follow,
+                self.args.container,
+                self.args.serve,
+            )
+        ):
+            parser.error(
+                "a game filename, --batch, --follow, --container or --serve is required"
+            )
+        elif self.args.follow and any(
+            (
+                self.args.filename,
+                self.args.batch,
+                self.args.container,
+                self.args.serve,
+                self.args.solve,
+                self.args.cache,
+                self.args.snapshots,
+                self.args.open_windows,
+                self.args.threats,
+            )
+        ):
+            parser.error("--follow can't be used with a game filename or other modes")
+        elif self.args.solve and not self.args.filename:
+            parser.error("--solve needs a game filename")
+        elif self.args.solve and any(
+            (self.args.batch, self.args.container, self.args.serve)
+        ):
+            parser.error("--solve can't be used with --batch, --container or --serve")
+        elif self.args.time_limit is not None and not self.args.solve:
+            parser.error("--time-limit can only be used with --solve")
+        elif self.args.book is not None and not self.args.solve:
+            parser.error("--book can only be used with --solve")
+        elif self.args.snapshots is not None and any(
+            (
+                self.args.container,
+                self.args.serve,
+                self.args.solve,
+                self.args.cache,
+                self.args.open_windows,
+                self.args.threats,
+            )
+        ):
+            parser.error(
+                "--snapshots can't be used with --container, --serve, --solve, "
+                "--cache, --open-windows or --threats"
+            )
+        elif (self.args.open_windows or self.args.threats) and any(
+            (
+                self.args.batch,
+                self.args.container,
+                self.args.serve,
+                self.args.solve,
+                self.args.cache,
+            )
+        ):
+            parser.error(
+                "--open-windows and --threats can only be used "
+                "to check a single game file"
+            )
+        elif self.args.stop_early and not self.args.open_windows:
+            parser.error("--stop-early can only be used with --open-windows")
+
+        if (
+            self.args.lockstep
+            and Path(self.args.container or "").suffix != BINARY_SUFFIX
+        ):
+            parser.error(f"--lockstep needs a binary --container ({BINARY_SUFFIX})")
+
     def get_path(self) -> Path:
         """Get path from path argument"""
         return Path(self.args.filename)
 
+    def get_engine_name(self) -> str:
+        """Get the name of the board engine to check games with"""
+        return self.args.engine
+
+    def get_batch_patterns(self) -> Optional[List[str]]:
+        """Get directories and glob patterns to check in batch mode"""
+        return self.args.batch
+
+    def get_follow_patterns(self) -> Optional[List[str]]:
+        """Get directories and glob patterns of game files to follow"""
+        return self.args.follow
+
+    def get_container(self) -> Optional[Path]:
+        """Get path to a multi-game container file"""
+        if self.args.container is not None:
+            return Path(self.args.container)
+
+    def get_conversion_output(self) -> Optional[Path]:
+        """Get path to the binary archive to convert game files into"""
+        if self.args.convert is not None:
+            return Path(self.args.convert)
+
+    def get_lockstep(self) -> bool:
+        """Check if games should be checked in lockstep"""
+        return self.args.lockstep
+
+    def get_workers(self) -> int:
+        """Get the number of processes to check games with"""
+        return self.args.workers
+
+    def get_cache_path(self) -> Optional[Path]:
+        """Get path to the game result cache file"""
+        if self.args.cache is not None:
+            return Path(self.args.cache)
+
+    def get_cache_size(self) -> int:
+        """Get the largest number of game results kept in the cache"""
+        return self.args.cache_size
+
+    def get_snapshot_path(self) -> Optional[Path]:
+        """Get path to the game board snapshot file"""
+        if self.args.snapshots is not None:
+            return Path(self.args.snapshots)
+
+    def get_serve_address(self) -> Optional[str]:
+        """Get the address to serve game checks on"""
+        return self.args.serve
+
+    def get_solve(self) -> bool:
+        """Check if the game should be solved rather than checked"""
+        return self.args.solve
+
+    def get_time_limit(self) -> Optional[float]:
+        """Get the time limit of solving a game, in seconds"""
+        if self.args.time_limit is not None:
+            return self.args.time_limit / 1000
+
+    def get_book_path(self) -> Optional[Path]:
+        """Get path to the opening book to look positions up in"""
+        if self.args.book is not None:
+            return Path(self.args.book)
+
+    def get_open_windows(self) -> bool:
+        """Check if the windows each player can still complete are counted"""
+        return self.args.open_windows
+
+    def get_stop_early(self) -> bool:
+        """Check if games are stopped once nobody can win"""
+        return self.args.stop_early
+
+    def get_threats(self) -> bool:
+        """Check if the threats of both players are tracked"""
+        return self.args.threats
+
+    def get_profile(self) -> bool:
+        """Check if game checks should be profiled"""
+        return self.args.profile
+
 
 def sliding_window(iterable: Optional[int], size: int) -> Generator[int, None, None]:
     """
@@ -28,10 +298,68 @@ def sliding_window(iterable: Optional[int], size: int) -> Generator[int, None, N
     iters = tee(iterable, size)
     for i in range(1, size):
         for each in iters[i:]:
-            next(each)
+            next(each, None)
     return zip(*iters)
 
 
-def show_summary(status: GameCode) -> None:
-    """Print the game summary based on the game status"""
+def show_summary(
+    status: GameCode,
+    invalid_line: Optional[int] = None,
+    no_win_move: Optional[int] = None,
+    forced_win: Optional[Tuple[int, int]] = None,
+) -> None:
+    """
+    Print the game summary based on the game status. Illegal files
+    also show the line with the invalid move, if it is known, and
+    any game shows the move from which nobody can win and the move
+    from which a player could force a win, if they are known.
+    """
     print(GAME_OUTPUT_MESSAGES[status])
+    if status == GameCode.ILLEGAL_FILE and invalid_line is not None:
+        print(f" >> The first invalid move is on line {invalid_line}")
+    if no_win_move is not None:
+        print(f" >> No win is possible from move {no_win_move}")
+    if forced_win is not None:
+        player, move = forced_win
+        print(f" >> Player {player} could force a win from move {move}")
+
+
+def show_batch_summary(statuses: Counter, elapsed: float) -> None:
+    """Print the number of games per status and the overall throughput"""
+    total = sum(statuses.values())
+    for status in GameCode:
+        if statuses[status]:
+            print(f"{status.name}: {statuses[status]}")
+
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    print(f"Checked {total} games in {elapsed:.2f}s ({rate:.0f} games/s)")
+
+
+def show_cache_summary(hits: int, misses: int) -> None:
+    """Print the number of games whose results were found in the cache"""
+    total = hits + misses
+    rate = hits / total if total else 0
+    print(f"Cache: {hits} hits, {misses} misses ({rate:.0%} hit rate)")
+
+
+def show_solution(
+    status: GameCode,
+    score: Optional[int],
+    best_move: Optional[int],
+    depth: Optional[int] = None,
+) -> None:
+    """
+    Print the outcome of the game with perfect play and the best move.
+    Games that are over or have errors are summarised as usual, and
+    searches that ran out of time show how far ahead they looked.
+    """
+    if best_move is None:
+        show_summary(status)
+        return
+
+    if status == GameCode.INCOMPLETE_GAME:
+        print(f"Solution: Undecided within {depth} moves")
+    else:
+        outcome = "Draw" if status == GameCode.DRAW else f"Player {int(status)} win"
+        print(f"Solution: {outcome} with perfect play")
+    print(f"Best move: {best_move} (score {score})")
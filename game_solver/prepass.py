@@ -0,0 +1,143 @@
+from typing import List, Optional, Tuple
+
+from game_solver.config import DIRECTIONS, GameCode
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy, moves are checked one at a time
+    np = None
+
+# Games with fewer moves than this are checked one move at a time,
+# as that is faster than creating arrays for them
+MIN_VECTORIZED_MOVES = 64
+
+# Boards with more cells than this are not searched for winning lines
+MAX_VECTORIZED_CELLS = 10**7
+
+
+def find_illegal_move(
+    width: int, height: int, moves: List[int]
+) -> Optional[Tuple[GameCode, int]]:
+    """
+    Find the first move in a column outside the board or in a full
+    column, without playing the moves on a board. Moves are positive
+    integers. Returns the error status and the index of the move,
+    or None if every move fits on the board.
+    """
+    if np is None or len(moves) < MIN_VECTORIZED_MOVES:
+        return find_illegal_move_python(width, height, moves)
+
+    columns = np.asarray(moves, dtype=np.int64)
+    outside = np.flatnonzero(columns > width)
+    if len(outside):
+        # Moves after the first one outside the board are never made
+        columns = columns[: outside[0]]
+
+    columns -= 1
+    full = None
+    # Only the columns with moves are counted, as boards can be very wide
+    _, counts = np.unique(columns, return_counts=True)
+    if counts.max(initial=0) > height:
+        full = find_full_column_move(columns, height)
+
+    if full is not None:
+        return GameCode.ILLEGAL_ROW, full
+    if len(outside):
+        return GameCode.ILLEGAL_COLUMN, int(outside[0])
+    return None
+
+
+def get_rows(columns: "np.ndarray") -> "np.ndarray":
+    """
+    Get the row of every move, i.e. the number of earlier moves in the
+    same column. The moves are sorted by column, keeping their order,
+    so that it is the distance from the first move in that column.
+    """
+    order = np.argsort(columns, kind="stable")
+    sorted_columns = columns[order]
+    rows = np.empty_like(columns)
+    rows[order] = np.arange(len(columns)) - np.searchsorted(
+        sorted_columns, sorted_columns
+    )
+    return rows
+
+
+def find_full_column_move(columns: "np.ndarray", height: int) -> int:
+    """Find the first move in a full column"""
+    return int(np.flatnonzero(get_rows(columns) >= height)[0])
+
+
+def shift(pieces: "np.ndarray", column_step: int, row_step: int) -> "np.ndarray":
+    """
+    Shift a (width, height) array of pieces, so that every cell gets
+    the piece of the cell a step away from it, or False off the board
+    """
+    width, height = pieces.shape
+    shifted = np.zeros_like(pieces)
+    if abs(column_step) >= width or abs(row_step) >= height:
+        return shifted
+
+    shifted[
+        max(-column_step, 0) : width + min(-column_step, 0),
+        max(-row_step, 0) : height + min(-row_step, 0),
+    ] = pieces[
+        max(column_step, 0) : width + min(column_step, 0),
+        max(row_step, 0) : height + min(row_step, 0),
+    ]
+    return shifted
+
+
+def has_line(pieces: "np.ndarray", direction: Tuple[int, int], length: int) -> bool:
+    """
+    Check if there is a line of pieces of a given length in a direction.
+    Lines are found by doubling: after every step, a cell is set if the
+    line of the covered length starting from it is full of pieces.
+    """
+    lines, covered = pieces, 1
+    while covered < length and lines.any():
+        step = min(covered, length - covered)
+        lines = lines & shift(lines, direction[0] * step, direction[1] * step)
+        covered += step
+    return bool(lines.any())
+
+
+def has_winning_line(
+    width: int, height: int, winning_moves: int, moves: List[int]
+) -> Optional[bool]:
+    """
+    Check if any player has a winning line after the given moves, which
+    all have to fit on the board. As pieces are never removed, this
+    tells if the game has been won during the moves. Returns None if
+    the moves are not checked, because there are only a few of them,
+    the board is too large or NumPy is not installed.
+    """
+    if (
+        np is None
+        or len(moves) < MIN_VECTORIZED_MOVES
+        or width * height > MAX_VECTORIZED_CELLS
+    ):
+        return None
+
+    columns = np.asarray(moves, dtype=np.int64) - 1
+    board = np.zeros((width, height), dtype=np.int8)
+    board[columns, get_rows(columns)] = np.arange(len(columns)) % 2 + 1
+    return any(
+        has_line(board == player, direction, winning_moves)
+        for player in (1, 2)
+        for direction in DIRECTIONS
+    )
+
+
+def find_illegal_move_python(
+    width: int, height: int, moves: List[int]
+) -> Optional[Tuple[GameCode, int]]:
+    """Find the first illegal column or row by counting moves in every column"""
+    heights = {}
+    for index, move in enumerate(moves):
+        if move > width:
+            return GameCode.ILLEGAL_COLUMN, index
+        if heights.get(move, 0) == height:
+            return GameCode.ILLEGAL_ROW, index
+        heights[move] = heights.get(move, 0) + 1
+    return None
@@ -0,0 +1,162 @@
+import json
+import time
+from collections import defaultdict
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from game_solver import game
+from game_solver.game import Game, GameBoard
+
+# Functions timed for every phase of checking a game, as
+# (owner, function name) where the owner is "game", "board" or
+# "module" for the Game class, the board engine and the game module
+PHASES = {
+    "parse": (
+        ("game", "parse_header"),
+        ("module", "parse_moves"),
+        ("module", "parse_move"),
+    ),
+    "place": (("board", "place_piece"),),
+    "check": (("board", "check_for_wins"),),
+}
+
+# GameChecker methods that look for wins around the newest piece.
+# get_lines is a generator, so the lines it gets are timed instead.
+CHECKS = (
+    "_check_lines_for_wins",
+    "is_winning_line",
+    "get_vertical_line",
+    "get_diagonal_line",
+    "get_horizontal_line",
+    "get_left_diagonal_upper_line",
+    "get_right_diagonal_upper_line",
+)
+
+
+def get_diagonal_name(args: tuple, kwargs: dict) -> str:
+    """Get the name of a get_diagonal_line call, including its orientation"""
+    orientation = kwargs.get("orientation", args[1] if len(args) > 1 else "right")
+    return f"get_diagonal_line[{orientation}]"
+
+
+class Profiler:
+    """
+    A context manager that counts calls and measures the cumulative
+    time spent in every phase of checking games (parsing, placing
+    pieces and checking for wins), in the GameChecker methods that
+    look for wins and in the windows yielded by sliding_window.
+
+    Functions are only replaced by timed wrappers while the context
+    is active, so there is no overhead when profiling is not used.
+    Times of functions that call each other include each other.
+    """
+
+    def __init__(self, engine: Type[GameBoard] = GameBoard) -> None:
+        self.engine = engine
+        # Name: [calls, total time in seconds]
+        self.stats: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self.windows = 0
+        self.originals: List[Tuple[object, str, Optional[Callable]]] = []
+
+    def __enter__(self) -> "Profiler":
+        owners = {"game": Game, "board": self.engine, "module": game}
+        for functions in PHASES.values():
+            for owner, name in functions:
+                self.patch(owners[owner], name, self.timed(name))
+        for name in CHECKS:
+            key = get_diagonal_name if name == "get_diagonal_line" else None
+            self.patch(self.engine, name, self.timed(name, key))
+        self.patch(game, "sliding_window", self.counted_windows)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for owner, name, original in reversed(self.originals):
+            if original is None:
+                # The method was inherited from a base class
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self.originals = []
+
+    def patch(self, owner: object, name: str, decorator: Callable) -> None:
+        """Replace a function of a class or module with a wrapped one"""
+        original = vars(owner).get(name)
+        self.originals.append((owner, name, original))
+        setattr(owner, name, decorator(getattr(owner, name)))
+
+    def timed(
+        self, name: str, key: Optional[Callable[[tuple, dict], str]] = None
+    ) -> Callable[[Callable], Callable]:
+        """
+        Get a decorator that counts calls and measures time spent in a
+        function. Calls are recorded under a name given by `key`, if set.
+        """
+        stats = self.stats
+        perf_counter = time.perf_counter
+
+        def decorator(function: Callable) -> Callable:
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    entry = stats[key(args, kwargs) if key else name]
+                    entry[0] += 1
+                    entry[1] += perf_counter() - start
+
+            return wrapper
+
+        return decorator
+
+    def counted_windows(self, function: Callable) -> Callable:
+        """Get a wrapper of sliding_window that counts the windows it yields"""
+        timed_function = self.timed("sliding_window")(function)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs) -> Iterator[tuple]:
+            for window in timed_function(*args, **kwargs):
+                self.windows += 1
+                yield window
+
+        return wrapper
+
+    def get_phases(self) -> Dict[str, List[float]]:
+        """Get the calls and total time of every phase"""
+        phases = {}
+        for phase, functions in PHASES.items():
+            calls, total = 0, 0.0
+            for _, name in functions:
+                if name in self.stats:
+                    calls += self.stats[name][0]
+                    total += self.stats[name][1]
+            phases[phase] = [calls, total]
+        return phases
+
+    def to_dict(self) -> dict:
+        """Get the profile as a dictionary, e.g. to dump it as JSON"""
+        return {
+            "engine": self.engine.__name__,
+            "phases": self.get_phases(),
+            "functions": dict(self.stats),
+            "windows": self.windows,
+        }
+
+    def dump(self, file: Path) -> None:
+        """Write the profile into a JSON file"""
+        file.write_text(json.dumps(self.to_dict(), indent=2))
+
+    def report(self) -> str:
+        """Get a table of the calls and times of every phase and function"""
+        lines = []
+        for title, rows in (
+            ("Phase", self.get_phases().items()),
+            ("Function", sorted(self.stats.items(), key=lambda item: -item[1][1])),
+        ):
+            lines.append(f"{title:<40}{'Calls':>10}{'Total':>12}{'Per call':>12}")
+            for name, (calls, total) in rows:
+                per_call = total / calls * 1e6 if calls else 0.0
+                lines.append(f"{name:<40}{calls:>10}{total:>11.4f}s{per_call:>10.2f}us")
+        lines.append(f"Windows yielded by sliding_window: {self.windows}")
+        return "\n".join(lines)
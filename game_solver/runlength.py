@@ -0,0 +1,69 @@
+from array import array
+
+from game_solver.config import DIRECTIONS
+from game_solver.game import GameBoard
+
+
+class RunLengthBoard(GameBoard):
+    """
+    A game board that keeps, for every cell and line direction, the
+    length of the line of same-player pieces the cell belongs to.
+    Only the cells at both ends of a line are kept up to date. When
+    a piece lands next to the end of a line, the new line length is
+    found from its neighbours, so a win is detected in constant time
+    no matter how many pieces are needed to win.
+    """
+
+    def init_cells(self) -> None:
+        """Create empty cells and line lengths in flat arrays"""
+        # Cells are stored column by column
+        cells = self.width * self.height
+        self.pieces = bytearray(cells)
+        self.runs = [array("I", [0]) * cells for _ in DIRECTIONS]
+        # The longest line that the newest piece is part of
+        self.current_run = 0
+
+    def get_run(self, column: int, row: int, direction_runs: array) -> int:
+        """
+        Get the length of the current player's line ending at a given
+        cell, or 0 if the cell is outside the board or not theirs.
+        """
+        if 0 <= column < self.width and 0 <= row < self.height:
+            index = column * self.height + row
+            if self.pieces[index] == self.current_player:
+                return direction_runs[index]
+        return 0
+
+    def set_piece(self, column: int, row: int) -> None:
+        """Mark the current player's piece and update the line lengths"""
+        height = self.height
+        self.pieces[column * height + row] = self.current_player
+        self.current_run = 0
+
+        for (step_column, step_row), direction_runs in zip(DIRECTIONS, self.runs):
+            # The neighbours are the ends of the lines on either side,
+            # so they hold the full length of those lines
+            before = self.get_run(column - step_column, row - step_row, direction_runs)
+            after = self.get_run(column + step_column, row + step_row, direction_runs)
+            run = before + 1 + after
+
+            # Update both ends of the joined line and the new piece
+            direction_runs[column * height + row] = run
+            first_column = column - before * step_column
+            first_row = row - before * step_row
+            direction_runs[first_column * height + first_row] = run
+            last_column = column + after * step_column
+            last_row = row + after * step_row
+            direction_runs[last_column * height + last_row] = run
+
+            if run > self.current_run:
+                self.current_run = run
+
+    def get_piece(self, column: int, row: int) -> int:
+        """Get the player whose piece is in a cell"""
+        return self.pieces[column * self.height + row]
+
+    def check_for_wins(self) -> None:
+        """Check if the game has been won"""
+        if self.current_run >= self.winning_moves:
+            self.winner = self.current_player
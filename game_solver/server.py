@@ -0,0 +1,174 @@
+import asyncio
+import io
+import json
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import Optional, Tuple, Type
+
+from game_solver.config import GAME_OUTPUT_MESSAGES, GameCode
+from game_solver.game import Game, GameBoard
+
+# The largest number of requests from one connection checked at once.
+# Reading from a connection is paused until earlier responses are sent.
+MAX_PIPELINED_REQUESTS = 256
+
+# The longest request line accepted, in bytes
+MAX_REQUEST_SIZE = 2**20
+
+
+def parse_address(address: str) -> Tuple[str, Optional[int]]:
+    """
+    Parse a server address into a host and port. Addresses without
+    a port are paths to a Unix socket and are returned with no port.
+    """
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address, None
+
+
+def parse_request(line: bytes) -> Tuple[object, Optional[str], Optional[str]]:
+    """
+    Parse a request line into its id, game text and game file path.
+    Requests are JSON objects such as {"id": 1, "text": "7 6 4\\n1\\n"}
+    or {"id": 2, "path": "games/draw.txt"}. Raises a ValueError with
+    the reason if the request is not valid.
+    """
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("request is not a JSON object")
+
+    text, path = request.get("text"), request.get("path")
+    if (text is None) == (path is None):
+        raise ValueError("request needs either text or path")
+    if not isinstance(text if text is not None else path, str):
+        raise ValueError("text and path should be strings")
+    return request.get("id"), text, path
+
+
+def check_request(
+    text: Optional[str], path: Optional[str], engine: Type[GameBoard] = GameBoard
+) -> GameCode:
+    """Check a game given as text or as a path to a game file"""
+    try:
+        if text is not None:
+            return Game(io.StringIO(text), engine).play()
+
+        with Path(path).open(mode="r") as fp:
+            return Game(fp, engine).play()
+    except StopIteration:
+        # The game has no header
+        return GameCode.ILLEGAL_FILE
+    except (OSError, IOError, UnicodeError):
+        return GameCode.FILE_ERROR
+
+
+def make_response(request_id: object, status: GameCode) -> bytes:
+    """Create a response line with the game status and its message"""
+    response = {
+        "id": request_id,
+        "status": int(status),
+        "name": status.name,
+        "message": GAME_OUTPUT_MESSAGES[status],
+    }
+    return json.dumps(response).encode() + b"\n"
+
+
+def make_error_response(request_id: object, error: str) -> bytes:
+    """Create a response line for a request that could not be checked"""
+    return json.dumps({"id": request_id, "error": error}).encode() + b"\n"
+
+
+async def handle_request(
+    line: bytes, engine: Type[GameBoard], executor: Executor
+) -> bytes:
+    """Check the game in a request line on the executor and get the response"""
+    try:
+        request_id, text, path = parse_request(line)
+    except ValueError as error:
+        return make_error_response(None, f"invalid request: {error}")
+
+    loop = asyncio.get_running_loop()
+    try:
+        status = await loop.run_in_executor(executor, check_request, text, path, engine)
+    except Exception as error:
+        # The worker failed, e.g. because a worker process was killed
+        return make_error_response(request_id, f"check failed: {error!r}")
+    return make_response(request_id, status)
+
+
+async def send_responses(writer: asyncio.StreamWriter, responses: asyncio.Queue):
+    """
+    Send responses to a connection in the same order as the requests.
+    Stops at None. Responses are still awaited after the client has
+    disconnected, so that pending requests are not left behind.
+    """
+    connected = True
+    while (response := await responses.get()) is not None:
+        data = await response
+        if not connected:
+            continue
+
+        try:
+            writer.write(data)
+            await writer.drain()
+        except ConnectionError:
+            connected = False
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    engine: Type[GameBoard],
+    executor: Executor,
+) -> None:
+    """
+    Check every request line from a connection. Requests are checked
+    concurrently as they arrive, so many requests can be pipelined.
+    """
+    responses = asyncio.Queue(MAX_PIPELINED_REQUESTS)
+    sender = asyncio.create_task(send_responses(writer, responses))
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                request = handle_request(line, engine, executor)
+                await responses.put(asyncio.create_task(request))
+    except (ValueError, asyncio.LimitOverrunError):
+        # The request is too long, so the rest of the stream can't be parsed
+        response = make_error_response(None, "request is too long")
+        await responses.put(asyncio.sleep(0, response))
+    except ConnectionError:
+        pass
+    finally:
+        await responses.put(None)
+        await sender
+        writer.close()
+
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+async def start_server(
+    address: str, engine: Type[GameBoard], executor: Executor
+) -> asyncio.AbstractServer:
+    """Start a server checking games on a TCP address or a Unix socket"""
+    handler = partial(handle_connection, engine=engine, executor=executor)
+    host, port = parse_address(address)
+    if port is None:
+        return await asyncio.start_unix_server(
+            handler, path=host, limit=MAX_REQUEST_SIZE
+        )
+    return await asyncio.start_server(handler, host, port, limit=MAX_REQUEST_SIZE)
+
+
+async def serve(address: str, engine: Type[GameBoard], executor: Executor) -> None:
+    """Check games sent to a server until it is stopped"""
+    server = await start_server(address, engine, executor)
+    for socket in server.sockets:
+        print(f"Listening on {socket.getsockname()}")
+
+    async with server:
+        await server.serve_forever()
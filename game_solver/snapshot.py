@@ -0,0 +1,150 @@
+import hashlib
+import sqlite3
+import struct
+import sys
+from array import array
+from itertools import chain
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# Snapshot layout (all values are little-endian):
+#  - header: winner (0 if nobody has won) and number of columns with pieces
+#  - column and number of pieces of every column with pieces, as uint64
+#  - players of the pieces, column by column from the bottom, one bit per
+#    piece, which is set for player 2
+SNAPSHOT_HEADER = struct.Struct("<BQ")
+HEIGHT_TYPECODE = "Q"
+
+# Maps players (1 and 2) to the ASCII bits of their pieces, and back
+PLAYER_BITS = bytes.maketrans(b"\x01\x02", b"01")
+BIT_PLAYERS = bytes.maketrans(b"01", b"\x01\x02")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    board BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def get_digest(data: bytes) -> bytes:
+    """Get the digest of the content of a game file up to a snapshot"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class BoardSnapshot(NamedTuple):
+    """
+    The pieces on a game board and the winner, if there is one.
+    Boards of any engine can be restored from a snapshot, as the
+    player to move next follows from the number of pieces.
+    """
+
+    # Number of pieces in every column with pieces (counted from 0)
+    heights: Dict[int, int]
+    # Players of the pieces (1 or 2), column by column from the bottom
+    players: bytes
+    winner: Optional[int] = None
+
+    def to_bytes(self) -> bytes:
+        """Get the compact form of the snapshot"""
+        columns = array(HEIGHT_TYPECODE, chain.from_iterable(self.heights.items()))
+        if sys.byteorder == "big":
+            columns.byteswap()
+        # The first piece is the lowest bit
+        bits = int(self.players.translate(PLAYER_BITS)[::-1] or b"0", 2)
+        return (
+            SNAPSHOT_HEADER.pack(self.winner or 0, len(self.heights))
+            + columns.tobytes()
+            + bits.to_bytes((len(self.players) + 7) // 8, "little")
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BoardSnapshot":
+        """Get a snapshot from its compact form"""
+        winner, total = SNAPSHOT_HEADER.unpack_from(data)
+        columns_end = SNAPSHOT_HEADER.size + 2 * total * array(HEIGHT_TYPECODE).itemsize
+        columns = array(HEIGHT_TYPECODE, data[SNAPSHOT_HEADER.size : columns_end])
+        if sys.byteorder == "big":
+            columns.byteswap()
+        heights = dict(zip(columns[::2], columns[1::2]))
+
+        pieces = sum(heights.values())
+        bits = int.from_bytes(data[columns_end:], "little")
+        players = format(bits, f"0{pieces}b")[::-1].encode().translate(BIT_PLAYERS)
+        return cls(heights, players[:pieces], winner or None)
+
+
+class SnapshotStore:
+    """
+    An on-disk store of game board snapshots, keyed by the path of the
+    game file. Every snapshot is taken at the byte offset after a line
+    of the file, and is kept with the digest of the content before that
+    offset, to tell if the file has been rewritten rather than appended
+    to since then. Only the latest snapshot of every file is kept.
+
+    The database connection is opened on first use and is not pickled,
+    so a store can be sent to worker processes.
+    """
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> dict:
+        return {"file": self.file}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["file"])
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the database connection, creating the store file if needed"""
+        if self._connection is None:
+            connection = sqlite3.connect(str(self.file), timeout=30)
+            # Readers and writers in other processes do not block each other
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def get(self, path: str) -> Optional[Tuple[int, bytes, BoardSnapshot]]:
+        """
+        Get the offset and the digest of the content before the offset
+        of the latest snapshot of a game file, with the snapshot itself
+        """
+        row = self.connection.execute(
+            "SELECT offset, digest, board FROM snapshots WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        offset, digest, board = row
+        return offset, digest, BoardSnapshot.from_bytes(board)
+
+    def put(
+        self, path: str, offset: int, digest: bytes, snapshot: BoardSnapshot
+    ) -> None:
+        """Store the latest snapshot of a game file"""
+        with self.connection as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                (path, offset, digest, snapshot.to_bytes()),
+            )
+
+    def __len__(self) -> int:
+        (total,) = self.connection.execute("SELECT COUNT(*) FROM snapshots").fetchone()
+        return total
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,914 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.sharedctypes import Synchronized
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+from game_solver.bitboard import BitBoard
+from game_solver.config import DEFAULT_TABLE_MEMORY, GameCode
+from game_solver.game import Game, GameError, parse_moves
+from game_solver.transposition import (
+    EXACT,
+    LOWER,
+    NO_MOVE,
+    UPPER,
+    TranspositionTable,
+    get_zobrist_keys,
+)
+
+if TYPE_CHECKING:
+    from game_solver.book import OpeningBook
+
+
+class Position:
+    """
+    A position to search, stored as two bitmasks like the bitboard
+    engine: the pieces of the player to move and all pieces. Moves are
+    made and taken back in place, updating the Zobrist hash of the
+    position. The cells where a player would win are found with shifts
+    and ANDs for any number of winning moves.
+    """
+
+    __slots__ = (
+        "width",
+        "height",
+        "winning_moves",
+        "size",
+        "stride",
+        "shifts",
+        "bottom_mask",
+        "board_mask",
+        "column_masks",
+        "current",
+        "mask",
+        "moves",
+        "zobrist_keys",
+        "hash",
+    )
+
+    def __init__(self, width: int, height: int, winning_moves: int) -> None:
+        self.width = width
+        self.height = height
+        self.winning_moves = winning_moves
+        self.size = width * height
+
+        # Each column takes up `height + 1` bits, as in the bitboard engine
+        stride = height + 1
+        self.stride = stride
+        self.shifts = (1, stride, stride + 1, stride - 1)
+        self.bottom_mask = sum(1 << column * stride for column in range(width))
+        self.board_mask = self.bottom_mask * ((1 << height) - 1)
+        self.column_masks = [
+            ((1 << height) - 1) << column * stride for column in range(width)
+        ]
+
+        self.current = 0  # Pieces of the player to move
+        self.mask = 0  # Pieces of both players
+        self.moves = 0
+        # Keys of the pieces of the first and second player, by bit
+        self.zobrist_keys = get_zobrist_keys(width * stride)
+        self.hash = 0
+
+    @classmethod
+    def from_board(cls, board: BitBoard) -> "Position":
+        """Create a position from a bitboard that has been played on"""
+        position = cls(board.width, board.height, board.winning_moves)
+        position.mask = board.masks[0] | board.masks[1]
+        position.current = board.masks[board.total_moves % 2]
+        position.moves = board.total_moves
+        for keys, pieces in zip(position.zobrist_keys, board.masks):
+            while pieces:
+                piece = pieces & -pieces
+                position.hash ^= keys[piece.bit_length() - 1]
+                pieces ^= piece
+        return position
+
+    @property
+    def player(self) -> int:
+        """The player (1 or 2) to move"""
+        return self.moves % 2 + 1
+
+    def possible(self) -> int:
+        """Get a bitmask of the cells where a piece can be put"""
+        return (self.mask + self.bottom_mask) & self.board_mask
+
+    def play(self, column: int) -> None:
+        """Put a piece of the player to move in a column"""
+        mask = self.mask
+        self.current ^= mask
+        self.mask = mask | (mask + (self.bottom_mask & self.column_masks[column]))
+        piece = self.mask ^ mask
+        self.hash ^= self.zobrist_keys[self.moves & 1][piece.bit_length() - 1]
+        self.moves += 1
+
+    def undo(self, column: int) -> None:
+        """Take back the last piece put in a column"""
+        column_mask = self.column_masks[column]
+        pieces = self.mask & column_mask
+        # Pieces fill up a column from the bottom, so adding the bottom
+        # cell gives the cell above the top piece
+        top = (pieces + (self.bottom_mask & column_mask)) >> 1
+        self.mask ^= top
+        self.current ^= self.mask
+        self.moves -= 1
+        self.hash ^= self.zobrist_keys[self.moves & 1][top.bit_length() - 1]
+
+    def winning_cells(self, pieces: int) -> int:
+        """
+        Get a bitmask of the empty cells that would complete a line of
+        `winning_moves` pieces. A cell completes a line if there are
+        `before` pieces in a row below it and `after` pieces above it
+        along a direction, where `before + after = winning_moves - 1`.
+        """
+        if self.winning_moves == 4:
+            return self.winning_cells_of_four(pieces)
+
+        length = self.winning_moves - 1
+        board_mask = self.board_mask
+        cells = 0
+        for shift in self.shifts:
+            # Cells with a run of pieces of every length below and above them
+            below, above = [board_mask], [board_mask]
+            for run in range(1, length + 1):
+                below.append(below[-1] & (pieces << run * shift))
+                above.append(above[-1] & (pieces >> run * shift))
+
+            for before in range(length + 1):
+                cells |= below[before] & above[length - before]
+        return cells & (board_mask ^ self.mask)
+
+    def winning_cells_of_four(self, pieces: int) -> int:
+        """
+        Get the winning cells when four pieces in a row win, which is
+        the same as winning_cells with the loops unrolled. Lines can't
+        go down from the newest piece, so only the three pieces below
+        a cell are checked for vertical lines.
+        """
+        cells = (pieces << 1) & (pieces << 2) & (pieces << 3)
+        for shift in self.shifts[1:]:
+            below = (pieces << shift) & (pieces << 2 * shift)
+            above = (pieces >> shift) & (pieces >> 2 * shift)
+            cells |= below & ((pieces << 3 * shift) | (pieces >> shift))
+            cells |= above & ((pieces >> 3 * shift) | (pieces << shift))
+        return cells & (self.board_mask ^ self.mask)
+
+    def get_win_score(self) -> int:
+        """
+        Get the score of the player to move winning with the next piece.
+        Wins with fewer pieces have higher scores, and a draw is 0.
+        """
+        return (self.size + 1 - self.moves) // 2
+
+    def get_mirror_hash(self) -> int:
+        """Get the hash of the position mirrored left to right"""
+        stride = self.stride
+        last_column = self.width - 1
+        mirror_hash = 0
+        for player, keys in enumerate(self.zobrist_keys):
+            pieces = self.current
+            if player != self.moves & 1:
+                pieces ^= self.mask
+            while pieces:
+                piece = pieces & -pieces
+                column, row = divmod(piece.bit_length() - 1, stride)
+                mirror_hash ^= keys[(last_column - column) * stride + row]
+                pieces ^= piece
+        return mirror_hash
+
+
+class Solution(NamedTuple):
+    """
+    The outcome of a game with perfect play from a position, the score
+    of the player to move and a move that gets that score. Scores are
+    positive for wins, negative for losses and 0 for a draw. The best
+    move is None if the game is over, in which case the status can also
+    be an error of the game so far. Searches that run out of time give
+    the outcome found within `depth` moves, which is an incomplete game
+    if neither player can be forced to lose within them.
+    """
+
+    status: GameCode
+    score: Optional[int] = None
+    best_move: Optional[int] = None
+    nodes: int = 0
+    depth: Optional[int] = None
+
+
+class Solver:
+    """
+    A negamax search with alpha-beta pruning. Moves that let the other
+    player win straight away are never searched, and columns are
+    searched from the centre out, as central pieces are part of the
+    most lines. Scores of searched positions are kept in a transposition
+    table of `table_memory` bytes, so positions reached by other move
+    orders are not searched again, and the best move found for a
+    position is searched first. The score is narrowed down with null
+    window searches. A table can also be given, to keep the scores
+    found by earlier searches. Positions in the opening book, if one
+    is given, are not searched.
+    """
+
+    def __init__(
+        self,
+        position: Position,
+        table_memory: int = DEFAULT_TABLE_MEMORY,
+        table: Optional[TranspositionTable] = None,
+        book: Optional["OpeningBook"] = None,
+    ) -> None:
+        self.position = position
+        self.nodes = 0
+        self.table = table if table is not None else TranspositionTable(table_memory)
+        self.book = book
+        # Columns from the centre out
+        centre = (position.width - 1) / 2
+        self.column_order = sorted(
+            range(position.width), key=lambda column: abs(column - centre)
+        )
+        # Columns from the centre out with each column moved to the
+        # front, followed by the order without a best move
+        self.move_orders = [
+            [column] + [other for other in self.column_order if other != column]
+            for column in range(position.width)
+        ] + [self.column_order]
+
+    def get_moves(self) -> Optional[int]:
+        """
+        Get a bitmask of the cells where the player to move can put a
+        piece without letting the other player win with the next one,
+        or None if the player to move can win with the next piece.
+        """
+        position = self.position
+        possible = position.possible()
+        if position.winning_cells(position.current) & possible:
+            return None
+
+        opponent_wins = position.winning_cells(position.current ^ position.mask)
+        forced = possible & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                # The other player can win in two places
+                return 0
+            possible = forced
+        # Don't play below a cell where the other player would win
+        return possible & ~(opponent_wins >> 1)
+
+    def negamax(self, alpha: int, beta: int) -> int:
+        """
+        Get the score of the position for the player to move, if it is
+        within (alpha, beta). Otherwise, get a bound of the score: at
+        most alpha if it is lower, or at least beta if it is higher.
+        """
+        self.nodes += 1
+        position = self.position
+        moves = self.get_moves()
+        if moves is None:
+            return position.get_win_score()
+        if not moves:
+            # The other player wins with the next piece
+            return -((position.size - position.moves) // 2)
+        if position.moves >= position.size - 2:
+            # Neither player can win with the last pieces
+            return 0
+
+        # The other player can't win with the next piece, and
+        # the player to move can't win with the next piece
+        lower = -((position.size - 2 - position.moves) // 2)
+        upper = (position.size - 1 - position.moves) // 2
+        key = position.hash
+        best_move = NO_MOVE
+        if (entry := self.table.get(key)) is not None:
+            _, bound, score, best_move = entry
+            if bound == EXACT:
+                return score
+            if bound == LOWER:
+                lower = max(lower, score)
+            else:
+                upper = min(upper, score)
+
+        if alpha < lower:
+            alpha = lower
+        if beta > upper:
+            beta = upper
+        if alpha >= beta:
+            return alpha
+
+        best = -position.size
+        window_alpha = alpha
+        column_masks = position.column_masks
+        for column in self.move_orders[best_move]:
+            if moves & column_masks[column]:
+                position.play(column)
+                score = -self.negamax(-beta, -alpha)
+                position.undo(column)
+                if score > best:
+                    best, best_move = score, column
+                if score >= beta:
+                    break
+                if score > alpha:
+                    alpha = score
+
+        if best <= window_alpha:
+            # Every move is at most as good as alpha
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.put(key, position.size - position.moves, bound, best, best_move)
+        return best
+
+    def get_score(self) -> int:
+        """
+        Get the score of the position by searching with null windows,
+        each of which tells if the score is above a value or not
+        """
+        position = self.position
+        lowest = -((position.size - position.moves) // 2)
+        highest = (position.size + 1 - position.moves) // 2
+        while lowest < highest:
+            middle = lowest + (highest - lowest) // 2
+            if middle <= 0 and lowest // 2 < middle:
+                middle = lowest // 2
+            elif middle >= 0 and highest // 2 > middle:
+                middle = highest // 2
+            lowest, highest = self.narrow(middle, lowest, highest)
+        return lowest
+
+    def narrow(self, middle: int, lowest: int, highest: int) -> Tuple[int, int]:
+        """
+        Narrow down the lowest and highest possible scores with a null
+        window search, which tells if the score is above `middle`
+        """
+        score = self.negamax(middle, middle + 1)
+        if score <= middle:
+            return lowest, score
+        return score, highest
+
+    def solve(self) -> Solution:
+        """Find the score of the position and the best move to play"""
+        if (solution := self.solve_from_book()) is not None:
+            return solution
+
+        position = self.position
+        moves = self.get_moves()
+        if moves is None:
+            winning = position.winning_cells(position.current) & position.possible()
+            return self.get_solution(position.get_win_score(), winning)
+        if not moves:
+            # Every move loses, so any of them is the best one
+            score = -((position.size - position.moves) // 2)
+            return self.get_solution(score, position.possible())
+
+        score = self.get_score()
+        for column in self.get_columns(moves):
+            position.play(column)
+            # The move is the best one if the other player can't get more
+            # than the negative of the score after it
+            column_score = -self.negamax(-score, -score + 1)
+            position.undo(column)
+            if column_score >= score:
+                return self.get_solution(score, position.column_masks[column])
+        raise AssertionError("No move reaches the score of the position")
+
+    def solve_from_book(self) -> Optional[Solution]:
+        """Get the solution of the position from the book, if it is in it"""
+        if self.book is None or (entry := self.book.get(self.position)) is None:
+            return None
+        score, best_move = entry
+        return self.get_solution(score, self.position.column_masks[best_move])
+
+    def get_columns(self, moves: int) -> List[int]:
+        """Get the columns of the cells in a bitmask, from the centre out"""
+        column_masks = self.position.column_masks
+        return [column for column in self.column_order if moves & column_masks[column]]
+
+    def get_solution(self, score: int, moves: int) -> Solution:
+        """Get the solution with a score reached by any of the moves"""
+        player = self.position.player
+        if score > 0:
+            status = GameCode(player)
+        elif score < 0:
+            status = GameCode(3 - player)
+        else:
+            status = GameCode.DRAW
+        best_move = self.get_columns(moves)[0] + 1
+        return Solution(status, score, best_move, self.nodes)
+
+
+class SearchTimeout(Exception):
+    """
+    An exception to stop a search that has run out of time or nodes,
+    or is no longer needed
+    """
+
+
+class DeepeningSolver(Solver):
+    """
+    A search that looks one move further ahead on every iteration,
+    until it runs out of time or nodes, and gives the best move of the
+    last iteration that finished. Positions past the depth of an
+    iteration are scored 0, so only wins and losses within the depth
+    are scored. The best moves of each iteration, kept in the table,
+    are searched first in the next one. The time limit counts from
+    when the solver is created, as creating the table takes time too.
+    The clock is only read every CLOCK_INTERVAL nodes, and a search
+    with a node budget and no time limit always gives the same result.
+    """
+
+    # Nodes searched between reading the clock, a power of two
+    CLOCK_INTERVAL = 256
+
+    def __init__(
+        self,
+        position: Position,
+        time_limit: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        table_memory: int = DEFAULT_TABLE_MEMORY,
+        book: Optional["OpeningBook"] = None,
+    ) -> None:
+        self.deadline = math.inf
+        if time_limit is not None:
+            self.deadline = time.perf_counter() + time_limit
+        super().__init__(position, table_memory, book=book)
+        self.max_nodes = math.inf if max_nodes is None else max_nodes
+        # The depth of the last iteration that finished
+        self.depth = 0
+
+    def search(self, alpha: int, beta: int, depth: int) -> int:
+        """
+        Get the score of the position like negamax, looking at most
+        `depth` moves ahead. Raises SearchTimeout when the search has
+        run out of time or nodes.
+        """
+        self.nodes += 1
+        if self.nodes > self.max_nodes or (
+            not self.nodes & (self.CLOCK_INTERVAL - 1)
+            and time.perf_counter() > self.deadline
+        ):
+            raise SearchTimeout()
+
+        position = self.position
+        moves = self.get_moves()
+        if moves is None:
+            return position.get_win_score()
+        if not moves:
+            return -((position.size - position.moves) // 2)
+        if position.moves >= position.size - 2:
+            return 0
+        if depth == 0:
+            # Nobody wins within the depth
+            return 0
+
+        # Searching past the last empty cell gives the same score
+        depth = min(depth, position.size - position.moves)
+        lower = -((position.size - 2 - position.moves) // 2)
+        upper = (position.size - 1 - position.moves) // 2
+        key = position.hash
+        best_move = NO_MOVE
+        if (entry := self.table.get(key)) is not None:
+            searched, bound, score, best_move = entry
+            if searched >= depth:
+                if bound == EXACT:
+                    return score
+                if bound == LOWER:
+                    lower = max(lower, score)
+                else:
+                    upper = min(upper, score)
+
+        if alpha < lower:
+            alpha = lower
+        if beta > upper:
+            beta = upper
+        if alpha >= beta:
+            return alpha
+
+        best = -position.size
+        window_alpha = alpha
+        column_masks = position.column_masks
+        for column in self.move_orders[best_move]:
+            if moves & column_masks[column]:
+                position.play(column)
+                try:
+                    score = -self.search(-beta, -alpha, depth - 1)
+                finally:
+                    position.undo(column)
+                if score > best:
+                    best, best_move = score, column
+                if score >= beta:
+                    break
+                if score > alpha:
+                    alpha = score
+
+        if best <= window_alpha:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.put(key, depth, bound, best, best_move)
+        return best
+
+    def search_root(self, columns: List[int], depth: int) -> Tuple[int, int]:
+        """Get the best score looking `depth` moves ahead and its column"""
+        position = self.position
+        alpha, beta = -position.size, position.size
+        best_column = columns[0]
+        for column in columns:
+            position.play(column)
+            try:
+                score = -self.search(-beta, -alpha, depth - 1)
+            finally:
+                position.undo(column)
+            if score > alpha:
+                alpha, best_column = score, column
+        return alpha, best_column
+
+    def solve(self) -> Solution:
+        """
+        Find the best move within the time limit and node budget. The
+        search stops early once a win or a loss has been found, or the
+        game has been searched to the end.
+        """
+        position = self.position
+        if (solution := self.solve_from_book()) is not None:
+            # The book has the score of the whole game
+            return solution._replace(depth=position.size - position.moves)
+
+        moves = self.get_moves()
+        if moves is None or not moves:
+            # The game is decided with the next piece
+            return super().solve()
+
+        columns = self.get_columns(moves)
+        score = 0
+        for depth in range(1, position.size - position.moves + 1):
+            try:
+                score, best_column = self.search_root(columns, depth)
+            except SearchTimeout:
+                break
+            self.depth = depth
+            # The best move is searched first in the next iteration
+            columns.remove(best_column)
+            columns.insert(0, best_column)
+            if score != 0:
+                break
+
+        solution = self.get_solution(score, position.column_masks[columns[0]])
+        if score == 0 and self.depth < position.size - position.moves:
+            # Neither player wins within the depth
+            solution = solution._replace(status=GameCode.INCOMPLETE_GAME)
+        return solution._replace(depth=self.depth)
+
+
+class SubproblemSolver(Solver):
+    """
+    A search of a position after the first moves of a parallel search,
+    which stops once its result is no longer needed. The search is
+    needed until the parallel search moves past `iteration`, which is
+    checked every CHECK_INTERVAL nodes.
+    """
+
+    # Nodes searched between checking the iteration, a power of two
+    CHECK_INTERVAL = 256
+
+    def __init__(
+        self,
+        position: Position,
+        table: TranspositionTable,
+        current_iteration: Synchronized,
+        iteration: int,
+    ) -> None:
+        super().__init__(position, table=table)
+        self.current_iteration = current_iteration
+        self.iteration = iteration
+
+    def negamax(self, alpha: int, beta: int) -> int:
+        """
+        Get the score of the position like Solver.negamax. Raises
+        SearchTimeout when the search is no longer needed.
+        """
+        if (
+            not self.nodes & (self.CHECK_INTERVAL - 1)
+            and self.current_iteration.value != self.iteration
+        ):
+            raise SearchTimeout()
+        return super().negamax(alpha, beta)
+
+
+# The iteration of the parallel search that worker processes search
+# positions for, and the transposition table each process keeps between
+# positions
+worker_iteration = None
+worker_table = None
+
+
+def init_worker(current_iteration: Synchronized, table_memory: int) -> None:
+    """Set up a worker process of a parallel search"""
+    global worker_iteration, worker_table
+    worker_iteration = current_iteration
+    worker_table = TranspositionTable(table_memory)
+
+
+def search_subproblem(
+    position: Position,
+    path: Tuple[int, ...],
+    middle: int,
+    iteration: int,
+    current_iteration: Optional[Synchronized] = None,
+    table: Optional[TranspositionTable] = None,
+) -> Tuple[Optional[int], int]:
+    """
+    Find out if the score of the player to move at the root is above
+    `middle` after the columns in a path, with a null window search.
+    Gets a bound of the score, like negamax, and the number of nodes
+    searched. The bound is None if the search was stopped. Worker
+    processes use their own table and iteration, unless given.
+    """
+    for column in path:
+        position.play(column)
+    solver = SubproblemSolver(
+        position,
+        worker_table if table is None else table,
+        worker_iteration if current_iteration is None else current_iteration,
+        iteration,
+    )
+    try:
+        if len(path) % 2 == 0:
+            score = solver.negamax(middle, middle + 1)
+        else:
+            # The other player is to move, so the window and score are negated
+            score = -solver.negamax(-middle - 1, -middle)
+    except SearchTimeout:
+        score = None
+    for column in reversed(path):
+        position.undo(column)
+    return score, solver.nodes
+
+
+def get_split_plies(width: int, workers: int) -> int:
+    """
+    Get the number of moves to split a search after, which is the
+    fewest that give at least as many positions as workers
+    """
+    plies = 1
+    while width**plies < workers:
+        plies += 1
+    return plies
+
+
+class ParallelSolver(Solver):
+    """
+    A search split into the positions after the first `plies` moves,
+    which are searched by a pool of `workers` processes. The score is
+    narrowed down with null window searches like Solver, each of which
+    is split up: the processes search the positions with the window,
+    and the bounds they find are combined into bounds of the score.
+    As soon as the bounds tell if the score is above the window, the
+    processes stop the positions left and move on to the next window.
+    Each process keeps its own transposition table of `table_memory`
+    bytes between positions.
+    """
+
+    def __init__(
+        self,
+        position: Position,
+        workers: int,
+        plies: Optional[int] = None,
+        table_memory: int = DEFAULT_TABLE_MEMORY,
+        book: Optional["OpeningBook"] = None,
+    ) -> None:
+        super().__init__(position, table_memory, book=book)
+        self.workers = workers
+        self.plies = plies or get_split_plies(position.width, workers)
+        # Paths of columns to the positions searched by the processes,
+        # and the paths one move longer than every shorter path
+        self.paths = []
+        self.children = {}
+        # The null window searches are counted, so that the processes
+        # can tell when a search has moved on
+        self.current_iteration = multiprocessing.Value("i", 0)
+        self.pool = None
+        # The first move of the best lower bound of the score
+        self.best_column = None
+
+    def get_subproblems(self) -> List[Tuple[int, ...]]:
+        """
+        Get the paths of columns to the positions to search, depth
+        first and from the centre out. Paths stop early at positions
+        that are decided with the next piece or have nearly no cells
+        left.
+        """
+        paths = []
+        self.add_subproblems((), paths)
+        return paths
+
+    def add_subproblems(
+        self, path: Tuple[int, ...], paths: List[Tuple[int, ...]]
+    ) -> None:
+        """Add the paths to the positions to search after a path"""
+        position = self.position
+        moves = self.get_moves()
+        if len(path) == self.plies or not moves or position.moves >= position.size - 2:
+            paths.append(path)
+            return
+
+        self.children[path] = []
+        for column in self.get_columns(moves):
+            self.children[path].append(path + (column,))
+            position.play(column)
+            self.add_subproblems(path + (column,), paths)
+            position.undo(column)
+
+    def search_subproblems(
+        self, middle: int
+    ) -> Iterator[Tuple[Tuple[int, ...], Optional[int]]]:
+        """
+        Search every position with a null window around `middle`, and
+        get their bounds as they are found. Positions that are not
+        searched yet are stopped once the iterator is closed.
+        """
+        iteration = self.current_iteration.value
+        if self.pool is None:
+            # Not worth starting a process pool for a single worker
+            for path in self.paths:
+                score, nodes = search_subproblem(
+                    self.position,
+                    path,
+                    middle,
+                    iteration,
+                    self.current_iteration,
+                    self.table,
+                )
+                self.nodes += nodes
+                yield path, score
+            return
+
+        futures = {
+            self.pool.submit(
+                search_subproblem, self.position, path, middle, iteration
+            ): path
+            for path in self.paths
+        }
+        try:
+            for future in as_completed(futures):
+                score, nodes = future.result()
+                self.nodes += nodes
+                yield futures[future], score
+        finally:
+            with self.current_iteration.get_lock():
+                self.current_iteration.value += 1
+            for future in futures:
+                future.cancel()
+
+    def get_bound(
+        self, path: Tuple[int, ...], bounds: Dict[Tuple[int, ...], int], unknown: int
+    ) -> int:
+        """
+        Get a bound of the score of the player to move at the root after
+        a path, from bounds of the positions searched so far. Positions
+        that are not searched yet get the `unknown` bound.
+        """
+        if path not in self.children:
+            return bounds.get(path, unknown)
+        scores = [
+            self.get_bound(child, bounds, unknown) for child in self.children[path]
+        ]
+        # The players take turns to pick the best move for them
+        return max(scores) if len(path) % 2 == 0 else min(scores)
+
+    def narrow(self, middle: int, lowest: int, highest: int) -> Tuple[int, int]:
+        """
+        Narrow down the lowest and highest possible scores with null
+        window searches of the positions, which tell if the score is
+        above `middle`. The searches stop as soon as that is known.
+        """
+        size = self.position.size
+        lower_bounds, upper_bounds = {}, {}
+        results = self.search_subproblems(middle)
+        for path, score in results:
+            # Scores above the window are lower bounds, others are upper
+            # bounds of the score after the path
+            if score > middle:
+                lower_bounds[path] = score
+            else:
+                upper_bounds[path] = score
+
+            lower = self.get_bound((), lower_bounds, -size)
+            upper = self.get_bound((), upper_bounds, size)
+            if lower > middle or upper <= middle:
+                break
+        results.close()
+
+        if lower > lowest:
+            # The first move with the best lower bound gets at least
+            # that score
+            self.best_column = next(
+                child[0]
+                for child in self.children[()]
+                if self.get_bound(child, lower_bounds, -size) == lower
+            )
+        return max(lowest, lower), min(highest, upper)
+
+    def solve(self) -> Solution:
+        """Find the score of the position and the best move to play"""
+        if (solution := self.solve_from_book()) is not None:
+            return solution
+
+        position = self.position
+        moves = self.get_moves()
+        if not moves or position.moves >= position.size - 2:
+            # Nothing is left to split up
+            return super().solve()
+
+        self.paths = self.get_subproblems()
+        # If no move is found to get more than the lowest score, every
+        # move loses as soon as possible
+        self.best_column = self.get_columns(moves)[0]
+        if self.workers <= 1:
+            score = self.get_score()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=init_worker,
+                initargs=(self.current_iteration, self.table.memory),
+            ) as self.pool:
+                score = self.get_score()
+            self.pool = None
+        return self.get_solution(score, position.column_masks[self.best_column])
+
+
+def solve(
+    width: int,
+    height: int,
+    winning_moves: int,
+    moves: Iterable[int] = (),
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    workers: int = 1,
+    book: Optional["OpeningBook"] = None,
+) -> Solution:
+    """
+    Solve a game after the given moves (counted from 1). The moves are
+    played with the rules of the game board, so if they are not valid
+    or finish the game, the status is that of the game so far. With a
+    time limit (in seconds) or a node budget, the best move found
+    within them is given, looking further ahead while there is time.
+    Otherwise, the search is split between `workers` processes.
+    Positions in the opening book, if one is given, are looked up.
+    """
+    try:
+        Game(None).validate_board_setup(width, height, winning_moves)
+    except GameError as error:
+        return Solution(error.status)
+
+    board = BitBoard(width, height, winning_moves, None)
+    status = board.run(list(moves))
+    if status != GameCode.INCOMPLETE_GAME:
+        return Solution(status)
+
+    position = Position.from_board(board)
+    if time_limit is not None or max_nodes is not None:
+        return DeepeningSolver(position, time_limit, max_nodes, book=book).solve()
+    if workers > 1:
+        return ParallelSolver(position, workers, book=book).solve()
+    return Solver(position, book=book).solve()
+
+
+def solve_game(
+    file_pointer: TextIO,
+    time_limit: Optional[float] = None,
+    workers: int = 1,
+    book: Optional["OpeningBook"] = None,
+) -> Solution:
+    """
+    Solve a game after the moves in a game file, within a time limit
+    or with a number of worker processes, looking positions up in an
+    opening book
+    """
+    game = Game(file_pointer)
+    try:
+        header = next(file_pointer).rstrip("\n")
+        width, height, winning_moves = game.parse_header(header)
+    except GameError as error:
+        return Solution(error.status)
+    except StopIteration:
+        # The game has no header
+        return Solution(GameCode.ILLEGAL_FILE)
+
+    moves, invalid = parse_moves(file_pointer.read())
+    if invalid is not None:
+        moves.append(None)
+    return solve(
+        width, height, winning_moves, moves, time_limit, workers=workers, book=book
+    )
@@ -0,0 +1,68 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from game_solver.config import DIRECTIONS
+from game_solver.game import GameBoard
+
+
+class SparseBoard(GameBoard):
+    """
+    A game board for huge boards where only a few moves are made.
+    Pieces and column heights are kept in dictionaries that only
+    hold the cells and columns with pieces, so memory depends on the
+    number of moves made rather than on the size of the board.
+    """
+
+    def init_heights(self) -> None:
+        """Create column heights, which only hold columns with pieces"""
+        self.heights = defaultdict(int)
+
+    def init_cells(self) -> None:
+        """Create empty cells"""
+        # Pieces by (column, row). Cells outside the board are never set.
+        self.pieces = {}
+
+    def set_piece(self, column: int, row: int) -> None:
+        """Mark the current player's piece on the board"""
+        self.pieces[column, row] = self.current_player
+
+    def get_piece(self, column: int, row: int) -> int:
+        """Get the player whose piece is in a cell"""
+        return self.pieces[column, row]
+
+    def get_heights(self) -> Dict[int, int]:
+        """Get the number of pieces in every column with pieces"""
+        return {column: height for column, height in self.heights.items() if height}
+
+    def legal_moves(self) -> List[int]:
+        """Get the moves (columns) that still have space for a piece"""
+        return [
+            column + 1
+            for column in range(self.width)
+            if self.heights.get(column, 0) < self.height
+        ]
+
+    def count_pieces(self, column_step: int, row_step: int) -> int:
+        """
+        Count the current player's pieces in a row next to the
+        newest piece, going in a direction, up to a winning line.
+        """
+        column, row = self.current_column, self.current_row
+        for count in range(self.winning_moves - 1):
+            column += column_step
+            row += row_step
+            if self.pieces.get((column, row)) != self.current_player:
+                return count
+        return self.winning_moves - 1
+
+    def _check_lines_for_wins(self) -> None:
+        """Check if the game has been won"""
+        for column_step, row_step in DIRECTIONS:
+            line = (
+                1
+                + self.count_pieces(column_step, row_step)
+                + self.count_pieces(-column_step, -row_step)
+            )
+            if line >= self.winning_moves:
+                self.winner = self.current_player
+                return
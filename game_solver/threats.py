@@ -0,0 +1,118 @@
+from collections import defaultdict
+from typing import Dict, Optional, Set, Tuple
+
+from game_solver.config import DIRECTIONS
+
+Cell = Tuple[int, int]
+
+
+class ThreatTracker:
+    """
+    A class for keeping track of the threats of both players, which are
+    the empty cells that would complete winning_moves pieces in a row.
+    Threats are playable when they are the next free cell in their
+    column. Only the cells next to the line of pieces through a new
+    piece can become threats, so threats are updated in time that
+    depends on winning_moves but not on the number of moves made.
+
+    A player can force a win when the other player is to move and:
+     - the other player has no playable threat to win with first, and
+     - the player has two playable threats, only one of which can be
+       blocked, or a playable threat with another threat right above
+       it, which is made playable by blocking the one below.
+    The player to move can always force a win with a playable threat.
+    """
+
+    def __init__(self, width: int, height: int, winning_moves: int) -> None:
+        self.width = width
+        self.height = height
+        self.winning_moves = winning_moves
+        # Players by (column, row), only for cells with pieces
+        self.pieces: Dict[Cell, int] = {}
+        # The next free row of every column with pieces
+        self.heights: Dict[int, int] = defaultdict(int)
+        # Threats and playable threats of players 1 and 2, by player
+        self.threats: Dict[int, Set[Cell]] = {1: set(), 2: set()}
+        self.playable: Dict[int, Set[Cell]] = {1: set(), 2: set()}
+
+    def count_pieces(self, cell: Cell, step: Cell, player: int) -> int:
+        """
+        Count the player's pieces in a row next to a cell, going in a
+        direction, up to the pieces needed for a winning line
+        """
+        column, row = cell
+        column_step, row_step = step
+        for count in range(self.winning_moves - 1):
+            column += column_step
+            row += row_step
+            if self.pieces.get((column, row)) != player:
+                return count
+        return self.winning_moves - 1
+
+    def is_empty(self, cell: Cell) -> bool:
+        """Check if a cell is on the board and has no piece"""
+        column, row = cell
+        return (
+            0 <= column < self.width
+            and 0 <= row < self.height
+            and cell not in self.pieces
+        )
+
+    def add_threat(self, cell: Cell, player: int) -> None:
+        """Add a threat of a player, which is playable if its column is up to it"""
+        self.threats[player].add(cell)
+        column, row = cell
+        if row == self.heights[column]:
+            self.playable[player].add(cell)
+
+    def add_piece(self, column: int, row: int, player: int) -> None:
+        """Update the threats of both players with a new piece"""
+        cell = column, row
+        self.pieces[cell] = player
+        self.heights[column] = row + 1
+        for threats, playable in zip(self.threats.values(), self.playable.values()):
+            threats.discard(cell)
+            playable.discard(cell)
+        # The cell above the new piece is the next free cell in the column
+        above = column, row + 1
+        for other in (1, 2):
+            if above in self.threats[other]:
+                self.playable[other].add(above)
+
+        for column_step, row_step in DIRECTIONS:
+            # The line of the player's pieces through the new piece
+            forward = self.count_pieces(cell, (column_step, row_step), player)
+            backward = self.count_pieces(cell, (-column_step, -row_step), player)
+            line = forward + backward + 1
+            for step, length in ((1, forward), (-1, backward)):
+                end = (
+                    column + step * (length + 1) * column_step,
+                    row + step * (length + 1) * row_step,
+                )
+                if not self.is_empty(end):
+                    continue
+                beyond = self.count_pieces(
+                    end, (step * column_step, step * row_step), player
+                )
+                if line + 1 + beyond >= self.winning_moves:
+                    self.add_threat(end, player)
+
+    def get_forced_winner(self, player: int) -> Optional[int]:
+        """
+        Get the player who can force a win after `player` has moved,
+        if either of them can win with threats alone
+        """
+        other = 3 - player
+        if self.playable[other]:
+            # The other player wins with the next piece
+            return other
+
+        playable = self.playable[player]
+        if len(playable) >= 2:
+            # Only one of the threats can be blocked
+            return player
+        for column, row in playable:
+            if (column, row + 1) in self.threats[player]:
+                # Blocking the threat makes the threat above it playable
+                return player
+        return None
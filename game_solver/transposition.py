@@ -0,0 +1,146 @@
+import random
+from array import array
+from typing import List, Optional, Tuple
+
+from game_solver.config import DEFAULT_TABLE_MEMORY
+
+# Zobrist keys are drawn from a fixed seed, so that hashes of the same
+# position are the same in every process
+ZOBRIST_SEED = 0x1C0A4
+
+# Types of bound of the score kept for a position. Empty entries have
+# no bound.
+EMPTY, EXACT, LOWER, UPPER = range(4)
+
+# No best move is known for the position
+NO_MOVE = -1
+
+
+def get_typecode_range(typecode: str) -> range:
+    """Get the range of values an array of a type code can hold"""
+    bits = 8 * array(typecode).itemsize
+    if typecode.isupper():
+        return range(1 << bits)
+    return range(-(1 << (bits - 1)), 1 << (bits - 1))
+
+
+def get_zobrist_keys(cells: int) -> Tuple[List[int], List[int]]:
+    """
+    Get a random 64-bit key for a piece of each player in every cell.
+    The hash of a position is the XOR of the keys of all its pieces,
+    so it is updated with one XOR when a piece is added or removed.
+    """
+    generator = random.Random(ZOBRIST_SEED)
+    return tuple([generator.getrandbits(64) for _ in range(cells)] for _ in range(2))
+
+
+class TranspositionTable:
+    """
+    A fixed-size table of search results, keyed by Zobrist hashes of
+    positions. Every entry keeps the full hash, the depth the position
+    was searched to (the number of empty cells for a full search), the
+    type of bound of its score, the score and the best move. Entries
+    are stored in parallel arrays with as many entries as fit in
+    `memory` bytes, rounded down to a power of two, and a hash always
+    goes to the same entry.
+
+    When two positions share an entry, or a position is stored again,
+    the result searched deeper is kept, as it took longer to search.
+    Lookups and stores are counted so that the hit rate of a search can
+    be reported.
+    """
+
+    # Type codes of the arrays with the hash, depth, bound type, score
+    # and best move of every entry
+    TYPECODES = ("Q", "H", "B", "h", "h")
+    # Depths, scores and moves that fit in the entries
+    DEPTHS = get_typecode_range(TYPECODES[1])
+    SCORES = get_typecode_range(TYPECODES[3])
+    MOVES = get_typecode_range(TYPECODES[4])
+
+    def __init__(self, memory: int = DEFAULT_TABLE_MEMORY) -> None:
+        self.entry_size = sum(array(typecode).itemsize for typecode in self.TYPECODES)
+        size = 1 << (max(memory // self.entry_size, 1).bit_length() - 1)
+        self.size = size
+        self.index_mask = size - 1
+
+        self.keys, self.depths, self.bounds, self.scores, self.moves = (
+            array(typecode, bytes(array(typecode).itemsize * size))
+            for typecode in self.TYPECODES
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        # Entries replaced by another position, and stores that
+        # were dropped to keep a deeper position
+        self.replaced = 0
+        self.rejected = 0
+
+    @property
+    def memory(self) -> int:
+        """The number of bytes taken up by the entries"""
+        return self.size * self.entry_size
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of lookups that found the position"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def get(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Get the depth, bound type, score and best move of a position,
+        or None if it is not in the table
+        """
+        index = key & self.index_mask
+        if self.bounds[index] != EMPTY and self.keys[index] == key:
+            self.hits += 1
+            return (
+                self.depths[index],
+                self.bounds[index],
+                self.scores[index],
+                self.moves[index],
+            )
+        self.misses += 1
+        return None
+
+    def put(self, key: int, depth: int, bound: int, score: int, move: int) -> None:
+        """
+        Store the result of a search, unless the entry of the hash has
+        been searched deeper, for the same position or a different one.
+        Raises ValueError if the result doesn't fit in the entry, which
+        happens on boards with tens of thousands of cells.
+        """
+        if (
+            depth not in self.DEPTHS
+            or score not in self.SCORES
+            or move not in self.MOVES
+        ):
+            raise ValueError(
+                f"Search result (depth {depth}, score {score}, move {move}) "
+                "is too large for the transposition table"
+            )
+
+        index = key & self.index_mask
+        if self.bounds[index] != EMPTY:
+            if self.depths[index] > depth:
+                self.rejected += 1
+                return
+            if self.keys[index] != key:
+                self.replaced += 1
+
+        self.stores += 1
+        self.keys[index] = key
+        self.depths[index] = depth
+        self.bounds[index] = bound
+        self.scores[index] = score
+        self.moves[index] = move
+
+    def report(self) -> str:
+        """Describe how the table has been used"""
+        return (
+            f"Table: {self.hits} hits, {self.misses} misses "
+            f"({self.hit_rate:.0%} hit rate), {self.stores} stores, "
+            f"{self.replaced} replaced, {self.rejected} rejected"
+        )
@@ -0,0 +1,186 @@
+from itertools import groupby, islice
+from typing import Iterable, Iterator, Sequence, Tuple
+
+from game_solver.config import DIRECTIONS, GameCode
+from game_solver.game import Game, GameError
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is only needed to check games in lockstep
+    np = None
+
+
+# Marks games that are still being played
+IN_PROGRESS = -1
+
+# The default number of games checked together in lockstep
+LOCKSTEP_BATCH_SIZE = 65536
+
+# The most board cells of all games checked together in lockstep, so
+# that batches of games on large boards still fit in memory
+LOCKSTEP_BATCH_CELLS = 2**24
+
+
+def require_numpy() -> None:
+    """Raise an error if NumPy is not installed"""
+    if np is None:
+        raise ImportError("NumPy is required to check games in lockstep")
+
+
+def count_pieces(
+    board: "np.ndarray",
+    games: "np.ndarray",
+    columns: "np.ndarray",
+    rows: "np.ndarray",
+    player: int,
+    direction: Tuple[int, int],
+    winning_moves: int,
+) -> "np.ndarray":
+    """
+    Count pieces of a player in a row next to the newest piece in
+    every game, looking in one direction. Stops counting at the
+    first piece that belongs to another player or is not on the board.
+    """
+    _, width, height = board.shape
+    counts = np.zeros(len(games), dtype=np.int64)
+    running = np.ones(len(games), dtype=bool)
+
+    for step in range(1, winning_moves):
+        next_columns = columns + step * direction[0]
+        next_rows = rows + step * direction[1]
+        running &= (
+            (next_columns >= 0)
+            & (next_columns < width)
+            & (next_rows >= 0)
+            & (next_rows < height)
+        )
+        if not running.any():
+            break
+
+        # Clip positions outside the board. They are masked by `running`.
+        pieces = board[
+            games,
+            np.clip(next_columns, 0, width - 1),
+            np.clip(next_rows, 0, height - 1),
+        ]
+        running &= pieces == player
+        counts += running
+    return counts
+
+
+def check_lockstep(
+    width: int,
+    height: int,
+    winning_moves: int,
+    games: Sequence[Sequence[int]],
+) -> "np.ndarray":
+    """
+    Check many games with the same setup at once. All games are
+    stacked into a (games, width, height) array and advanced one
+    move at a time, with finished games masked out. Moves that are
+    not positive integers are treated as invalid lines in a game
+    file. Returns a GameCode for every game, as given by Game.play.
+    """
+    require_numpy()
+    total_games = len(games)
+    try:
+        Game(None).validate_board_setup(width, height, winning_moves)
+    except GameError as error:
+        return np.full(total_games, error.status, dtype=np.int8)
+
+    lengths = np.array([len(moves) for moves in games], dtype=np.int64)
+    moves = np.zeros((total_games, lengths.max(initial=0)), dtype=np.int64)
+    for game, game_moves in enumerate(games):
+        moves[game, : lengths[game]] = game_moves
+
+    board = np.zeros((total_games, width, height), dtype=np.int8)
+    heights = np.zeros((total_games, width), dtype=np.int64)
+    winners = np.zeros(total_games, dtype=np.int8)
+    statuses = np.full(total_games, IN_PROGRESS, dtype=np.int8)
+
+    for turn in range(moves.shape[1]):
+        # Every game is on the same turn, so the same player moves in all of them
+        player = turn % 2 + 1
+        active = np.flatnonzero((statuses == IN_PROGRESS) & (turn < lengths))
+        if not len(active):
+            break
+
+        # Moves are validated before checking if the game is already over
+        columns = moves[active, turn] - 1
+        invalid = columns < 0
+        statuses[active[invalid]] = GameCode.ILLEGAL_FILE
+        active, columns = active[~invalid], columns[~invalid]
+
+        won = winners[active] != 0
+        statuses[active[won]] = GameCode.ILLEGAL_CONTINUE
+        active, columns = active[~won], columns[~won]
+
+        outside = columns >= width
+        statuses[active[outside]] = GameCode.ILLEGAL_COLUMN
+        active, columns = active[~outside], columns[~outside]
+
+        rows = heights[active, columns]
+        full = rows == height
+        statuses[active[full]] = GameCode.ILLEGAL_ROW
+        active, columns, rows = active[~full], columns[~full], rows[~full]
+
+        board[active, columns, rows] = player
+        heights[active, columns] += 1
+
+        if turn + 1 < 2 * winning_moves - 1:
+            # Nobody can have won yet
+            continue
+
+        for direction in DIRECTIONS:
+            opposite = (-direction[0], -direction[1])
+            line = 1 + count_pieces(
+                board, active, columns, rows, player, direction, winning_moves
+            )
+            line += count_pieces(
+                board, active, columns, rows, player, opposite, winning_moves
+            )
+            winners[active[line >= winning_moves]] = player
+
+    finished = statuses == IN_PROGRESS
+    statuses[finished & (winners != 0)] = winners[finished & (winners != 0)]
+    no_winner = finished & (winners == 0)
+    statuses[no_winner & (lengths == width * height)] = GameCode.DRAW
+    statuses[no_winner & (lengths < width * height)] = GameCode.INCOMPLETE_GAME
+    return statuses
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """A generator which splits an iterable into lists of a given size"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def get_batch_size(width: int, height: int, batch_size: int, batch_cells: int) -> int:
+    """
+    Get the number of games to check together, so that their boards
+    have at most `batch_cells` cells. At least one game is checked.
+    """
+    return max(1, min(batch_size, batch_cells // max(width * height, 1)))
+
+
+def check_lockstep_stream(
+    games: Iterable[Tuple[int, int, int, Sequence[int]]],
+    batch_size: int = LOCKSTEP_BATCH_SIZE,
+    batch_cells: int = LOCKSTEP_BATCH_CELLS,
+) -> Iterator[GameCode]:
+    """
+    A generator which checks a stream of (width, height, winning moves,
+    moves) games in lockstep. Games that follow each other and have
+    the same setup are checked together in batches of up to
+    `batch_size` games, with at most `batch_cells` board cells in
+    total. Results are returned in the same order.
+    """
+    require_numpy()
+    for setup, setup_games in groupby(games, key=lambda game: tuple(game[:3])):
+        width, height, winning_moves = setup
+        size = get_batch_size(width, height, batch_size, batch_cells)
+        for batch in chunked((game[3] for game in setup_games), size):
+            for status in check_lockstep(width, height, winning_moves, batch):
+                yield GameCode(status)
@@ -0,0 +1,81 @@
+from typing import Dict, List, Tuple
+
+from game_solver.config import DIRECTIONS
+
+
+def count_windows(width: int, height: int, winning_moves: int) -> int:
+    """Count the windows of winning_moves cells in a row on a board"""
+    span = winning_moves - 1
+    total = 0
+    for column_step, row_step in DIRECTIONS:
+        columns = width - span * abs(column_step)
+        rows = height - span * abs(row_step)
+        if columns > 0 and rows > 0:
+            total += columns * rows
+    return total
+
+
+def get_offsets(position: int, step: int, size: int, span: int) -> Tuple[int, int]:
+    """
+    Get the smallest and largest number of steps back from a cell to the
+    first cell of a window through it, so that the whole window is within
+    the board along one axis
+    """
+    if step == 0:
+        return 0, span
+    if step > 0:
+        return max(0, position + span - size + 1), min(span, position)
+    return max(0, span - position), min(span, size - 1 - position)
+
+
+class WindowCounter:
+    """
+    A class for counting the windows of winning_moves cells in a row
+    that each player can still complete, which are the windows without
+    any of the other player's pieces. A window is closed for a player as
+    soon as the other player puts a piece in it, so once both players
+    have no open windows left, neither of them can win the game.
+
+    Only windows with pieces in them are kept, by the first cell of the
+    window, so memory depends on the number of moves made rather than
+    on the size of the board.
+    """
+
+    def __init__(self, width: int, height: int, winning_moves: int) -> None:
+        self.width = width
+        self.height = height
+        self.span = winning_moves - 1
+        total = count_windows(width, height, winning_moves)
+        # The number of open windows of players 1 and 2
+        self.open_windows = [total, total]
+        # The players with pieces in a window, as a bitmask where
+        # bit 0 is player 1 and bit 1 is player 2, by direction and
+        # the index (column * height + row) of the first cell
+        self.windows: List[Dict[int, int]] = [{} for _ in DIRECTIONS]
+
+    @property
+    def no_win_possible(self) -> bool:
+        """Check if neither player can complete a window any more"""
+        return not any(self.open_windows)
+
+    def add_piece(self, column: int, row: int, player: int) -> None:
+        """Close the windows through a new piece for the other player"""
+        height = self.height
+        # The index of the other player in open_windows
+        other = 2 - player
+        for windows, (column_step, row_step) in zip(self.windows, DIRECTIONS):
+            first_column, last_column = get_offsets(
+                column, column_step, self.width, self.span
+            )
+            first_row, last_row = get_offsets(row, row_step, height, self.span)
+            for offset in range(
+                max(first_column, first_row), min(last_column, last_row) + 1
+            ):
+                start = (column - offset * column_step) * height + (
+                    row - offset * row_step
+                )
+                players = windows.get(start, 0)
+                if not players & player:
+                    # The window was open for the other player until now
+                    self.open_windows[other] -= 1
+                    windows[start] = players | player
@@ -0,0 +1,63 @@
+import io
+from typing import Tuple
+
+import pytest
+
+from benchmarks.generator import (
+    OUTCOMES,
+    UNREADABLE_GAME,
+    generate_draw_moves,
+    generate_game,
+    get_draw_owner,
+)
+from game_solver.bitboard import BitBoard
+from game_solver.config import GameCode
+from game_solver.game import Game
+
+SETUPS = ((7, 6, 4), (7, 6, 6), (9, 7, 5), (20, 20, 10), (5, 5, 3))
+
+
+def get_status(outcome: str) -> GameCode:
+    """Get the status of a game with a generated outcome"""
+    if "_win_" in outcome:
+        outcome = outcome[: outcome.index("_win_") + len("_win")]
+    return GameCode[outcome.upper()]
+
+
+@pytest.mark.parametrize("outcome", OUTCOMES)
+@pytest.mark.parametrize("setup", SETUPS)
+def test_generate_game(setup: Tuple[int, int, int], outcome: str) -> None:
+    content = generate_game(*setup, outcome)
+    if outcome == "file_error":
+        assert content == UNREADABLE_GAME
+        return
+
+    if content is not None:
+        game = Game(io.StringIO(content.decode()), BitBoard)
+        assert game.play() == get_status(outcome)
+
+
+def test_generate_game_is_deterministic() -> None:
+    for outcome in OUTCOMES:
+        assert generate_game(7, 6, 4, outcome) == generate_game(7, 6, 4, outcome)
+
+
+@pytest.mark.parametrize("setup", ((7, 6, 4), (20, 20, 4)))
+def test_generate_game_every_outcome(setup: Tuple[int, int, int]) -> None:
+    assert all(generate_game(*setup, outcome) for outcome in OUTCOMES)
+
+
+@pytest.mark.parametrize("outcome", ("player_1_win_horizontal", "draw"))
+def test_generate_game_impossible(outcome: str) -> None:
+    # The board is too narrow for a line and P2 owns more cells in a draw
+    assert generate_game(2, 5, 4, outcome) is None
+
+
+def test_generate_draw_moves() -> None:
+    width, height = 7, 6
+    heights = [0] * width
+    for move, column in enumerate(generate_draw_moves(width, height)):
+        column -= 1
+        assert get_draw_owner(column, heights[column]) == move % 2 + 1
+        heights[column] += 1
+    assert heights == [height] * width
@@ -0,0 +1,9 @@
+from benchmarks.parallel import compare_solvers
+
+
+def test_compare_solvers() -> None:
+    solution, parallel_solution, sequential, parallel = compare_solvers(
+        [4] * 6 + [3] * 4, workers=1, plies=2
+    )
+    assert solution[:2] == parallel_solution[:2]
+    assert sequential > 0 and parallel > 0
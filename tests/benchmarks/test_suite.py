@@ -0,0 +1,17 @@
+from benchmarks.suite import compare
+
+
+def test_compare() -> None:
+    baseline = {
+        "7x6x4/draw": {"moves": 42, "check": 1.0, "run": 1.0},
+        "7x6x4/illegal_row": {"moves": 43, "check": 1.0},
+    }
+    results = {
+        "7x6x4/draw": {"moves": 42, "check": 1.1, "run": 1.5},
+        "7x6x4/illegal_row": {"moves": 43, "check": 0.5, "parse": 1.0},
+        "20x20x4/draw": {"moves": 400, "check": 10.0},
+    }
+    assert compare(results, baseline, 0.2) == [
+        "7x6x4/draw run: 1000000.0us -> 1500000.0us (+50%)"
+    ]
+    assert compare(results, baseline, 0.6) == []
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from check_game import start_checking
+from game_solver.batch import check_batch, collect_files, get_chunk_size
+
+BASE_TEST_DIR = Path(__file__).resolve().parents[1] / "sample_games"
+
+
+def test_collect_files_directory() -> None:
+    files = collect_files([str(BASE_TEST_DIR)])
+    assert files == sorted(file for file in BASE_TEST_DIR.rglob("*") if file.is_file())
+
+
+def test_collect_files_glob() -> None:
+    files = collect_files([str(BASE_TEST_DIR / "player_*" / "*.txt")])
+    assert len(files) == 7
+    assert all(file.parent.name.startswith("player_") for file in files)
+
+
+def test_collect_files_missing_file() -> None:
+    missing_file = BASE_TEST_DIR / "I_don't_exist.txt"
+    assert collect_files([str(missing_file)]) == [missing_file]
+
+
+def test_collect_files_duplicates() -> None:
+    pattern = str(BASE_TEST_DIR / "draw")
+    assert collect_files([pattern, pattern]) == [BASE_TEST_DIR / "draw" / "draw.txt"]
+
+
+@pytest.mark.parametrize(
+    "total_files,workers,expected",
+    ((0, 4, 1), (10, 4, 1), (160, 4, 10), (10**6, 4, 256)),
+)
+def test_get_chunk_size(total_files: int, workers: int, expected: int) -> None:
+    assert get_chunk_size(total_files, workers) == expected
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_check_batch(workers: int) -> None:
+    files = collect_files([str(BASE_TEST_DIR)])
+    results = list(check_batch(files, start_checking, workers, chunk_size=3))
+
+    assert [file for file, _ in results] == files
+    assert all(status == start_checking(file) for file, status in results)
@@ -0,0 +1,123 @@
+import io
+import mmap
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from check_game import start_checking
+from game_solver.binary import (
+    BinaryReader,
+    BinaryWriter,
+    check_binary_archive,
+    convert_text_games,
+    get_move_size,
+    play_binary_game,
+    read_text_game,
+)
+from game_solver.bitboard import BitBoard
+from game_solver.config import GameCode
+
+BASE_TEST_DIR = Path(__file__).resolve().parents[1] / "sample_games"
+
+
+@pytest.mark.parametrize(
+    "width,expected", ((1, 1), (254, 1), (255, 2), (65534, 2), (65535, 4))
+)
+def test_get_move_size(width: int, expected: int) -> None:
+    assert get_move_size(width) == expected
+
+
+def test_get_move_size_too_wide() -> None:
+    with pytest.raises(ValueError):
+        get_move_size(2**32)
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    (
+        ("3 3 3\n1\n2\n3", (3, 3, 3, [1, 2, 3])),
+        ("3 3 3\n1\n7\n3\n", (3, 3, 3, [1, 4, 3])),
+        ("3 3 3\n1\na\n3\n", (3, 3, 3, [1, 0])),
+        ("3 3 3\n1\n-2\n3\n", (3, 3, 3, [1, 0])),
+        ("3 3 a\n1\n", (0, 0, 0, [])),
+        ("3 -3 3\n1\n", (0, 0, 0, [])),
+    ),
+)
+def test_read_text_game(text: str, expected: tuple) -> None:
+    assert read_text_game(io.StringIO(text)) == expected
+
+
+def test_read_text_game_too_large() -> None:
+    with pytest.raises(ValueError):
+        read_text_game(io.StringIO(f"{2 ** 32} 3 3\n"))
+
+
+def test_write_and_read(tmp_path: Path) -> None:
+    archive = tmp_path / "games.c4b"
+    games = [(3, 3, 3, [1, 2, 3]), (300, 2, 2, [300, 1]), (1, 1, 1, [])]
+    with BinaryWriter(archive) as writer:
+        for game in games:
+            writer.add_game(*game)
+
+    with BinaryReader(archive) as reader:
+        assert len(reader) == 3
+        for (width, height, winning_moves, moves), expected in zip(reader, games):
+            assert (width, height, winning_moves, moves.tolist()) == expected
+            assert isinstance(moves, memoryview)
+            moves.release()
+
+
+def test_reader_invalid_file(tmp_path: Path) -> None:
+    archive = tmp_path / "games.c4b"
+    archive.write_bytes(b"not an archive at all, definitely")
+    with pytest.raises(ValueError):
+        BinaryReader(archive)
+
+
+@pytest.mark.parametrize("content", (b"short", b"not an archive at all, definitely"))
+def test_reader_invalid_file_closed(content: bytes, tmp_path: Path) -> None:
+    archive = tmp_path / "games.c4b"
+    archive.write_bytes(content)
+    buffers = []
+
+    def map_file(*args, **kwargs) -> mmap.mmap:
+        buffers.append(create_map(*args, **kwargs))
+        return buffers[-1]
+
+    create_map = mmap.mmap
+    with patch.object(mmap, "mmap", side_effect=map_file):
+        with pytest.raises(ValueError):
+            BinaryReader(archive)
+
+    # The archive isn't kept mapped after it has been rejected
+    assert len(buffers) == 1 and buffers[0].closed
+
+
+@pytest.mark.parametrize(
+    "moves,status",
+    (
+        ([1, 2, 1, 2, 1], GameCode.PLAYER_1_WIN),
+        ([1, 2, 1, 2, 1, 0], GameCode.ILLEGAL_FILE),
+        ([1, 2, 1, 2, 1, 4], GameCode.ILLEGAL_CONTINUE),
+        ([1, 2, 0], GameCode.ILLEGAL_FILE),
+        ([1, 1, 1, 1], GameCode.ILLEGAL_ROW),
+        ([4, 0], GameCode.ILLEGAL_COLUMN),
+        ([1], GameCode.INCOMPLETE_GAME),
+    ),
+)
+def test_play_binary_game(moves: List[int], status: GameCode) -> None:
+    view = memoryview(bytes(moves))
+    assert play_binary_game(3, 3, 3, view, BitBoard) == status
+
+
+def test_convert_text_games(tmp_path: Path) -> None:
+    archive = tmp_path / "games.c4b"
+    files = sorted(file for file in BASE_TEST_DIR.rglob("*") if file.is_file())
+    skipped = convert_text_games(files, archive)
+
+    assert skipped == [BASE_TEST_DIR / "file_error" / "bad_file.pdf"]
+    assert list(check_binary_archive(archive)) == [
+        start_checking(file) for file in files if file not in skipped
+    ]
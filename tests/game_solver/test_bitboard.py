@@ -0,0 +1,101 @@
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+
+from game_solver.bitboard import BitBoard, has_run
+from game_solver.game import GameError, GameOver
+
+
+@pytest.mark.parametrize(
+    "mask,shift,length,expected",
+    [
+        (0b0, 1, 1, False),
+        (0b1, 1, 1, True),
+        (0b1011, 1, 3, False),
+        (0b0111, 1, 3, True),
+        (0b1110111, 1, 4, False),
+        (0b1111111, 1, 7, True),
+        (0b1111111, 1, 8, False),
+        (0b1001001, 3, 3, True),
+        (0b1001000, 3, 3, False),
+        (0b1000010000100001, 5, 4, True),
+    ],
+)
+def test_has_run(mask: int, shift: int, length: int, expected: bool) -> None:
+    assert has_run(mask, shift, length) == expected
+
+
+class TestBitBoard:
+    @pytest.fixture
+    def bit_board(self) -> BitBoard:
+        return BitBoard(3, 4, 3, Mock())
+
+    def test_init(self, bit_board: BitBoard) -> None:
+        assert bit_board.masks == [0, 0]
+        assert bit_board.heights == [0, 0, 0]
+        assert bit_board.shifts == (1, 5, 6, 4)
+        assert bit_board.winner == None
+        assert bit_board.total_moves == 0
+
+    def test_add_piece(self, bit_board: BitBoard) -> None:
+        bit_board.add_piece(2)
+        bit_board.add_piece(2)
+
+        assert bit_board.current_column == 1
+        assert bit_board.current_row == 1
+        assert bit_board.current_player == 2
+        assert bit_board.total_moves == 2
+        assert bit_board.heights == [0, 2, 0]
+        assert bit_board.masks == [1 << 5, 1 << 6]
+
+    def test_add_piece_illegal_row(self, bit_board: BitBoard) -> None:
+        for _ in range(4):
+            bit_board.add_piece(1)
+
+        with pytest.raises(GameError) as exc:
+            bit_board.add_piece(1)
+
+        assert int(str(exc.value)) == 5
+
+    def test_add_piece_illegal_column(self, bit_board: BitBoard) -> None:
+        with pytest.raises(GameError) as exc:
+            bit_board.add_piece(4)
+
+        assert int(str(exc.value)) == 6
+
+    @pytest.mark.parametrize(
+        "width,height,winning_moves,moves,winner",
+        [
+            (3, 4, 3, [1, 2, 1, 2, 1], 1),
+            (4, 4, 3, [1, 1, 2, 2, 4, 3], None),
+            (4, 4, 3, [1, 1, 2, 2, 3], 1),
+            (4, 4, 3, [1, 2, 2, 3, 4, 3, 3], 1),
+            (4, 4, 3, [3, 2, 2, 1, 4, 1, 1], 1),
+            (4, 4, 3, [1, 2, 3, 1, 2, 3], None),
+            (1, 5, 5, [1, 1, 1, 1, 1], None),
+            (5, 1, 3, [1, 2, 3, 4, 5], None),
+        ],
+    )
+    def test_check_for_wins(
+        self,
+        width: int,
+        height: int,
+        winning_moves: int,
+        moves: List[int],
+        winner: int,
+    ) -> None:
+        bit_board = BitBoard(width, height, winning_moves, Mock())
+        for move in moves:
+            bit_board.make_move(move)
+
+        assert bit_board.winner == winner
+
+    def test_start_game(self) -> None:
+        moves = [f"{x}\n" for x in (1, 2, 1, 2, 1)]
+        bit_board = BitBoard(3, 4, 3, moves)
+
+        with pytest.raises(GameOver) as exc:
+            bit_board.start_game()
+
+        assert int(str(exc.value)) == 1
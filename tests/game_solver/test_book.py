@@ -0,0 +1,157 @@
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+
+from game_solver.bitboard import has_run
+from game_solver.book import (
+    FILE_HEADER,
+    BookWriter,
+    OpeningBook,
+    build_book,
+    get_book_key,
+    get_book_positions,
+)
+from game_solver.solver import DeepeningSolver, ParallelSolver, Position, Solver
+
+
+def get_position(columns: Tuple[int, ...], setup=(4, 4, 3)) -> Position:
+    """Get the position after the columns (counted from 0)"""
+    position = Position(*setup)
+    for column in columns:
+        position.play(column)
+    return position
+
+
+@pytest.fixture(scope="module")
+def book_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    file = tmp_path_factory.mktemp("book") / "book.c4ob"
+    build_book(4, 4, 3, 3, file)
+    return file
+
+
+@pytest.fixture
+def book(book_file: Path) -> OpeningBook:
+    with OpeningBook(book_file) as book:
+        yield book
+
+
+def test_get_book_key() -> None:
+    key, mirrored = get_book_key(get_position((0, 1)))
+    assert get_book_key(get_position((3, 2))) == (key, not mirrored)
+    # Symmetric positions are their own mirror
+    assert get_book_key(get_position((1, 1, 2, 2)))[1] == False
+
+
+def test_get_book_positions() -> None:
+    positions = get_book_positions(4, 4, 3, 2)
+    # The empty board, 2 first moves and 8 second moves, leaving out mirrors
+    assert len(positions) == 11
+    assert positions[get_book_key(Position(4, 4, 3))[0]] == ((), False)
+    for key, (path, mirrored) in positions.items():
+        assert get_book_key(get_position(path)) == (key, mirrored)
+
+
+def test_get_book_positions_skips_wins() -> None:
+    positions = get_book_positions(4, 4, 3, 5)
+    # Player 1 wins with the fifth move, so the game is over
+    assert get_book_key(get_position((0, 1, 0, 1, 0)))[0] not in positions
+
+
+class TestBookWriter:
+    def test_write(self, tmp_path: Path) -> None:
+        writer = BookWriter(4, 4, 3, 1)
+        writer.add_position(7, -2, 3)
+        writer.add_position(5, 1, 0)
+        file = tmp_path / "book.c4ob"
+        writer.write(file)
+        assert file.stat().st_size == FILE_HEADER.size + 2 * (8 + 1 + 1)
+
+        with OpeningBook(file) as book:
+            assert (book.setup, book.depth, len(book)) == ((4, 4, 3), 1, 2)
+            assert list(book.keys) == [5, 7]
+            assert list(book.scores) == [1, -2]
+            assert list(book.moves) == [0, 3]
+
+    @pytest.mark.parametrize("width,height", ((300, 1), (16, 16)))
+    def test_board_too_large(self, width: int, height: int) -> None:
+        with pytest.raises(ValueError):
+            BookWriter(width, height, 4, 1)
+
+
+class TestOpeningBook:
+    def test_init(self, book: OpeningBook) -> None:
+        assert (book.setup, book.depth) == ((4, 4, 3), 3)
+        assert len(book) == len(get_book_positions(4, 4, 3, 3))
+
+    @pytest.mark.parametrize(
+        "content",
+        (b"", b"C4OB", b"C4OX" + bytes(FILE_HEADER.size), bytes(FILE_HEADER.size)),
+    )
+    def test_init_invalid(self, content: bytes, tmp_path: Path) -> None:
+        file = tmp_path / "book.c4ob"
+        file.write_bytes(content)
+        with pytest.raises(ValueError):
+            OpeningBook(file)
+
+    def test_init_truncated(self, book_file: Path, tmp_path: Path) -> None:
+        file = tmp_path / "book.c4ob"
+        file.write_bytes(book_file.read_bytes()[:-1])
+        with pytest.raises(ValueError):
+            OpeningBook(file)
+
+    def test_get_matches_solver(self, book: OpeningBook) -> None:
+        for path, _ in get_book_positions(4, 4, 3, 3).values():
+            for columns in (path, tuple(3 - column for column in path)):
+                position = get_position(columns)
+                score, best_move = book.get(position)
+                assert score == Solver(get_position(columns)).solve().score
+
+                # The best move keeps the score, unless it wins the game
+                position.play(best_move)
+                pieces = position.current ^ position.mask
+                if not any(has_run(pieces, shift, 3) for shift in position.shifts):
+                    assert -Solver(position).get_score() == score
+
+    def test_get_mirrored(self, book: OpeningBook) -> None:
+        score, best_move = book.get(get_position((0, 1)))
+        assert book.get(get_position((3, 2))) == (score, 3 - best_move)
+
+    @pytest.mark.parametrize(
+        "position",
+        (
+            # Past the depth of the book
+            get_position((0, 1, 0, 1)),
+            get_position((), (5, 4, 3)),
+            get_position((), (4, 4, 4)),
+        ),
+    )
+    def test_get_missing(self, book: OpeningBook, position: Position) -> None:
+        assert book.get(position) is None
+
+
+class TestSolverBook:
+    def test_solve_in_book(self, book: OpeningBook) -> None:
+        solution = Solver(Position(4, 4, 3), book=book).solve()
+        assert solution[:3] == Solver(Position(4, 4, 3)).solve()[:3]
+        assert solution.nodes == 0
+
+    def test_solve_past_book(self, book: OpeningBook) -> None:
+        columns = (1, 2, 2, 1)
+        solution = Solver(get_position(columns), book=book).solve()
+        assert solution == Solver(get_position(columns)).solve()
+        assert solution.nodes
+
+    def test_deepening_solver(self, book: OpeningBook) -> None:
+        position = get_position((1,))
+        solution = DeepeningSolver(position, max_nodes=1, book=book).solve()
+        assert solution[:3] == Solver(get_position((1,))).solve()[:3]
+        assert solution.depth == position.size - position.moves
+
+    @pytest.mark.parametrize("columns,nodes", (((1,), False), ((1, 2, 2, 1), True)))
+    def test_parallel_solver(
+        self, book: OpeningBook, columns: Tuple[int], nodes: bool
+    ) -> None:
+        solution = ParallelSolver(get_position(columns), 1, book=book).solve()
+        assert solution.score == Solver(get_position(columns)).solve().score
+        assert bool(solution.nodes) == nodes
@@ -0,0 +1,62 @@
+import pickle
+from pathlib import Path
+
+from game_solver.bitboard import BitBoard
+from game_solver.cache import ResultCache, get_cache_key
+from game_solver.config import GameCode
+
+
+def test_get_cache_key_line_endings() -> None:
+    assert get_cache_key(b"7 6 4\r\n1\r\n") == get_cache_key(b"7 6 4\n1\n")
+    assert get_cache_key(b"7 6 4\n1\n") != get_cache_key(b"7 6 4\n2\n")
+
+
+def test_get_cache_key_engine() -> None:
+    assert get_cache_key(b"7 6 4\n1\n") != get_cache_key(b"7 6 4\n1\n", BitBoard)
+
+
+def test_result_cache(tmp_path: Path) -> None:
+    with ResultCache(tmp_path / "results.db") as cache:
+        assert cache.get(b"game") is None
+        cache.put(b"game", GameCode.DRAW)
+        assert cache.get(b"game") == GameCode.DRAW
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert len(cache) == 1
+
+
+def test_result_cache_persists(tmp_path: Path) -> None:
+    with ResultCache(tmp_path / "results.db") as cache:
+        cache.put(b"game", GameCode.PLAYER_1_WIN)
+        cache.get(b"other game")
+
+    with ResultCache(tmp_path / "results.db") as cache:
+        assert cache.get(b"game") == GameCode.PLAYER_1_WIN
+        assert cache.get_counters() == (1, 1)
+
+
+def test_result_cache_put_twice(tmp_path: Path) -> None:
+    with ResultCache(tmp_path / "results.db") as cache:
+        cache.put(b"game", GameCode.DRAW)
+        cache.put(b"game", GameCode.DRAW)
+        assert len(cache) == 1
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    with ResultCache(tmp_path / "results.db", max_size=2) as cache:
+        cache.put(b"first", GameCode.DRAW)
+        cache.put(b"second", GameCode.DRAW)
+        cache.get(b"first")
+        cache.put(b"third", GameCode.DRAW)
+
+        assert len(cache) == 2
+        assert cache.get(b"second") is None
+        assert cache.get(b"first") == GameCode.DRAW
+        assert cache.get(b"third") == GameCode.DRAW
+
+
+def test_result_cache_pickle(tmp_path: Path) -> None:
+    with ResultCache(tmp_path / "results.db", max_size=10) as cache:
+        cache.put(b"game", GameCode.DRAW)
+        with pickle.loads(pickle.dumps(cache)) as copy:
+            assert (copy.file, copy.max_size) == (cache.file, 10)
+            assert copy.get(b"game") == GameCode.DRAW
@@ -0,0 +1,115 @@
+import io
+import json
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from check_game import start_checking
+from game_solver.bitboard import BitBoard
+from game_solver.config import GameCode
+from game_solver.container import (
+    check_container,
+    check_json_container,
+    check_text_container,
+    play_json_game,
+    read_json_moves,
+    read_text_games,
+)
+from game_solver.game import GameError
+
+BASE_TEST_DIR = Path(__file__).resolve().parents[1] / "sample_games"
+
+
+def get_games() -> List[Tuple[GameCode, str]]:
+    """Returns a list of tuples with game code and game text pairs"""
+    return [
+        (start_checking(file), file.read_text().rstrip("\n") + "\n")
+        for file in sorted(BASE_TEST_DIR.rglob("*"))
+        if file.is_file() and file.parent.name != "file_error"
+    ]
+
+
+def test_read_text_games() -> None:
+    container = io.StringIO("\n1 2 3\n1\n2\n\n\n4 5 6\n7\n")
+    assert [list(game) for game in read_text_games(container)] == [
+        ["1 2 3\n", "1\n", "2\n"],
+        ["4 5 6\n", "7\n"],
+    ]
+
+
+def test_read_text_games_skips_unread_moves() -> None:
+    container = io.StringIO("1 2 3\n1\n2\n\n4 5 6\n7\n")
+    headers = [next(game) for game in read_text_games(container)]
+    assert headers == ["1 2 3\n", "4 5 6\n"]
+
+
+def test_read_text_games_is_lazy() -> None:
+    container = io.StringIO("1 2 3\n1\n\n4 5 6\n7\n")
+    games = read_text_games(container)
+    next(games)
+    assert container.readline() == "1\n"
+
+
+def test_read_json_moves() -> None:
+    assert list(read_json_moves([1, 2, 3])) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("move", (0, -1, "1", 1.0, True, None))
+def test_read_json_moves_invalid(move) -> None:
+    with pytest.raises(GameError) as exc:
+        list(read_json_moves([1, move]))
+    assert int(str(exc.value)) == 8
+
+
+@pytest.mark.parametrize(
+    "line,status",
+    (
+        ('{"dims": [3, 3, 3], "moves": [1, 2, 1, 2, 1]}', GameCode.PLAYER_1_WIN),
+        ('{"dims": [3, 3, 3], "moves": [1, 2, 1, 2, 1, 3]}', GameCode.ILLEGAL_CONTINUE),
+        ('{"dims": [3, 3, 3], "moves": [1, 2]}', GameCode.INCOMPLETE_GAME),
+        ('{"dims": [3, 3, 3], "moves": [4]}', GameCode.ILLEGAL_COLUMN),
+        ('{"dims": [3, 3, 4], "moves": []}', GameCode.ILLEGAL_GAME),
+        ('{"dims": [3, 3, 0], "moves": []}', GameCode.ILLEGAL_FILE),
+        ('{"dims": [3, 3], "moves": []}', GameCode.ILLEGAL_FILE),
+        ('{"dims": [3, 3, "3"], "moves": []}', GameCode.ILLEGAL_FILE),
+        ('{"dims": [3, 3, 3]}', GameCode.ILLEGAL_FILE),
+        ('{"dims": [3, 3, 3], "moves": 1}', GameCode.ILLEGAL_FILE),
+        ("[3, 3, 3]", GameCode.ILLEGAL_FILE),
+        ("not json", GameCode.ILLEGAL_FILE),
+    ),
+)
+def test_play_json_game(line: str, status: GameCode) -> None:
+    assert play_json_game(line) == status
+
+
+def test_check_text_container() -> None:
+    statuses, games = zip(*get_games())
+    container = io.StringIO("\n".join(games))
+    assert list(check_text_container(container)) == list(statuses)
+
+
+def test_check_json_container() -> None:
+    container = io.StringIO(
+        '{"dims": [3, 3, 3], "moves": [1, 2, 1, 2, 1]}\n'
+        "\n"
+        '{"dims": [3, 3, 3], "moves": [1, 2, 1, 2, 1, 2]}\n'
+    )
+    assert list(check_json_container(container, BitBoard)) == [
+        GameCode.PLAYER_1_WIN,
+        GameCode.ILLEGAL_CONTINUE,
+    ]
+
+
+def test_check_container(tmp_path: Path) -> None:
+    statuses, games = zip(*get_games())
+    text_container = tmp_path / "games.txt"
+    text_container.write_text("\n".join(games))
+
+    json_container = tmp_path / "games.jsonl"
+    json_container.write_text(
+        json.dumps({"dims": [3, 3, 3], "moves": [1, 2, 1, 2, 1]}) + "\n"
+    )
+
+    assert list(check_container(text_container)) == list(statuses)
+    assert list(check_container(json_container)) == [GameCode.PLAYER_1_WIN]
@@ -0,0 +1,104 @@
+from typing import List, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from game_solver.bitboard import BitBoard
+from game_solver.flatboard import FlatBoard
+from game_solver.game import GameError
+
+
+class TestFlatBoard:
+    @pytest.fixture
+    def flat_board(self) -> FlatBoard:
+        return FlatBoard(3, 4, 3, Mock())
+
+    def test_init(self, flat_board: FlatBoard) -> None:
+        assert flat_board.cells == bytearray(12)
+        assert flat_board.winning_lines == {1: b"\x01" * 3, 2: b"\x02" * 3}
+        assert flat_board.heights == [0, 0, 0]
+
+    def test_add_piece(self, flat_board: FlatBoard) -> None:
+        for move in (1, 2, 1):
+            flat_board.add_piece(move)
+        assert flat_board.cells == bytearray([1, 1, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0])
+
+    def test_add_piece_illegal_row(self, flat_board: FlatBoard) -> None:
+        for _ in range(4):
+            flat_board.add_piece(1)
+
+        with pytest.raises(GameError) as exc:
+            flat_board.add_piece(1)
+
+        assert int(str(exc.value)) == 5
+
+    @pytest.mark.parametrize(
+        "direction,indexes",
+        (
+            ((0, 1), [4, 5, 6, 7]),
+            ((1, 0), [2, 6, 10]),
+            ((1, 1), [1, 6, 11]),
+            ((1, -1), [3, 6, 9]),
+        ),
+    )
+    def test_get_line(
+        self, direction: Tuple[int, int], indexes: List[int], flat_board: FlatBoard
+    ) -> None:
+        # Mark every cell with its own index
+        flat_board.cells[:] = range(12)
+        flat_board.current_column, flat_board.current_row = 1, 2
+        assert list(flat_board.get_line(*direction)) == indexes
+
+    def test_get_line_single_row(self) -> None:
+        flat_board = FlatBoard(3, 1, 1, Mock())
+        flat_board.cells[:] = range(3)
+        flat_board.current_column, flat_board.current_row = 1, 0
+        assert list(flat_board.get_line(1, -1)) == [1]
+
+    @pytest.mark.parametrize(
+        "width,height,winning_moves,moves,winner",
+        [
+            (3, 4, 3, [1, 2, 1, 2, 1], 1),
+            (4, 4, 3, [1, 1, 2, 2, 4, 3], None),
+            (4, 4, 3, [1, 1, 2, 2, 3], 1),
+            (4, 4, 3, [1, 2, 2, 3, 4, 3, 3], 1),
+            (4, 4, 3, [3, 2, 2, 1, 4, 1, 1], 1),
+            (4, 4, 3, [1, 2, 3, 1, 2, 3], None),
+            (4, 4, 4, [1, 2, 1, 2, 1, 2], None),
+            (1, 5, 5, [1, 1, 1, 1, 1], None),
+            (5, 1, 3, [1, 2, 3, 4, 5], None),
+            (5, 1, 1, [3], 1),
+        ],
+    )
+    def test_check_for_wins(
+        self,
+        width: int,
+        height: int,
+        winning_moves: int,
+        moves: List[int],
+        winner: int,
+    ) -> None:
+        flat_board = FlatBoard(width, height, winning_moves, Mock())
+        for move in moves:
+            flat_board.make_move(move)
+
+        assert flat_board.winner == winner
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_bitboard(self, seed: int) -> None:
+        width, height, winning_moves = 9, 7, 4
+        # A simple deterministic sequence of moves that fills the board
+        moves = [(seed * 7 + turn * (seed + 3)) % width + 1 for turn in range(200)]
+
+        boards = [
+            cls(width, height, winning_moves, Mock()) for cls in (BitBoard, FlatBoard)
+        ]
+        for board in boards:
+            for move in moves:
+                if board.winner is not None:
+                    break
+                if board.heights[move - 1] < height:
+                    board.make_move(move)
+
+        assert boards[0].winner == boards[1].winner
+        assert boards[0].total_moves == boards[1].total_moves
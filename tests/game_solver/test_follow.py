@@ -0,0 +1,179 @@
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import patch
+
+import pytest
+
+from game_solver.config import ENGINE_NAMES, GameCode
+from game_solver.engines import get_engine
+from game_solver.follow import FollowedGame, GameFollower, raise_file_limit
+
+
+def append(file: Path, content: str) -> None:
+    with file.open(mode="a", newline="") as fp:
+        fp.write(content)
+
+
+class TestFollowedGame:
+    @pytest.mark.parametrize("engine_name", ENGINE_NAMES)
+    def test_poll(self, engine_name: str, tmp_path: Path) -> None:
+        file = tmp_path / "game.txt"
+        file.write_text("")
+        game = FollowedGame(file, get_engine(engine_name))
+        statuses = []
+        for content in ("7 6", " 4\n", "1\n2\n", "1\n2\n1", "\n2\n", "1\n", "", "4\n"):
+            append(file, content)
+            statuses.append(game.poll())
+        game.close()
+
+        assert statuses == [
+            None,
+            GameCode.INCOMPLETE_GAME,
+            None,
+            # The last move is made once its line is complete
+            None,
+            None,
+            GameCode.PLAYER_1_WIN,
+            None,
+            GameCode.ILLEGAL_CONTINUE,
+        ]
+        assert game.finished
+        assert game.total_moves == 7
+
+    def test_poll_reads_new_content(self, tmp_path: Path) -> None:
+        file = tmp_path / "game.txt"
+        file.write_text("7 6 4\n1\n2\n")
+        game = FollowedGame(file)
+        game.poll()
+        append(file, "1\n")
+        with patch.object(game.board, "run", wraps=game.board.run) as mock_run:
+            assert game.poll() is None
+        mock_run.assert_called_once_with([1])
+        assert game.total_moves == 3
+        game.close()
+
+    @pytest.mark.parametrize(
+        "content,status,moves",
+        (
+            ("7 6 4\r\n1\r\n2\r\n", GameCode.INCOMPLETE_GAME, 2),
+            ("7 6 4\n1\nx\n", GameCode.ILLEGAL_FILE, 1),
+            ("7 6 4\n8\n", GameCode.ILLEGAL_COLUMN, 0),
+            ("7 6\n1\n", GameCode.ILLEGAL_FILE, 0),
+            ("\n", GameCode.ILLEGAL_FILE, 0),
+            ("2 2 3\n", GameCode.ILLEGAL_GAME, 0),
+            ("1 1 1\n1\n", GameCode.PLAYER_1_WIN, 1),
+        ),
+    )
+    def test_poll_status(
+        self, content: str, status: GameCode, moves: int, tmp_path: Path
+    ) -> None:
+        file = tmp_path / "game.txt"
+        file.write_bytes(content.encode())
+        game = FollowedGame(file)
+        assert game.poll() == status
+        assert game.total_moves == moves
+        game.close()
+
+    def test_poll_file_error(self, tmp_path: Path) -> None:
+        game = FollowedGame(tmp_path / "missing.txt")
+        assert game.poll() == GameCode.FILE_ERROR
+        assert game.finished
+
+        file = tmp_path / "game.txt"
+        file.write_bytes(b"7 6 4\n1\n\xff\n")
+        game = FollowedGame(file)
+        assert game.poll() == GameCode.FILE_ERROR
+        game.close()
+
+    def test_poll_rewritten(self, tmp_path: Path) -> None:
+        file = tmp_path / "game.txt"
+        file.write_text("7 6 4\n1\n2\n1\n2\n1\n2\n")
+        game = FollowedGame(file)
+        assert game.poll() == GameCode.INCOMPLETE_GAME
+        # Files that shrink are followed from the start again
+        file.write_text("7 6 3\n1\n2\n1\n2\n1\n")
+        assert game.poll() == GameCode.PLAYER_1_WIN
+        assert game.total_moves == 5
+        game.close()
+
+
+class TestGameFollower:
+    def test_poll_intervals(self, tmp_path: Path) -> None:
+        file = tmp_path / "game.txt"
+        file.write_text("7 6 4\n")
+        follower = GameFollower([file], min_interval=1, max_interval=4)
+        follower.add(follower.games[0], 0, 1)
+
+        def poll(now: float) -> List[tuple]:
+            return list(follower.poll(now))
+
+        assert poll(0) == [(file, GameCode.INCOMPLETE_GAME, 0)]
+        # Games without new moves are checked less often
+        assert [poll(now) for now in (1, 2, 3, 4, 5, 8, 12)] == [[]] * 7
+        assert [when for when, *_ in follower.schedule] == [16]
+
+        append(file, "1\n")
+        assert poll(15) == []
+        assert poll(16) == []
+        assert [when for when, *_ in follower.schedule] == [17]
+        follower.close()
+
+    def test_poll_finished(self, tmp_path: Path) -> None:
+        file = tmp_path / "game.txt"
+        file.write_text("7 6 4\n8\n")
+        follower = GameFollower([file, tmp_path / "missing.txt"])
+        for game in follower.games:
+            follower.add(game, 0, 1)
+
+        assert sorted(follower.poll(0)) == [
+            (file, GameCode.ILLEGAL_COLUMN, 0),
+            (tmp_path / "missing.txt", GameCode.FILE_ERROR, 0),
+        ]
+        # Finished games are no longer followed
+        assert follower.schedule == []
+        assert follower.games[0].file_pointer is None
+
+    def test_follow(self, tmp_path: Path) -> None:
+        file = tmp_path / "game.txt"
+        file.write_text("7 6 4\n1\n2\n")
+        transitions = []
+        with GameFollower([file], min_interval=0, max_interval=0) as follower:
+            for transition in follower.follow():
+                transitions.append(transition)
+                # Moves are appended while the file is followed
+                append(file, "1\n2\n1\n2\n1\n" if len(transitions) == 1 else "1\n")
+
+        assert transitions == [
+            (file, GameCode.INCOMPLETE_GAME, 2),
+            (file, GameCode.PLAYER_1_WIN, 7),
+            (file, GameCode.ILLEGAL_CONTINUE, 7),
+        ]
+
+
+@pytest.mark.parametrize(
+    "limits,files,expected",
+    (
+        ((256, 4096), 1000, (1064, 4096)),
+        ((256, 512), 1000, (512, 512)),
+        ((2048, 4096), 1000, None),
+    ),
+)
+def test_raise_file_limit(limits: tuple, files: int, expected: Optional[tuple]) -> None:
+    resource = pytest.importorskip("resource")
+    with patch.object(resource, "getrlimit", return_value=limits), patch.object(
+        resource, "setrlimit"
+    ) as mock_setrlimit:
+        raise_file_limit(files)
+
+    if expected is None:
+        mock_setrlimit.assert_not_called()
+    else:
+        mock_setrlimit.assert_called_once_with(resource.RLIMIT_NOFILE, expected)
+
+
+def test_raise_file_limit_not_allowed() -> None:
+    resource = pytest.importorskip("resource")
+    with patch.object(resource, "getrlimit", return_value=(256, 4096)), patch.object(
+        resource, "setrlimit", side_effect=ValueError
+    ):
+        raise_file_limit(1000)
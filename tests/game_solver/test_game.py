@@ -1,14 +1,73 @@
+import io
+import random
+from pathlib import Path
 from typing import List, Tuple
 from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
 
+from game_solver import game as game_module
+from game_solver.bitboard import BitBoard
 from game_solver.config import GameCode
-from game_solver.game import Game, GameBoard, GameChecker, GameError, GameOver
+from game_solver.game import (
+    Game,
+    GameBoard,
+    GameChecker,
+    GameError,
+    GameOver,
+    parse_move,
+    parse_moves,
+    parse_single_digit_moves,
+)
+from game_solver.sparse import SparseBoard
 
 BASE_PATH = "game.GameChecker"
 
 
+@pytest.mark.parametrize(
+    "line,move", (("1\n", 1), ("12", 12), (" 3 \n", 3), ("-1\n", -1), ("a\n", None))
+)
+def test_parse_move(line: str, move: int) -> None:
+    assert parse_move(line) == move
+
+
+@pytest.mark.parametrize(
+    "data,moves",
+    (
+        ("1\n2\n3\n", [1, 2, 3]),
+        ("1\n2\n3", [1, 2, 3]),
+        ("1\n0\n", [1, 0]),
+        ("", None),
+        ("1\n\n", None),
+        ("1\n22\n", None),
+        ("1\n-\n", None),
+        ("1 \n2\n", None),
+        ("1\n\u0662\n", None),
+    ),
+)
+def test_parse_single_digit_moves(data: str, moves: List[int]) -> None:
+    assert parse_single_digit_moves(data) == moves
+
+
+@pytest.mark.parametrize(
+    "data,moves,invalid",
+    (
+        ("", [], None),
+        ("1\n2\n3\n", [1, 2, 3], None),
+        ("1\n2\n3", [1, 2, 3], None),
+        ("1\n\n", [1], 1),
+        ("1\na\n3\n", [1], 1),
+        ("1\n2\n-3\n4\n", [1, 2], 2),
+        ("0\na\n", [], 0),
+        ("a\n0\n", [], 0),
+        ("12\n3\n", [12, 3], None),
+        ("1\n 2\n", [1, 2], None),
+    ),
+)
+def test_parse_moves(data: str, moves: List[int], invalid: int) -> None:
+    assert parse_moves(data) == (moves, invalid)
+
+
 class TestGameOver:
     @pytest.mark.parametrize("status", list(range(10)))
     def test_valid_status(self, status: int) -> None:
@@ -175,6 +234,38 @@ class TestGameChecker:
             assert game_checker.winner == current_player
             assert game_status.status == GameCode(current_player)
 
+    @pytest.mark.parametrize(
+        "line,expected",
+        (([1, 1], False), ([0, 1, 1, 1], True), ([1, 1, 1, 0], False)),
+    )
+    def test_is_winning_line(
+        self, line: List[int], expected: bool, game_checker: GameChecker
+    ) -> None:
+        game_checker.winning_moves = 3
+        game_checker.current_player = 1
+        assert game_checker.is_winning_line(line) == expected
+        assert game_checker.winner == None
+
+    def test_get_lines(self, game_checker: GameChecker) -> None:
+        game_checker.width = 3
+        game_checker.height = 3
+        game_checker.max_diagonal_length = 3
+        game_checker.current_column = 1
+        game_checker.current_row = 1
+        game_checker.board = [[1, 2, None], [2, 1, None], [1, None, None]]
+
+        assert list(game_checker.get_lines()) == [
+            [2, 1],
+            [1, 1],
+            [1, 1],
+            (2, 1),
+            (1, None),
+            (1, 1),
+            (1, None),
+            (1, 1),
+            (1, None),
+        ]
+
     @patch.object(GameChecker, "check_line_for_win")
     def test_check_vertical_line(
         self, mock_check_line_for_win: MagicMock, game_checker: GameChecker
@@ -200,6 +291,70 @@ class TestGameChecker:
         line = game_checker.get_diagonal_line(orientation="right")
         assert line == [0, 0, 0]
 
+    @pytest.mark.parametrize(
+        "orientation,column,expected", (("left", 1, [1, 1]), ("right", 2, [1]))
+    )
+    def test_get_diagonal_line_edge(
+        self,
+        orientation: str,
+        column: int,
+        expected: List[int],
+        game_checker: GameChecker,
+    ) -> None:
+        game_checker.current_column = column
+        game_checker.current_row = 1
+        game_checker.max_diagonal_length = 3
+        game_checker.board = [[1, 2, 2], [2, 1, 2], [2, 1, 2]]
+
+        # The line stops at the edge of the board instead of wrapping around
+        line = game_checker.get_diagonal_line(orientation=orientation)
+        assert line == expected
+
+    @pytest.mark.parametrize(
+        "column,row,expected",
+        ((0, 0, [1, 1, 1]), (3, 3, [1, 1, 1, 1]), (4, 1, [2, 2]), (0, 3, [1])),
+    )
+    def test_get_right_diagonal_upper_line(
+        self, column: int, row: int, expected: List[int], game_checker: GameChecker
+    ) -> None:
+        game_checker.width = 5
+        game_checker.height = 4
+        game_checker.winning_moves = 3
+        game_checker.current_column = column
+        game_checker.current_row = row
+        game_checker.board = [
+            [1, 2, 2, 1],
+            [2, 1, 2, 2],
+            [2, 2, 1, 2],
+            [2, 2, 2, 1],
+            [2, 2, 2, 2],
+        ]
+
+        # The line goes through the new piece
+        assert game_checker.get_right_diagonal_upper_line() == expected
+
+    @pytest.mark.parametrize(
+        "column,row,expected",
+        ((4, 0, [1, 1, 1]), (1, 3, [1, 1, 1]), (0, 1, [2, 2]), (4, 3, [1])),
+    )
+    def test_get_left_diagonal_upper_line(
+        self, column: int, row: int, expected: List[int], game_checker: GameChecker
+    ) -> None:
+        game_checker.width = 5
+        game_checker.height = 4
+        game_checker.winning_moves = 3
+        game_checker.current_column = column
+        game_checker.current_row = row
+        game_checker.board = [
+            [2, 2, 2, 2],
+            [2, 2, 2, 1],
+            [2, 2, 1, 2],
+            [2, 1, 2, 2],
+            [1, 2, 2, 1],
+        ]
+
+        assert game_checker.get_left_diagonal_upper_line() == expected
+
     def test_get_diagonal_line_left(self, game_checker: GameChecker) -> None:
         game_checker.current_column = 2
         game_checker.current_row = 4
@@ -413,7 +568,7 @@ class TestGameChecker:
             game_checker.board[width - x - 1][x] = piece
 
         game_checker.current_player = current_player
-        game_checker.current_column = width - current_row
+        game_checker.current_column = width - current_row - 1
         game_checker.current_row = current_row
 
         game_checker.winning_moves = winning_moves
@@ -550,6 +705,7 @@ class TestGameBoard:
         assert board.current_column == None
         assert board.current_row == None
         assert board.total_moves == 0
+        assert board.heights == [0, 0, 0]
 
         assert board.board == [
             [None, None, None, None],
@@ -581,23 +737,75 @@ class TestGameBoard:
 
         assert int(str(exc.value)) == 4
 
-    @patch.object(GameBoard, "add_piece")
+    @patch.object(GameBoard, "place_piece", return_value=None)
     @patch.object(GameBoard, "check_for_wins")
     def test_make_move_no_winner(
         self,
         mock_check_for_wins: MagicMock,
-        mock_add_piece: MagicMock,
+        mock_place_piece: MagicMock,
         game_board: GameBoard,
     ) -> None:
         move = 1
         game_board.winner = None
         game_board.make_move(1)
 
-        mock_add_piece.assert_called_once_with(move)
+        mock_place_piece.assert_called_once_with(move)
         mock_check_for_wins.assert_called_once()
 
+    def test_play_move_game_over(self, game_board: GameBoard) -> None:
+        game_board.winner = 1
+        assert game_board.play_move(1) == GameCode.ILLEGAL_CONTINUE
+
+    @pytest.mark.parametrize(
+        "move,status", ((4, GameCode.ILLEGAL_COLUMN), (1, GameCode.ILLEGAL_ROW))
+    )
+    def test_play_move_error(
+        self, move: int, status: GameCode, game_board: GameBoard
+    ) -> None:
+        game_board.heights = [4, 0, 0]
+        assert game_board.play_move(move) == status
+        assert game_board.total_moves == 0
+
+    def test_play_move(self, game_board: GameBoard) -> None:
+        assert game_board.play_move(2) == None
+        assert game_board.board[1][0] == 1
+
+    @pytest.mark.parametrize(
+        "moves,status",
+        (
+            (["1\n", "2\n", "1\n", "2\n", "1\n"], GameCode.PLAYER_1_WIN),
+            (["1\n", "2\n", "1\n", "2\n", "1\n", "3\n"], GameCode.ILLEGAL_CONTINUE),
+            (["1\n", "2\n", "1\n", "2\n", "1\n", "a\n"], GameCode.ILLEGAL_FILE),
+            (["1\n", "0\n"], GameCode.ILLEGAL_FILE),
+            (["1\n", "1\n", "1\n", "1\n", "1\n"], GameCode.ILLEGAL_ROW),
+            (["4\n"], GameCode.ILLEGAL_COLUMN),
+            (["1\n"], GameCode.INCOMPLETE_GAME),
+        ),
+    )
+    def test_run(
+        self, moves: List[str], status: GameCode, game_board: GameBoard
+    ) -> None:
+        game_board.file_object = moves
+        assert game_board.run() == status
+
+    @pytest.mark.parametrize(
+        "moves,status",
+        (
+            ([1, 2, 1, 2, 1], GameCode.PLAYER_1_WIN),
+            ([1, 2, None], GameCode.ILLEGAL_FILE),
+            ([1, -2], GameCode.ILLEGAL_FILE),
+        ),
+    )
+    def test_run_moves(
+        self, moves: List[int], status: GameCode, game_board: GameBoard
+    ) -> None:
+        assert game_board.run(moves) == status
+
     def test_add_piece_illegal_row(self, game_board: GameBoard) -> None:
         game_board.board = [[0, 1, 1]]
+        game_board.heights = [3]
+        game_board.width = 1
+        game_board.height = 3
         with pytest.raises(GameError) as exc:
             game_board.add_piece(1)
 
@@ -605,6 +813,9 @@ class TestGameBoard:
 
     def test_add_piece_illegal_column(self, game_board: GameBoard) -> None:
         game_board.board = [[0, 1, 1]]
+        game_board.heights = [3]
+        game_board.width = 1
+        game_board.height = 3
         with pytest.raises(GameError) as exc:
             game_board.add_piece(2)
 
@@ -612,6 +823,9 @@ class TestGameBoard:
 
     def test_add_piece(self, game_board: GameBoard) -> None:
         game_board.board = [[1, 2, None]]
+        game_board.heights = [2]
+        game_board.width = 1
+        game_board.height = 3
 
         assert game_board.current_column == None
         assert game_board.current_row == None
@@ -623,8 +837,18 @@ class TestGameBoard:
         assert game_board.current_column == 0
         assert game_board.current_row == 2
         assert game_board.total_moves == 1
+        assert game_board.heights == [3]
         assert game_board.board[0][2] == 1
 
+    def test_legal_moves(self, game_board: GameBoard) -> None:
+        assert game_board.legal_moves() == [1, 2, 3]
+
+        for move in (2, 2, 2, 2):
+            game_board.add_piece(move)
+
+        assert game_board.heights == [0, 4, 0]
+        assert game_board.legal_moves() == [1, 3]
+
     def test_get_moves(self, game_board: GameBoard) -> None:
         vals = range(1, 6)
         game_board.file_object = [f"{x}\n" for x in vals]
@@ -648,6 +872,110 @@ class TestGameBoard:
             list(game_board.get_moves())
         assert int(str(exc.value)) == 8
 
+    def test_get_moves_line(self, game_board: GameBoard) -> None:
+        game_board.file_object = [f"{x}\n" for x in (1, 2, "a", 3)]
+        with pytest.raises(GameError) as exc:
+            list(game_board.get_moves())
+        assert exc.value.line == 4
+
+    def test_read_moves_lines(self, game_board: GameBoard) -> None:
+        game_board.file_object = ["1\n", "a\n", "2\n"]
+        assert list(game_board.read_moves()) == [1, None, 2]
+
+    @pytest.mark.parametrize(
+        "data,moves",
+        (("1\n2\n3\n", [1, 2, 3]), ("1\n2\n0\n3", [1, 2, None])),
+    )
+    def test_read_moves_file(
+        self, data: str, moves: List[int], game_board: GameBoard
+    ) -> None:
+        game_board.file_object = io.StringIO(data)
+        assert list(game_board.read_moves()) == moves
+
+    @pytest.mark.parametrize(
+        "data,invalid_line",
+        (("1\n2\nx\n", 4), ("0\n", 2), ("1\n2\n1\n2\n1\n2\n1\n2\nx", None)),
+    )
+    def test_run_invalid_line(
+        self, data: str, invalid_line: int, game_board: GameBoard
+    ) -> None:
+        game_board.file_object = io.StringIO(data)
+        game_board.run()
+        assert game_board.invalid_line == invalid_line
+
+    @pytest.mark.parametrize(
+        "moves,no_win_move,status",
+        (
+            # Every line has pieces of both players after the eleventh move
+            ([2, 1, 1, 1, 3, 3, 3, 2, 2, 3, 2, 1], 11, GameCode.DRAW),
+            ([2, 1, 1, 1, 3, 3, 3, 2, 2, 3, 2], 11, GameCode.INCOMPLETE_GAME),
+            ([1, 2, 1, 2, 1], None, GameCode.PLAYER_1_WIN),
+        ),
+    )
+    def test_track_windows(
+        self,
+        moves: List[int],
+        no_win_move: int,
+        status: GameCode,
+        game_board: GameBoard,
+    ) -> None:
+        game_board.track_windows()
+        assert game_board.run(moves) == status
+        assert game_board.no_win_move == no_win_move
+
+    def test_track_windows_skips_checks(self, game_board: GameBoard) -> None:
+        game_board.track_windows()
+        with patch.object(game_board, "check_for_wins") as mock_check_for_wins:
+            game_board.run([2, 1, 1, 1, 3, 3, 3, 2, 2, 3, 2, 1])
+        # Wins are not checked from the eleventh move on
+        assert mock_check_for_wins.call_count == 10
+
+    @pytest.mark.parametrize(
+        "moves,status",
+        (
+            ([2, 1, 1, 1, 3, 3, 3, 2, 2, 3, 2], GameCode.DRAW),
+            # Moves after the game is stopped are not checked
+            ([2, 1, 1, 1, 3, 3, 3, 2, 2, 3, 2, 4], GameCode.DRAW),
+            ([2, 1, 1, 1, 3, 3, 3, 2, 4], GameCode.ILLEGAL_COLUMN),
+        ),
+    )
+    def test_track_windows_stop_early(
+        self, moves: List[int], status: GameCode, game_board: GameBoard
+    ) -> None:
+        game_board.track_windows(stop_early=True)
+        assert game_board.run(moves) == status
+
+    def test_track_windows_play_moves(self, game_board: GameBoard) -> None:
+        game_board.track_windows(stop_early=True)
+        with pytest.raises(GameOver) as exc:
+            game_board.play_moves([2, 1, 1, 1, 3, 3, 3, 2, 2, 3, 2, 4])
+        assert exc.value.status == GameCode.DRAW
+        assert game_board.total_moves == 11
+
+    @pytest.mark.parametrize(
+        "moves,forced_win,status",
+        (
+            # Player 1 is to move with a playable threat after the fourth move
+            ([1, 2, 1, 2], (1, 4), GameCode.INCOMPLETE_GAME),
+            ([1, 2, 1, 2, 1], (1, 4), GameCode.PLAYER_1_WIN),
+            # Player 1 misses the win, so player 2 can win first
+            ([1, 2, 1, 2, 3], (2, 5), GameCode.INCOMPLETE_GAME),
+            # Both players miss the win and block the other
+            ([1, 2, 1, 2, 3, 1], None, GameCode.INCOMPLETE_GAME),
+            ([2, 1, 1, 1, 3, 3, 3, 2, 2, 3, 2, 1], None, GameCode.DRAW),
+        ),
+    )
+    def test_track_threats(
+        self,
+        moves: List[int],
+        forced_win: Tuple[int, int],
+        status: GameCode,
+        game_board: GameBoard,
+    ) -> None:
+        game_board.track_threats()
+        assert game_board.run(moves) == status
+        assert game_board.forced_win == forced_win
+
     def test_finish_game_not_finished(self, game_board: GameBoard) -> None:
         game_board.winner = None
         game_board.total_moves = 7
@@ -698,23 +1026,70 @@ class TestGame:
         game = Game(file_pointer)
         assert game.file_pointer == file_pointer
 
-    @patch.object(Game, "initialise")
-    def test_play_game_not_finished(
-        self, mock_initialise: MagicMock, game: Game
+    @patch.object(Game, "setup")
+    def test_play(self, mock_setup: MagicMock, game: Game) -> None:
+        status = GameCode.PLAYER_1_WIN
+        mock_setup.return_value.run.return_value = status
+
+        assert game.play() == status
+        mock_setup.assert_called_once()
+        mock_setup.return_value.run.assert_called_once_with(None)
+
+    @pytest.mark.parametrize(
+        "lines,invalid_line",
+        (
+            (["3 3 3\n", "1\n", "2\n", "x\n"], 4),
+            (["3 3 3\n", "0\n", "1\n"], 2),
+            (["3 3 3\n", "1\n", "2\n"], None),
+            (["3 3 3\n", "4\n", "x\n"], None),
+        ),
+    )
+    @pytest.mark.parametrize("as_file", (True, False))
+    def test_play_invalid_line(
+        self, lines: List[str], invalid_line: int, as_file: bool
     ) -> None:
-        assert game.play() == None
-        mock_initialise.assert_called_once()
+        file_pointer = io.StringIO("".join(lines)) if as_file else iter(lines)
+        game = Game(file_pointer)
+        assert game.invalid_line is None
+
+        game.play()
+        assert game.invalid_line == invalid_line
 
-    @pytest.mark.parametrize("exception", (GameError, GameError))
-    @patch.object(Game, "initialise")
-    def test_play_game_finished(
-        self, mock_initialise: MagicMock, exception, game: Game
+    @pytest.mark.parametrize("stop_early,status", ((False, 6), (True, 0)))
+    @pytest.mark.parametrize("as_file", (True, False))
+    def test_play_open_windows(
+        self, stop_early: bool, status: int, as_file: bool, tmp_path: Path
     ) -> None:
-        status = 1
-        mock_initialise.side_effect = exception(status)
+        # Nobody can win once the windows of the first pieces are blocked,
+        # before the move in a column outside the board
+        lines = ["100 1 5\n"] + [f"{move}\n" for move in range(1, 102)]
+        file = tmp_path / "game.txt"
+        file.write_text("".join(lines))
+        with file.open() as fp:
+            game = Game(
+                fp if as_file else iter(lines), open_windows=True, stop_early=stop_early
+            )
+            assert game.play() == GameCode(status)
+        assert game.no_win_move == 97
+
+    @pytest.mark.parametrize("as_file", (True, False))
+    def test_play_threats(self, as_file: bool, tmp_path: Path) -> None:
+        # Player 1 has an open three before the move outside the board
+        lines = ["7 6 4\n", "2\n", "2\n", "3\n", "3\n", "4\n", "8\n"]
+        file = tmp_path / "game.txt"
+        file.write_text("".join(lines))
+        with file.open() as fp:
+            game = Game(fp if as_file else iter(lines), threats=True)
+            assert game.play() == GameCode.ILLEGAL_COLUMN
+        assert game.forced_win == (1, 5)
+
+    @patch.object(Game, "setup")
+    def test_play_game_error(self, mock_setup: MagicMock, game: Game) -> None:
+        status = 8
+        mock_setup.side_effect = GameError(status)
         game_status = game.play()
 
-        mock_initialise.assert_called_once()
+        mock_setup.assert_called_once()
         assert game_status == GameCode(status)
 
     @patch.object(GameBoard, "start_game")
@@ -733,6 +1108,26 @@ class TestGame:
         mock_validate_board_setup.assert_called_once_with(*header)
         mock_init.assert_called_once_with(*header, game.file_pointer)
 
+    @patch.object(Game, "validate_board_setup")
+    @patch.object(GameBoard, "__init__", return_value=None)
+    def test_setup(
+        self,
+        mock_init: MagicMock,
+        mock_validate_board_setup: MagicMock,
+        header: Tuple[int],
+        game: Game,
+    ) -> None:
+        board = game.setup()
+        assert isinstance(board, GameBoard)
+        mock_validate_board_setup.assert_called_once_with(*header)
+        mock_init.assert_called_once_with(*header, game.file_pointer)
+
+    @pytest.mark.parametrize("threshold,engine", ((20, GameBoard), (19, SparseBoard)))
+    def test_setup_sparse_board(self, threshold: int, engine: type, game: Game) -> None:
+        with patch.object(game_module, "SPARSE_CELL_THRESHOLD", threshold):
+            board = game.setup()
+        assert type(board) is engine
+
     def test_parse_header(self, game: Game, header: List[int]) -> None:
         header_input = " ".join(map(str, header))
         assert game.parse_header(header_input) == tuple(header)
@@ -771,3 +1166,74 @@ class TestGame:
             game.validate_board_setup(width, height, winning_moves)
 
         assert int(str(exc.value)) == 7
+
+
+@pytest.mark.parametrize(
+    "width,height,winning_moves,moves,status",
+    (
+        # Won on the upper right diagonal through the last piece, which
+        # is not centred on the part of the board that can be won
+        (
+            7,
+            6,
+            4,
+            [3, 1, 7, 1, 3, 3, 6, 2, 4, 5, 3, 2, 1, 5, 7, 1, 5, 7, 2, 5, 4]
+            + [2, 7, 7, 7, 6, 5, 5, 1, 4, 2, 3, 1, 3, 6, 6, 4, 6, 2, 6, 4, 4],
+            GameCode.PLAYER_2_WIN,
+        ),
+        # The left diagonal down from the last piece in the first column
+        # used to wrap around to the pieces in the last columns
+        (3, 3, 3, [3, 2, 3, 2, 2, 1, 1, 2, 1], GameCode.ILLEGAL_ROW),
+    ),
+)
+def test_game_board_diagonals(
+    width: int, height: int, winning_moves: int, moves: List[int], status: GameCode
+) -> None:
+    board = GameBoard(width, height, winning_moves, Mock())
+    assert board.run(moves) == status
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_track_windows_keeps_status(seed: int) -> None:
+    generator = random.Random(seed)
+    for _ in range(50):
+        width, height = generator.randint(1, 8), generator.randint(1, 8)
+        winning_moves = generator.randint(1, 5)
+        moves = [generator.randint(1, width) for _ in range(width * height)]
+
+        boards = [GameBoard(width, height, winning_moves, Mock()) for _ in range(2)]
+        boards[1].track_windows()
+        assert boards[0].run(moves) == boards[1].run(moves)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_track_threats_keeps_status(seed: int) -> None:
+    generator = random.Random(seed)
+    for _ in range(50):
+        width, height = generator.randint(1, 8), generator.randint(1, 8)
+        winning_moves = generator.randint(1, 5)
+        moves = [generator.randint(1, width) for _ in range(width * height)]
+
+        boards = [GameBoard(width, height, winning_moves, Mock()) for _ in range(2)]
+        boards[1].track_threats()
+        status = boards[0].run(moves)
+        assert boards[1].run(moves) == status
+        if status in (GameCode.PLAYER_1_WIN, GameCode.PLAYER_2_WIN):
+            # The winner could force the win by the time they won at the latest
+            assert boards[1].forced_win[0] == status
+            assert boards[1].forced_win[1] <= boards[1].total_moves
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_game_board_matches_bitboard(seed: int) -> None:
+    generator = random.Random(seed)
+    for _ in range(50):
+        width, height = generator.randint(1, 8), generator.randint(1, 8)
+        winning_moves = generator.randint(1, 5)
+        moves = [generator.randint(1, width) for _ in range(width * height)]
+
+        statuses = [
+            engine(width, height, winning_moves, Mock()).run(moves)
+            for engine in (GameBoard, BitBoard)
+        ]
+        assert statuses[0] == statuses[1]
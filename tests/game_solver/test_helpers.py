@@ -1,27 +1,63 @@
 import io
+from collections import Counter
 from pathlib import Path
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 from game_solver.config import GAME_OUTPUT_MESSAGES, GameCode
-from game_solver.helpers import ArgParser, show_summary, sliding_window
+from game_solver.helpers import (
+    ArgParser,
+    show_batch_summary,
+    show_cache_summary,
+    show_solution,
+    show_summary,
+    sliding_window,
+)
 
 
 class TestArgParser:
     @patch("game_solver.helpers.argparse.ArgumentParser")
     def test_init(self, mock_arg_parser: MagicMock) -> None:
-        arguments = "yes"
+        arguments = Mock(
+            lockstep=False,
+            solve=False,
+            time_limit=None,
+            book=None,
+            open_windows=False,
+            stop_early=False,
+            threats=False,
+            snapshots=None,
+            follow=None,
+        )
         mock_parser = Mock()
         mock_parser.parse_args.return_value = arguments
         mock_arg_parser.return_value = mock_parser
 
         arg_parser = ArgParser()
-        mock_parser.add_argument.assert_called_once()
+        assert mock_parser.add_argument.call_count == 19
         mock_parser.parse_args.assert_called_once()
+        mock_parser.error.assert_not_called()
         assert arg_parser.args == arguments
 
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_missing_filename(self, mock_arg_parser: MagicMock) -> None:
+        arguments = Mock(
+            filename=None,
+            batch=None,
+            follow=None,
+            container=None,
+            serve=None,
+            lockstep=False,
+        )
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        mock_parser.error.assert_called_once()
+
     @patch.object(ArgParser, "__init__", return_value=None)
     def test_get_path(self, mock_init: MagicMock) -> None:
         path = "/random/path"
@@ -30,6 +66,438 @@ class TestArgParser:
         arg_parser.args.filename = path
         assert arg_parser.get_path() == Path(path)
 
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_engine_name(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.engine = "bitboard"
+        assert arg_parser.get_engine_name() == "bitboard"
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_batch_patterns(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.batch = ["games/", "*.txt"]
+        assert arg_parser.get_batch_patterns() == ["games/", "*.txt"]
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_container(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.container = "games.jsonl"
+        assert arg_parser.get_container() == Path("games.jsonl")
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_container_missing(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.container = None
+        assert arg_parser.get_container() == None
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_conversion_output(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.convert = "games.c4b"
+        assert arg_parser.get_conversion_output() == Path("games.c4b")
+
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_lockstep_text_container(self, mock_arg_parser: MagicMock) -> None:
+        arguments = Mock(
+            container="games.jsonl",
+            lockstep=True,
+            solve=False,
+            time_limit=None,
+            book=None,
+            open_windows=False,
+            stop_early=False,
+            threats=False,
+            snapshots=None,
+            follow=None,
+        )
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        mock_parser.error.assert_called_once()
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_lockstep(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.lockstep = True
+        assert arg_parser.get_lockstep() == True
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_workers(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.workers = 4
+        assert arg_parser.get_workers() == 4
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_cache_path(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.cache = "results.db"
+        assert arg_parser.get_cache_path() == Path("results.db")
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_cache_path_missing(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.cache = None
+        assert arg_parser.get_cache_path() == None
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_cache_size(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.cache_size = 1000
+        assert arg_parser.get_cache_size() == 1000
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_serve_address(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.serve = "127.0.0.1:8765"
+        assert arg_parser.get_serve_address() == "127.0.0.1:8765"
+
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_solve_missing_filename(self, mock_arg_parser: MagicMock) -> None:
+        arguments = Mock(
+            filename=None,
+            follow=None,
+            container="games.txt",
+            solve=True,
+            lockstep=False,
+        )
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        mock_parser.error.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "mode", ({"batch": ["games/"]}, {"container": "games.txt"}, {"serve": ":8765"})
+    )
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_solve_other_mode(
+        self, mock_arg_parser: MagicMock, mode: dict
+    ) -> None:
+        arguments = Mock(
+            filename="game.txt",
+            follow=None,
+            batch=None,
+            container=None,
+            serve=None,
+            solve=True,
+            lockstep=False,
+        )
+        for name, value in mode.items():
+            setattr(arguments, name, value)
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        mock_parser.error.assert_called_once()
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_solve(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.solve = True
+        assert arg_parser.get_solve() == True
+
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_time_limit_without_solve(self, mock_arg_parser: MagicMock) -> None:
+        arguments = Mock(
+            filename="game.txt",
+            follow=None,
+            solve=False,
+            time_limit=50.0,
+            lockstep=False,
+        )
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        mock_parser.error.assert_called_once()
+
+    @pytest.mark.parametrize("time_limit,expected", ((50.0, 0.05), (None, None)))
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_time_limit(
+        self, mock_init: MagicMock, time_limit: float, expected: float
+    ) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.time_limit = time_limit
+        assert arg_parser.get_time_limit() == expected
+
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_book_without_solve(self, mock_arg_parser: MagicMock) -> None:
+        arguments = Mock(
+            filename="game.txt",
+            follow=None,
+            solve=False,
+            time_limit=None,
+            book="book.c4ob",
+            lockstep=False,
+        )
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        mock_parser.error.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "book,expected", (("book.c4ob", Path("book.c4ob")), (None, None))
+    )
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_book_path(
+        self, mock_init: MagicMock, book: Optional[str], expected: Optional[Path]
+    ) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.book = book
+        assert arg_parser.get_book_path() == expected
+
+    @pytest.mark.parametrize(
+        "mode",
+        (
+            {"batch": ["games/"]},
+            {"container": "games.txt"},
+            {"serve": ":8765"},
+            {"solve": True},
+            {"cache": "results.db"},
+        ),
+    )
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_open_windows_other_mode(
+        self, mock_arg_parser: MagicMock, mode: dict
+    ) -> None:
+        arguments = Mock(
+            filename="game.txt",
+            batch=None,
+            container=None,
+            serve=None,
+            solve=False,
+            cache=None,
+            time_limit=None,
+            book=None,
+            open_windows=True,
+            stop_early=False,
+            threats=False,
+            snapshots=None,
+            follow=None,
+            lockstep=False,
+        )
+        for name, value in mode.items():
+            setattr(arguments, name, value)
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        mock_parser.error.assert_called_once()
+
+    @pytest.mark.parametrize("open_windows,errors", ((False, 1), (True, 0)))
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_stop_early(
+        self, mock_arg_parser: MagicMock, open_windows: bool, errors: int
+    ) -> None:
+        arguments = Mock(
+            filename="game.txt",
+            batch=None,
+            container=None,
+            serve=None,
+            solve=False,
+            cache=None,
+            time_limit=None,
+            book=None,
+            open_windows=open_windows,
+            stop_early=True,
+            threats=False,
+            snapshots=None,
+            follow=None,
+            lockstep=False,
+        )
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        assert mock_parser.error.call_count == errors
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_open_windows(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.open_windows = True
+        assert arg_parser.get_open_windows() == True
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_stop_early(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.stop_early = True
+        assert arg_parser.get_stop_early() == True
+
+    @pytest.mark.parametrize(
+        "mode", ({"batch": ["games/"]}, {"solve": True}, {"cache": "results.db"})
+    )
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_threats_other_mode(
+        self, mock_arg_parser: MagicMock, mode: dict
+    ) -> None:
+        arguments = Mock(
+            filename="game.txt",
+            batch=None,
+            container=None,
+            serve=None,
+            solve=False,
+            cache=None,
+            time_limit=None,
+            book=None,
+            open_windows=False,
+            stop_early=False,
+            threats=True,
+            snapshots=None,
+            follow=None,
+            lockstep=False,
+        )
+        for name, value in mode.items():
+            setattr(arguments, name, value)
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        mock_parser.error.assert_called_once()
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_threats(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.threats = True
+        assert arg_parser.get_threats() == True
+
+    @pytest.mark.parametrize(
+        "mode,errors",
+        (
+            ({}, 0),
+            ({"filename": None, "batch": ["games/"]}, 0),
+            ({"filename": None, "container": "games.txt"}, 1),
+            ({"filename": None, "serve": ":8765"}, 1),
+            ({"solve": True}, 1),
+            ({"cache": "results.db"}, 1),
+            ({"open_windows": True}, 1),
+            ({"threats": True}, 1),
+        ),
+    )
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_snapshots(
+        self, mock_arg_parser: MagicMock, mode: dict, errors: int
+    ) -> None:
+        arguments = Mock(
+            filename="game.txt",
+            batch=None,
+            container=None,
+            serve=None,
+            solve=False,
+            cache=None,
+            time_limit=None,
+            book=None,
+            open_windows=False,
+            stop_early=False,
+            threats=False,
+            snapshots="snapshots.db",
+            follow=None,
+            lockstep=False,
+        )
+        for name, value in mode.items():
+            setattr(arguments, name, value)
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        assert mock_parser.error.call_count == errors
+
+    @pytest.mark.parametrize(
+        "mode,errors",
+        (
+            ({}, 0),
+            ({"filename": "game.txt"}, 1),
+            ({"batch": ["games/"]}, 1),
+            ({"serve": ":8765"}, 1),
+            ({"cache": "results.db"}, 1),
+            ({"snapshots": "snapshots.db"}, 1),
+            ({"threats": True}, 1),
+        ),
+    )
+    @patch("game_solver.helpers.argparse.ArgumentParser")
+    def test_init_follow(
+        self, mock_arg_parser: MagicMock, mode: dict, errors: int
+    ) -> None:
+        arguments = Mock(
+            filename=None,
+            batch=None,
+            follow=["games/"],
+            container=None,
+            serve=None,
+            solve=False,
+            cache=None,
+            time_limit=None,
+            book=None,
+            open_windows=False,
+            stop_early=False,
+            threats=False,
+            snapshots=None,
+            lockstep=False,
+        )
+        for name, value in mode.items():
+            setattr(arguments, name, value)
+        mock_parser = Mock()
+        mock_parser.parse_args.return_value = arguments
+        mock_arg_parser.return_value = mock_parser
+
+        ArgParser()
+        assert mock_parser.error.call_count == errors
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_follow_patterns(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.follow = ["games/", "*.txt"]
+        assert arg_parser.get_follow_patterns() == ["games/", "*.txt"]
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_snapshot_path(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.snapshots = "snapshots.db"
+        assert arg_parser.get_snapshot_path() == Path("snapshots.db")
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_snapshot_path_missing(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.snapshots = None
+        assert arg_parser.get_snapshot_path() == None
+
+    @patch.object(ArgParser, "__init__", return_value=None)
+    def test_get_profile(self, mock_init: MagicMock) -> None:
+        arg_parser = ArgParser()
+        arg_parser.args = Mock()
+        arg_parser.args.profile = True
+        assert arg_parser.get_profile() == True
+
 
 @pytest.mark.parametrize(
     "iterable,window_size,expected_windows",
@@ -38,6 +506,8 @@ class TestArgParser:
         ([1, 2, 3, 4], 2, [(1, 2), (2, 3), (3, 4)]),
         ([1, 2, 3, 4], 3, [(1, 2, 3), (2, 3, 4)]),
         ([1, 2, 3, 4], 4, [(1, 2, 3, 4)]),
+        ([1, 2], 4, []),
+        ([], 3, []),
     ],
 )
 def test_sliding_window(
@@ -53,7 +523,117 @@ def test_show_summary_game_player_won(mock_stdout: MagicMock, status: GameCode)
     assert mock_stdout.getvalue().strip() == GAME_OUTPUT_MESSAGES[status]
 
 
+@pytest.mark.parametrize(
+    "status,invalid_line,expected",
+    (
+        (GameCode.ILLEGAL_FILE, 5, " >> The first invalid move is on line 5"),
+        (GameCode.ILLEGAL_FILE, None, None),
+        (GameCode.DRAW, 5, None),
+    ),
+)
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_show_summary_invalid_line(
+    mock_stdout: MagicMock, status: GameCode, invalid_line: int, expected: str
+) -> None:
+    show_summary(status, invalid_line)
+    lines = GAME_OUTPUT_MESSAGES[status].splitlines()
+    if expected is not None:
+        lines.append(expected)
+    assert mock_stdout.getvalue().splitlines() == lines
+
+
+@pytest.mark.parametrize(
+    "status,invalid_line,no_win_move",
+    ((GameCode.DRAW, None, 12), (GameCode.ILLEGAL_FILE, 20, 12)),
+)
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_show_summary_no_win_move(
+    mock_stdout: MagicMock, status: GameCode, invalid_line: int, no_win_move: int
+) -> None:
+    show_summary(status, invalid_line, no_win_move)
+    output = mock_stdout.getvalue().splitlines()
+    assert output[-1] == " >> No win is possible from move 12"
+    assert len(output) == len(GAME_OUTPUT_MESSAGES[status].splitlines()) + (
+        2 if invalid_line else 1
+    )
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_show_summary_forced_win(mock_stdout: MagicMock) -> None:
+    show_summary(GameCode.PLAYER_2_WIN, None, None, (2, 17))
+    assert mock_stdout.getvalue().splitlines() == [
+        GAME_OUTPUT_MESSAGES[GameCode.PLAYER_2_WIN],
+        " >> Player 2 could force a win from move 17",
+    ]
+
+
 @pytest.mark.parametrize("code", (-1, 11, 100, "", "abcd", None, "1"))
 def test_show_summary_invalid_code(code: Union[int, str]) -> None:
     with pytest.raises(KeyError):
         show_summary(code)
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_show_batch_summary(mock_stdout: MagicMock) -> None:
+    statuses = Counter({GameCode.DRAW: 3, GameCode.ILLEGAL_ROW: 1})
+    show_batch_summary(statuses, 2.0)
+    assert mock_stdout.getvalue().splitlines() == [
+        "DRAW: 3",
+        "ILLEGAL_ROW: 1",
+        "Checked 4 games in 2.00s (2 games/s)",
+    ]
+
+
+@pytest.mark.parametrize(
+    "hits,misses,expected",
+    (
+        (3, 1, "Cache: 3 hits, 1 misses (75% hit rate)"),
+        (0, 0, "Cache: 0 hits, 0 misses (0% hit rate)"),
+    ),
+)
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_show_cache_summary(
+    mock_stdout: MagicMock, hits: int, misses: int, expected: str
+) -> None:
+    show_cache_summary(hits, misses)
+    assert mock_stdout.getvalue().strip() == expected
+
+
+@pytest.mark.parametrize(
+    "status,score,best_move,depth,expected",
+    (
+        (
+            GameCode.PLAYER_1_WIN,
+            3,
+            4,
+            None,
+            ["Solution: Player 1 win with perfect play", "Best move: 4 (score 3)"],
+        ),
+        (
+            GameCode.DRAW,
+            0,
+            1,
+            None,
+            ["Solution: Draw with perfect play", "Best move: 1 (score 0)"],
+        ),
+        (
+            GameCode.INCOMPLETE_GAME,
+            0,
+            4,
+            7,
+            ["Solution: Undecided within 7 moves", "Best move: 4 (score 0)"],
+        ),
+        (GameCode.PLAYER_2_WIN, None, None, None, ["Game Over: Player 2 win"]),
+    ),
+)
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_show_solution(
+    mock_stdout: MagicMock,
+    status: GameCode,
+    score: int,
+    best_move: int,
+    depth: int,
+    expected: List[str],
+) -> None:
+    show_solution(status, score, best_move, depth)
+    assert mock_stdout.getvalue().splitlines() == expected
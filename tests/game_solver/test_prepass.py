@@ -0,0 +1,150 @@
+import io
+import random
+from typing import List, Optional, Tuple
+from unittest.mock import Mock, patch
+
+import pytest
+
+from game_solver import prepass
+from game_solver.bitboard import BitBoard, has_run
+from game_solver.config import GameCode
+from game_solver.engines import ENGINES
+from game_solver.game import Game
+from game_solver.prepass import (
+    find_illegal_move,
+    find_illegal_move_python,
+    has_winning_line,
+)
+
+
+@pytest.mark.parametrize(
+    "moves,illegal",
+    (
+        ([1, 2, 3, 1, 2, 3], None),
+        ([], None),
+        ([1, 4, 1], (GameCode.ILLEGAL_COLUMN, 1)),
+        ([1, 1, 1, 2, 1], (GameCode.ILLEGAL_ROW, 4)),
+        ([1, 1, 1, 4, 1], (GameCode.ILLEGAL_COLUMN, 3)),
+        ([1, 1, 4, 1, 1], (GameCode.ILLEGAL_COLUMN, 2)),
+        ([3, 2, 3, 3, 1, 2, 2, 9], (GameCode.ILLEGAL_COLUMN, 7)),
+        ([3, 2, 3, 3, 1, 3, 9], (GameCode.ILLEGAL_ROW, 5)),
+    ),
+)
+@pytest.mark.parametrize("min_moves", (0, 64))
+def test_find_illegal_move(
+    moves: List[int], illegal: Optional[Tuple[GameCode, int]], min_moves: int
+) -> None:
+    # A minimum of 0 moves checks every game with NumPy
+    with patch.object(prepass, "MIN_VECTORIZED_MOVES", min_moves):
+        assert find_illegal_move(3, 3, moves) == illegal
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_illegal_move_matches_python(seed: int) -> None:
+    generator = random.Random(seed)
+    width, height = generator.randint(1, 10), generator.randint(1, 10)
+    moves = [generator.randint(1, width + 1) for _ in range(200)]
+
+    assert find_illegal_move(width, height, moves) == find_illegal_move_python(
+        width, height, moves
+    )
+
+
+@pytest.mark.parametrize(
+    "width,height,moves,won",
+    (
+        (3, 3, [1, 2, 1, 2, 1], True),
+        (3, 3, [1, 1, 2, 2, 3], True),
+        (3, 3, [1, 2, 2, 3, 3, 1, 3], True),
+        (3, 3, [3, 2, 2, 1, 1, 3, 1], True),
+        (3, 3, [1, 2, 1, 2, 2, 1, 3], False),
+        (1, 5, [1, 1, 1, 1, 1], False),
+        (5, 1, [1, 3, 2, 4, 5], False),
+    ),
+)
+def test_has_winning_line(width: int, height: int, moves: List[int], won: bool) -> None:
+    with patch.object(prepass, "MIN_VECTORIZED_MOVES", 0):
+        assert has_winning_line(width, height, 3, moves) == won
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_has_winning_line_matches_bitboard(seed: int) -> None:
+    generator = random.Random(seed)
+    width, height, winning_moves = 9, 7, generator.randint(3, 5)
+    moves = [generator.randint(1, width) for _ in range(40)]
+
+    board = BitBoard(width, height, winning_moves, Mock())
+    legal_moves = []
+    for move in moves:
+        if board.heights[move - 1] < height:
+            board.add_piece(move)
+            legal_moves.append(move)
+    # Every piece is placed without checking for wins in between
+    won = any(
+        has_run(mask, shift, winning_moves)
+        for mask in board.masks
+        for shift in board.shifts
+    )
+
+    with patch.object(prepass, "MIN_VECTORIZED_MOVES", 0):
+        assert has_winning_line(width, height, winning_moves, legal_moves) == won
+
+
+def test_has_winning_line_not_checked() -> None:
+    assert has_winning_line(3, 3, 3, [1, 2, 1, 2, 1]) is None
+
+
+@pytest.mark.parametrize("min_moves", (0, 64))
+@pytest.mark.parametrize("engine", ENGINES.values())
+@pytest.mark.parametrize("seed", range(30))
+def test_play_file_matches_setup(engine: type, seed: int, min_moves: int) -> None:
+    generator = random.Random(seed)
+    width, height, winning_moves = generator.choice(((3, 3, 3), (7, 6, 4), (5, 4, 5)))
+    moves = [generator.randint(1, width + 1) for _ in range(width * height)]
+    if seed % 3 == 0:
+        moves.insert(generator.randrange(len(moves)), "x")
+    text = f"{width} {height} {winning_moves}\n" + "".join(f"{m}\n" for m in moves)
+
+    # Lines of a game file are played one at a time, without the pre-pass
+    expected = Game(iter(text.splitlines(keepends=True)), engine).play()
+    with patch.object(prepass, "MIN_VECTORIZED_MOVES", min_moves):
+        assert Game(io.StringIO(text), engine).play() == expected
+
+
+@pytest.mark.parametrize(
+    "options",
+    (
+        {},
+        {"open_windows": True},
+        {"open_windows": True, "stop_early": True},
+        {"threats": True},
+    ),
+)
+@pytest.mark.parametrize("engine", ENGINES.values())
+@pytest.mark.parametrize("seed", range(30))
+def test_play_file_matches_setup_tracking(
+    engine: type, seed: int, options: dict
+) -> None:
+    generator = random.Random(seed)
+    width, height, winning_moves = generator.choice(
+        ((3, 3, 3), (7, 6, 4), (5, 4, 5), (12, 1, 5), (8, 3, 3))
+    )
+    # Legal moves, so that windows and threats come into play before
+    # the illegal move at the end
+    heights = [0] * width
+    moves = []
+    for _ in range(generator.randint(0, width * height)):
+        column = generator.choice([c for c in range(width) if heights[c] < height])
+        heights[column] += 1
+        moves.append(column + 1)
+    moves.append(generator.choice((width + 1, moves[-1] if moves else 1)))
+    text = f"{width} {height} {winning_moves}\n" + "".join(f"{m}\n" for m in moves)
+
+    def play(file_pointer) -> tuple:
+        game = Game(file_pointer, engine, **options)
+        status = game.play()
+        return status, game.invalid_line, game.no_win_move, game.forced_win
+
+    # Games from files are played in the same way as games from lines
+    expected = play(iter(text.splitlines(keepends=True)))
+    assert play(io.StringIO(text)) == expected
@@ -0,0 +1,103 @@
+import io
+import json
+from pathlib import Path
+
+from game_solver import game
+from game_solver.bitboard import BitBoard
+from game_solver.game import Game, GameBoard, GameChecker
+from game_solver.helpers import sliding_window
+from game_solver.profiler import CHECKS, Profiler
+
+# Player 1 wins with a horizontal line on the 7th move
+GAME = "7 6 4\n1\n1\n2\n2\n3\n3\n4\n"
+
+
+def play(engine=GameBoard) -> None:
+    Game(io.StringIO(GAME), engine).play()
+
+
+def test_profiler_counts() -> None:
+    with Profiler() as profiler:
+        play()
+
+    stats = profiler.stats
+    assert stats["parse_header"][0] == 1
+    assert stats["parse_moves"][0] == 1
+    assert stats["place_piece"][0] == 7
+    assert stats["check_for_wins"][0] == 7
+    # Wins are only checked once the first player could have won
+    assert stats["_check_lines_for_wins"][0] == 1
+    assert stats["get_diagonal_line[left]"][0] == 1
+    assert stats["get_diagonal_line[right]"][0] == 1
+    # Lines after the winning horizontal line are not checked
+    assert stats["sliding_window"][0] == 1
+    assert profiler.windows > 0
+    assert all(total >= 0 for _, total in stats.values())
+
+
+def test_profiler_checks_called() -> None:
+    # Nobody wins, so every line around the last piece is checked
+    with Profiler() as profiler:
+        Game(io.StringIO("7 6 4\n1\n2\n3\n4\n5\n6\n7\n")).play()
+
+    names = {name.split("[")[0] for name in profiler.stats}
+    assert set(CHECKS) <= names
+
+
+def test_profiler_phases() -> None:
+    with Profiler() as profiler:
+        play()
+
+    phases = profiler.get_phases()
+    assert [phases[phase][0] for phase in ("parse", "place", "check")] == [2, 7, 7]
+
+
+def test_profiler_restores_functions() -> None:
+    originals = {name: vars(GameChecker)[name] for name in CHECKS}
+    with Profiler():
+        assert GameBoard.check_for_wins is not GameChecker.check_for_wins
+        assert game.sliding_window is not sliding_window
+
+    assert "check_for_wins" not in vars(GameBoard)
+    assert "place_piece" in vars(GameBoard)
+    assert game.sliding_window is sliding_window
+    assert {name: vars(GameChecker)[name] for name in CHECKS} == originals
+    assert not any(name in vars(GameBoard) for name in CHECKS)
+
+
+def test_profiler_engine() -> None:
+    check_for_wins = BitBoard.check_for_wins
+    with Profiler(BitBoard) as profiler:
+        play(BitBoard)
+
+    assert BitBoard.check_for_wins is check_for_wins
+    assert profiler.stats["check_for_wins"][0] == 7
+    assert "_check_lines_for_wins" not in profiler.stats
+
+
+def test_profiler_disabled() -> None:
+    with Profiler() as profiler:
+        pass
+    play()
+    assert not profiler.stats
+
+
+def test_profiler_report() -> None:
+    with Profiler() as profiler:
+        play()
+
+    report = profiler.report().splitlines()
+    assert report[0].split() == ["Phase", "Calls", "Total", "Per", "call"]
+    assert report[1].split()[:2] == ["parse", "2"]
+    assert report[-1] == f"Windows yielded by sliding_window: {profiler.windows}"
+
+
+def test_profiler_dump(tmp_path: Path) -> None:
+    with Profiler() as profiler:
+        play()
+
+    profiler.dump(tmp_path / "profile.json")
+    profile = json.loads((tmp_path / "profile.json").read_text())
+    assert profile["engine"] == "GameBoard"
+    assert profile["phases"]["place"][0] == 7
+    assert profile["functions"]["check_for_wins"][0] == 7
@@ -0,0 +1,116 @@
+import random
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+
+from game_solver.bitboard import BitBoard
+from game_solver.game import GameBoard, GameError
+from game_solver.runlength import RunLengthBoard
+
+
+class TestRunLengthBoard:
+    @pytest.fixture
+    def run_length_board(self) -> RunLengthBoard:
+        return RunLengthBoard(3, 4, 3, Mock())
+
+    def test_init(self, run_length_board: RunLengthBoard) -> None:
+        assert run_length_board.pieces == bytearray(12)
+        assert len(run_length_board.runs) == 4
+        assert all(list(runs) == [0] * 12 for runs in run_length_board.runs)
+        assert run_length_board.heights == [0, 0, 0]
+        assert run_length_board.current_run == 0
+
+    @pytest.mark.parametrize(
+        "column,row,expected", ((-1, 0, 0), (0, 4, 0), (0, 0, 5), (1, 0, 0))
+    )
+    def test_get_run(
+        self, column: int, row: int, expected: int, run_length_board: RunLengthBoard
+    ) -> None:
+        run_length_board.current_player = 1
+        run_length_board.pieces[0] = 1
+        run_length_board.pieces[4] = 2
+        run_length_board.runs[0][0] = 5
+        run_length_board.runs[0][4] = 5
+
+        assert (
+            run_length_board.get_run(column, row, run_length_board.runs[0]) == expected
+        )
+
+    def test_add_piece_joins_lines(self, run_length_board: RunLengthBoard) -> None:
+        for move in (1, 1, 3, 3, 2):
+            run_length_board.add_piece(move)
+
+        horizontal = run_length_board.runs[1]
+        assert run_length_board.current_run == 3
+        assert [horizontal[0], horizontal[4], horizontal[8]] == [3, 3, 3]
+        assert [horizontal[1], horizontal[9]] == [1, 1]
+
+    def test_add_piece_illegal_row(self, run_length_board: RunLengthBoard) -> None:
+        for _ in range(4):
+            run_length_board.add_piece(1)
+
+        with pytest.raises(GameError) as exc:
+            run_length_board.add_piece(1)
+
+        assert int(str(exc.value)) == 5
+
+    @pytest.mark.parametrize(
+        "width,height,winning_moves,moves,winner",
+        [
+            (3, 4, 3, [1, 2, 1, 2, 1], 1),
+            (4, 4, 3, [1, 1, 2, 2, 4, 3], None),
+            (4, 4, 3, [1, 1, 2, 2, 3], 1),
+            (4, 4, 3, [1, 2, 2, 3, 4, 3, 3], 1),
+            (4, 4, 3, [3, 2, 2, 1, 4, 1, 1], 1),
+            (4, 4, 3, [1, 2, 3, 1, 2, 3], None),
+            (4, 4, 4, [1, 2, 1, 2, 1, 2], None),
+            (1, 5, 5, [1, 1, 1, 1, 1], None),
+            (5, 1, 3, [1, 2, 3, 4, 5], None),
+            (5, 1, 1, [3], 1),
+        ],
+    )
+    def test_check_for_wins(
+        self,
+        width: int,
+        height: int,
+        winning_moves: int,
+        moves: List[int],
+        winner: int,
+    ) -> None:
+        run_length_board = RunLengthBoard(width, height, winning_moves, Mock())
+        for move in moves:
+            run_length_board.make_move(move)
+
+        assert run_length_board.winner == winner
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_bitboard(self, seed: int) -> None:
+        width, height, winning_moves = 9, 7, 4
+        # A simple deterministic sequence of moves that fills the board
+        moves = [(seed * 7 + turn * (seed + 3)) % width + 1 for turn in range(200)]
+
+        boards = [
+            cls(width, height, winning_moves, Mock())
+            for cls in (BitBoard, RunLengthBoard)
+        ]
+        for board in boards:
+            for move in moves:
+                if board.winner is not None:
+                    break
+                if board.heights[move - 1] < height:
+                    board.make_move(move)
+
+        assert boards[0].winner == boards[1].winner
+        assert boards[0].total_moves == boards[1].total_moves
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_default(self, seed: int) -> None:
+        # Random games on a standard board, played until they end
+        generator = random.Random(seed)
+        for _ in range(50):
+            moves = [generator.randint(1, 7) for _ in range(42)]
+            statuses = [
+                cls(7, 6, 4, Mock()).run(moves) for cls in (GameBoard, RunLengthBoard)
+            ]
+            assert statuses[0] == statuses[1]
@@ -0,0 +1,134 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+from game_solver.bitboard import BitBoard
+from game_solver.config import GAME_OUTPUT_MESSAGES, GameCode
+from game_solver.server import (
+    MAX_REQUEST_SIZE,
+    check_request,
+    make_response,
+    parse_address,
+    parse_request,
+    start_server,
+)
+
+BASE_TEST_DIR = Path(__file__).resolve().parents[1] / "sample_games"
+DRAW_FILE = BASE_TEST_DIR / "draw" / "draw.txt"
+
+
+async def send_lines(address: str, lines: List[bytes]) -> List[dict]:
+    """Start a server, pipeline request lines to it and read every response"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        server = await start_server(address, BitBoard, executor)
+        async with server:
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.writelines(lines)
+            writer.write_eof()
+            responses = [json.loads(line) async for line in reader]
+            writer.close()
+    return responses
+
+
+@pytest.mark.parametrize(
+    "address,expected",
+    (
+        ("127.0.0.1:8765", ("127.0.0.1", 8765)),
+        (":8765", ("127.0.0.1", 8765)),
+        ("::1:8765", ("::1", 8765)),
+        ("/tmp/connect4.sock", ("/tmp/connect4.sock", None)),
+    ),
+)
+def test_parse_address(address: str, expected: Tuple[str, Optional[int]]) -> None:
+    assert parse_address(address) == expected
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    (
+        (b'{"id": 1, "text": "7 6 4\\n"}', (1, "7 6 4\n", None)),
+        (b'{"path": "game.txt"}', (None, None, "game.txt")),
+        (b'{"id": 1, "text": ""}', (1, "", None)),
+    ),
+)
+def test_parse_request(line: bytes, expected: tuple) -> None:
+    assert parse_request(line) == expected
+
+
+@pytest.mark.parametrize(
+    "line",
+    (
+        b"not json",
+        b"[1, 2]",
+        b'{"id": 1}',
+        b'{"text": "7 6 4", "path": "game.txt"}',
+        b'{"text": 764}',
+    ),
+)
+def test_parse_request_invalid(line: bytes) -> None:
+    with pytest.raises(ValueError):
+        parse_request(line)
+
+
+@pytest.mark.parametrize(
+    "text,path,expected",
+    (
+        (DRAW_FILE.read_text(), None, GameCode.DRAW),
+        (None, str(DRAW_FILE), GameCode.DRAW),
+        ("", None, GameCode.ILLEGAL_FILE),
+        (None, str(BASE_TEST_DIR / "I_don't_exist.txt"), GameCode.FILE_ERROR),
+    ),
+)
+def test_check_request(
+    text: Optional[str], path: Optional[str], expected: GameCode
+) -> None:
+    assert check_request(text, path) == expected
+
+
+def test_make_response() -> None:
+    assert json.loads(make_response("a", GameCode.PLAYER_2_WIN)) == {
+        "id": "a",
+        "status": 2,
+        "name": "PLAYER_2_WIN",
+        "message": GAME_OUTPUT_MESSAGES[GameCode.PLAYER_2_WIN],
+    }
+
+
+def test_server_pipelined_requests() -> None:
+    games = ["7 6 4\n1\n2\n1\n2\n1\n2\n1\n", "7 6 4\n8\n", "7 6 4\n1\n"] * 100
+    lines = [
+        json.dumps({"id": index, "text": game}).encode() + b"\n"
+        for index, game in enumerate(games)
+    ]
+    responses = asyncio.run(send_lines("127.0.0.1:0", lines))
+
+    assert [response["id"] for response in responses] == list(range(len(games)))
+    assert [response["name"] for response in responses] == [
+        "PLAYER_1_WIN",
+        "ILLEGAL_COLUMN",
+        "INCOMPLETE_GAME",
+    ] * 100
+
+
+def test_server_invalid_requests() -> None:
+    lines = [
+        b"not json\n",
+        b"\n",
+        json.dumps({"id": 1, "path": str(DRAW_FILE)}).encode() + b"\n",
+    ]
+    responses = asyncio.run(send_lines("127.0.0.1:0", lines))
+
+    assert responses[0]["error"].startswith("invalid request")
+    assert responses[1]["name"] == "DRAW"
+    assert len(responses) == 2
+
+
+def test_server_request_too_long() -> None:
+    lines = [b'{"text": "' + b"1" * MAX_REQUEST_SIZE + b'"}\n']
+    responses = asyncio.run(send_lines("127.0.0.1:0", lines))
+    assert responses == [{"id": None, "error": "request is too long"}]
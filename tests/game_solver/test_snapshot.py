@@ -0,0 +1,119 @@
+import pickle
+import random
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from game_solver.config import ENGINE_NAMES, GameCode
+from game_solver.engines import get_engine
+from game_solver.snapshot import BoardSnapshot, SnapshotStore
+
+
+@pytest.mark.parametrize(
+    "snapshot",
+    (
+        BoardSnapshot({}, b""),
+        BoardSnapshot({3: 1}, b"\x01"),
+        BoardSnapshot({0: 2, 10**9: 3}, b"\x01\x02\x02\x01\x01", 1),
+        # Pieces of player 1 at the end are not lost with the high bits
+        BoardSnapshot({1: 9}, b"\x02" + b"\x01" * 8, 2),
+    ),
+)
+def test_board_snapshot_bytes(snapshot: BoardSnapshot) -> None:
+    assert BoardSnapshot.from_bytes(snapshot.to_bytes()) == snapshot
+
+
+def test_board_snapshot_compact() -> None:
+    # One bit for every piece
+    snapshot = BoardSnapshot({0: 6, 1: 6}, b"\x01\x02" * 6)
+    assert len(snapshot.to_bytes()) == 9 + 2 * 16 + 2
+
+
+@pytest.mark.parametrize("engine_name", ENGINE_NAMES)
+@pytest.mark.parametrize(
+    "moves",
+    (
+        [],
+        [4],
+        [4, 4, 3, 3, 5, 5],
+        # Player 1 has won the game
+        [1, 2, 1, 2, 1, 2, 1],
+    ),
+)
+def test_restore_snapshot(engine_name: str, moves: list) -> None:
+    engine = get_engine(engine_name)
+    board = engine(7, 6, 4, Mock())
+    board.run(moves)
+    snapshot = board.get_snapshot()
+
+    restored = engine(7, 6, 4, Mock())
+    restored.restore_snapshot(snapshot)
+    assert restored.get_snapshot() == snapshot
+    assert (restored.total_moves, restored.winner) == (len(moves), board.winner)
+    assert restored.legal_moves() == board.legal_moves()
+
+    # The game carries on from the snapshot in the same way
+    more_moves = [5, 5, 5, 6, 7]
+    assert restored.run(more_moves) == board.run(more_moves)
+    assert restored.get_snapshot() == board.get_snapshot()
+
+
+@pytest.mark.parametrize("engine_name", ENGINE_NAMES)
+@pytest.mark.parametrize("seed", range(5))
+def test_restore_snapshot_random(engine_name: str, seed: int) -> None:
+    engine = get_engine(engine_name)
+    generator = random.Random(seed)
+    for _ in range(20):
+        width, height = generator.randint(1, 8), generator.randint(1, 8)
+        winning_moves = generator.randint(1, 5)
+        moves = [generator.randint(1, width) for _ in range(width * height)]
+        split = generator.randint(0, len(moves))
+
+        board = engine(width, height, winning_moves, Mock())
+        status = board.run(moves)
+
+        first = engine(width, height, winning_moves, Mock())
+        if first.run(moves[:split]) not in (
+            GameCode.INCOMPLETE_GAME,
+            GameCode.PLAYER_1_WIN,
+            GameCode.PLAYER_2_WIN,
+            GameCode.DRAW,
+        ):
+            continue
+        restored = engine(width, height, winning_moves, Mock())
+        restored.restore_snapshot(first.get_snapshot())
+        assert restored.run(moves[split:]) == status
+
+
+class TestSnapshotStore:
+    def test_get(self, tmp_path: Path) -> None:
+        snapshot = BoardSnapshot({3: 2}, b"\x01\x02")
+        with SnapshotStore(tmp_path / "snapshots.db") as store:
+            assert store.get("game.txt") is None
+            store.put("game.txt", 10, b"digest", snapshot)
+            assert store.get("game.txt") == (10, b"digest", snapshot)
+            assert len(store) == 1
+
+    def test_put_replaces(self, tmp_path: Path) -> None:
+        snapshot = BoardSnapshot({3: 3}, b"\x01\x02\x01")
+        with SnapshotStore(tmp_path / "snapshots.db") as store:
+            store.put("game.txt", 10, b"digest", BoardSnapshot({}, b""))
+            store.put("game.txt", 12, b"other digest", snapshot)
+            assert store.get("game.txt") == (12, b"other digest", snapshot)
+            assert len(store) == 1
+
+    def test_persists(self, tmp_path: Path) -> None:
+        snapshot = BoardSnapshot({0: 1}, b"\x01")
+        with SnapshotStore(tmp_path / "snapshots.db") as store:
+            store.put("game.txt", 8, b"digest", snapshot)
+
+        with SnapshotStore(tmp_path / "snapshots.db") as store:
+            assert store.get("game.txt") == (8, b"digest", snapshot)
+
+    def test_pickle(self, tmp_path: Path) -> None:
+        with SnapshotStore(tmp_path / "snapshots.db") as store:
+            assert len(store) == 0
+            copy = pickle.loads(pickle.dumps(store))
+            assert copy.file == store.file
+            assert copy._connection is None
@@ -0,0 +1,442 @@
+import io
+import multiprocessing
+import time
+from typing import List, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from game_solver.bitboard import BitBoard, has_run
+from game_solver.config import GameCode
+from game_solver.solver import (
+    DeepeningSolver,
+    ParallelSolver,
+    Position,
+    Solution,
+    Solver,
+    get_split_plies,
+    search_subproblem,
+    solve,
+    solve_game,
+)
+from game_solver.transposition import EMPTY, TranspositionTable
+
+
+def get_score(position: Position) -> int:
+    """Get the score of the player to move by searching every move"""
+    scores = []
+    for column in range(position.width):
+        if (
+            position.mask & position.column_masks[column]
+            == position.column_masks[column]
+        ):
+            # The column is full
+            continue
+
+        position.play(column)
+        # The pieces of the player that has just moved
+        pieces = position.current ^ position.mask
+        if any(
+            has_run(pieces, shift, position.winning_moves) for shift in position.shifts
+        ):
+            scores.append((position.size + 2 - position.moves) // 2)
+        else:
+            scores.append(-get_score(position))
+        position.undo(column)
+    return max(scores, default=0)
+
+
+def count_line(position: Position, pieces: int, cell: int, shift: int) -> int:
+    """Count the pieces in a row on both sides of a cell along a direction"""
+    count = 0
+    for step in (shift, -shift):
+        current = cell + step
+        while 0 <= current and pieces >> current & 1:
+            count += 1
+            current += step
+    return count
+
+
+class TestPosition:
+    @pytest.fixture
+    def position(self) -> Position:
+        return Position(3, 4, 3)
+
+    def test_init(self, position: Position) -> None:
+        assert position.bottom_mask == 0b000010000100001
+        assert position.board_mask == 0b011110111101111
+        assert position.column_masks == [0b1111, 0b1111 << 5, 0b1111 << 10]
+        assert position.current == position.mask == position.moves == 0
+
+    def test_play_undo(self, position: Position) -> None:
+        for column in (0, 1, 0):
+            position.play(column)
+        assert position.mask == 0b000000000100011
+        # Player 2 is to move, with a piece in the second column
+        assert position.current == 0b000000000100000
+        assert position.player == 2
+
+        position.undo(0)
+        assert position.mask == 0b000000000100001
+        assert position.current == 0b1
+        assert position.moves == 2
+
+    def test_hash(self, position: Position) -> None:
+        player_1, player_2 = position.zobrist_keys
+        position.play(0)
+        position.play(0)
+        assert position.hash == player_1[0] ^ player_2[1]
+
+        position.undo(0)
+        assert position.hash == player_1[0]
+        position.undo(0)
+        assert position.hash == 0
+
+    def test_hash_transposition(self) -> None:
+        positions = [Position(7, 6, 4), Position(7, 6, 4)]
+        for position, columns in zip(positions, ([3, 2, 4, 2], [4, 2, 3, 2])):
+            for column in columns:
+                position.play(column)
+        assert positions[0].hash == positions[1].hash
+
+        positions[1].undo(2)
+        positions[1].play(5)
+        assert positions[0].hash != positions[1].hash
+
+    def test_mirror_hash(self) -> None:
+        positions = [Position(4, 4, 3), Position(4, 4, 3)]
+        for position, columns in zip(positions, ([0, 1, 0], [3, 2, 3])):
+            for column in columns:
+                position.play(column)
+        assert positions[0].get_mirror_hash() == positions[1].hash
+        assert positions[1].get_mirror_hash() == positions[0].hash
+        assert positions[0].get_mirror_hash() != positions[0].hash
+
+    def test_from_board_hash(self) -> None:
+        moves = [4, 4, 3, 5, 1, 7, 7, 2]
+        board = BitBoard(7, 6, 4, Mock())
+        board.run(moves)
+        position = Position(7, 6, 4)
+        for move in moves:
+            position.play(move - 1)
+        assert Position.from_board(board).hash == position.hash
+
+    @pytest.mark.parametrize(
+        "moves,cells",
+        (
+            # Vertical line of player 1 in the first column
+            ([1, 2, 1, 2], 0b100),
+            # Horizontal line: the third column
+            ([1, 1, 2, 2], 0b1 << 10),
+            ([1, 3], 0),
+        ),
+    )
+    def test_winning_cells(self, moves: List[int], cells: int) -> None:
+        board = BitBoard(3, 4, 3, Mock())
+        board.run(moves)
+        position = Position.from_board(board)
+        assert position.winning_cells(board.masks[0]) == cells
+
+    @pytest.mark.parametrize("winning_moves", (2, 3, 4, 5))
+    def test_winning_cells_matches_full_check(self, winning_moves: int) -> None:
+        position = Position(7, 6, winning_moves)
+        for column in (3, 3, 2, 4, 2, 1, 4, 5, 4, 4, 2, 6, 2, 0, 5):
+            position.play(column)
+
+        for pieces in (position.current, position.current ^ position.mask):
+            # Count the pieces in a row next to every empty cell
+            cells = 0
+            for cell in range(position.width * position.stride):
+                bit = 1 << cell
+                if bit & position.board_mask and not bit & position.mask:
+                    if any(
+                        count_line(position, pieces, cell, shift) >= winning_moves - 1
+                        for shift in position.shifts
+                    ):
+                        cells |= bit
+            assert position.winning_cells(pieces) == cells
+
+
+class TestSolver:
+    @pytest.mark.parametrize(
+        "width,height,winning_moves,moves",
+        (
+            (3, 3, 2, []),
+            (3, 3, 3, []),
+            (4, 3, 3, []),
+            (4, 3, 3, [2]),
+            (3, 4, 3, [1, 2]),
+            (4, 4, 3, [2, 3, 3]),
+            (4, 4, 4, [1, 2, 3, 4, 1, 2]),
+            (4, 4, 3, [1, 4, 2, 3]),
+        ),
+    )
+    def test_matches_full_search(
+        self, width: int, height: int, winning_moves: int, moves: List[int]
+    ) -> None:
+        board = BitBoard(width, height, winning_moves, Mock())
+        assert board.run(moves) == GameCode.INCOMPLETE_GAME
+        position = Position.from_board(board)
+
+        solution = Solver(Position.from_board(board)).solve()
+        assert solution.score == get_score(position)
+
+        # The best move keeps the score, unless it wins the game
+        position.play(solution.best_move - 1)
+        if solution.score != (position.size + 2 - position.moves) // 2:
+            assert -get_score(position) == solution.score
+
+    @pytest.mark.parametrize("table_memory", (1, 1000))
+    @pytest.mark.parametrize(
+        "width,height,winning_moves,moves",
+        ((4, 4, 3, []), (5, 4, 4, [3, 3, 2, 4]), (7, 6, 4, [4] * 6 + [3] * 4)),
+    )
+    def test_small_table(
+        self,
+        width: int,
+        height: int,
+        winning_moves: int,
+        moves: List[int],
+        table_memory: int,
+    ) -> None:
+        board = BitBoard(width, height, winning_moves, Mock())
+        board.run(moves)
+        # Positions that don't fit in the table are searched again
+        solution = Solver(Position.from_board(board), table_memory).solve()
+        assert solution[:3] == solve(width, height, winning_moves, moves)[:3]
+
+    def test_table(self) -> None:
+        solver = Solver(Position(4, 4, 3), table_memory=2**16)
+        solver.solve()
+        assert solver.table.size == 4096
+        assert solver.table.hits
+        assert solver.table.stores
+        for index in range(solver.table.size):
+            if solver.table.bounds[index] != EMPTY:
+                assert solver.table.moves[index] in range(-1, 4)
+
+    def test_table_cuts_nodes(self) -> None:
+        board = BitBoard(7, 6, 4, Mock())
+        board.run([7, 5, 6, 4, 5, 7, 4, 5, 2, 6, 4, 6, 4, 7, 2, 4])
+        # A table with a single entry is of next to no use
+        solutions = [
+            Solver(Position.from_board(board), table_memory).solve()
+            for table_memory in (2**20, 1)
+        ]
+        assert solutions[0][:3] == solutions[1][:3]
+        assert solutions[1].nodes > 10 * solutions[0].nodes
+
+
+class TestDeepeningSolver:
+    @pytest.mark.parametrize(
+        "width,height,winning_moves,moves",
+        (
+            (4, 4, 3, []),
+            (5, 4, 4, [3, 3, 2, 4]),
+            (7, 6, 4, [4] * 6 + [3] * 4),
+            (7, 6, 4, [7, 5, 6, 4, 5, 7, 4, 5, 2, 6, 4, 6, 4, 7, 2, 4]),
+            (7, 6, 4, [3, 3, 4, 4, 5]),
+        ),
+    )
+    def test_matches_solver(
+        self, width: int, height: int, winning_moves: int, moves: List[int]
+    ) -> None:
+        board = BitBoard(width, height, winning_moves, Mock())
+        board.run(moves)
+        expected = Solver(Position.from_board(board)).solve()
+        solution = DeepeningSolver(Position.from_board(board)).solve()
+        assert solution[:2] == expected[:2]
+
+        # The best move keeps the score, unless it wins the game
+        position = Position.from_board(board)
+        position.play(solution.best_move - 1)
+        if solution.score != position.get_win_score() + 1:
+            assert -Solver(position).get_score() == solution.score
+
+    def test_node_budget(self) -> None:
+        solutions = [
+            DeepeningSolver(Position(7, 6, 4), max_nodes=5000).solve() for _ in range(2)
+        ]
+        assert solutions[0] == solutions[1]
+        assert solutions[0].status == GameCode.INCOMPLETE_GAME
+        assert solutions[0].score == 0
+        assert solutions[0].nodes == 5001
+        assert solutions[0].depth > 1
+
+    def test_node_budget_too_small(self) -> None:
+        # No iteration finishes, so the centre column is the best guess
+        solution = DeepeningSolver(Position(7, 6, 4), max_nodes=1).solve()
+        assert solution.status == GameCode.INCOMPLETE_GAME
+        assert (solution.best_move, solution.depth) == (4, 0)
+
+    def test_time_limit(self) -> None:
+        start = time.perf_counter()
+        solution = DeepeningSolver(Position(7, 6, 4), time_limit=0.05).solve()
+        assert time.perf_counter() - start < 0.5
+        assert solution.status == GameCode.INCOMPLETE_GAME
+        assert solution.depth >= 1
+
+    def test_stops_at_decided_score(self) -> None:
+        board = BitBoard(7, 6, 4, Mock())
+        board.run([4] * 6 + [3] * 4)
+        solver = DeepeningSolver(Position.from_board(board), max_nodes=10**6)
+        solution = solver.solve()
+        assert solution[:3] == (GameCode.PLAYER_1_WIN, 15, 5)
+        assert solution.depth < 5
+
+    @pytest.mark.parametrize(
+        "moves,solution",
+        (
+            ([4, 1, 4, 1, 4, 1], (GameCode.PLAYER_1_WIN, 18, 4)),
+            ([3, 3, 4, 4, 5], (GameCode.PLAYER_1_WIN, -18, 4)),
+        ),
+    )
+    def test_decided_with_next_piece(self, moves: List[int], solution: tuple) -> None:
+        board = BitBoard(7, 6, 4, Mock())
+        board.run(moves)
+        result = DeepeningSolver(Position.from_board(board), max_nodes=1).solve()
+        assert result[:3] == solution
+
+
+class TestParallelSolver:
+    @pytest.mark.parametrize("workers,plies", ((1, 1), (1, 2), (1, 3), (2, None)))
+    @pytest.mark.parametrize(
+        "width,height,winning_moves,moves",
+        (
+            (4, 4, 3, []),
+            (5, 4, 4, [3, 3, 2, 4]),
+            (7, 6, 4, [4] * 6 + [3] * 4),
+            (7, 6, 4, [7, 5, 6, 4, 5, 7, 4, 5, 2, 6, 4, 6, 4, 7, 2, 4]),
+            (7, 6, 4, [3, 3, 4, 4, 5]),
+        ),
+    )
+    def test_matches_solver(
+        self,
+        width: int,
+        height: int,
+        winning_moves: int,
+        moves: List[int],
+        workers: int,
+        plies: Optional[int],
+    ) -> None:
+        board = BitBoard(width, height, winning_moves, Mock())
+        board.run(moves)
+        expected = Solver(Position.from_board(board)).solve()
+        solution = ParallelSolver(Position.from_board(board), workers, plies).solve()
+        assert solution[:2] == expected[:2]
+
+        # The best move keeps the score, unless it wins the game
+        position = Position.from_board(board)
+        position.play(solution.best_move - 1)
+        if solution.score != position.get_win_score() + 1:
+            assert -Solver(position).get_score() == solution.score
+
+    @pytest.mark.parametrize(
+        "plies,expected",
+        (
+            (1, [(1,), (2,), (0,), (3,)]),
+            # Player 2 has one move to block player 1 after most moves
+            (2, [(1, 1), (2, 3), (0, 1), (0, 2), (0, 0), (0, 3), (3, 2)]),
+        ),
+    )
+    def test_get_subproblems(self, plies: int, expected: List[tuple]) -> None:
+        board = BitBoard(4, 4, 3, Mock())
+        board.run([2, 1])
+        solver = ParallelSolver(Position.from_board(board), 1, plies)
+        assert solver.get_subproblems() == expected
+
+    @pytest.mark.parametrize(
+        "width,workers,plies", ((7, 1, 1), (7, 7, 1), (7, 8, 2), (7, 32, 2), (4, 32, 3))
+    )
+    def test_get_split_plies(self, width: int, workers: int, plies: int) -> None:
+        assert get_split_plies(width, workers) == plies
+
+
+@pytest.mark.parametrize(
+    "path,middle,above",
+    (
+        # Player 1 wins with a score of 4 on an empty board
+        ((), 3, True),
+        ((), 4, False),
+        # Player 1 gets a score of 4 after the second column
+        ((1,), 3, True),
+        ((1,), 4, False),
+        # Player 1 only gets a score of 1 after the first column
+        ((0,), 0, True),
+        ((0,), 1, False),
+        ((0, 1), 3, True),
+    ),
+)
+def test_search_subproblem(path: tuple, middle: int, above: bool) -> None:
+    position = Position(4, 4, 3)
+    current_iteration = multiprocessing.Value("i", 0)
+    score, nodes = search_subproblem(
+        position, path, middle, 0, current_iteration, TranspositionTable(1000)
+    )
+    assert (score > middle) == above
+    assert nodes
+    # The position is left as it was
+    assert (position.mask, position.hash) == (0, 0)
+
+
+def test_search_subproblem_stopped() -> None:
+    # The parallel search has moved on to the next iteration
+    current_iteration = multiprocessing.Value("i", 1)
+    result = search_subproblem(
+        Position(4, 4, 3), (1,), 3, 0, current_iteration, TranspositionTable(1000)
+    )
+    assert result == (None, 0)
+
+
+@pytest.mark.parametrize(
+    "width,height,winning_moves,moves,solution",
+    (
+        (4, 4, 3, [], Solution(GameCode.PLAYER_1_WIN, 4, 2)),
+        # Player 1 wins with the next piece
+        (7, 6, 4, [4, 1, 4, 1, 4, 1], Solution(GameCode.PLAYER_1_WIN, 18, 4)),
+        # Player 2 can't stop both ends of the line
+        (7, 6, 4, [3, 3, 4, 4, 5], Solution(GameCode.PLAYER_1_WIN, -18, 4)),
+        (7, 6, 4, [4] * 6 + [3] * 4, Solution(GameCode.PLAYER_1_WIN, 15, 5)),
+        (3, 3, 3, [], Solution(GameCode.DRAW, 0, 2)),
+        (7, 6, 4, [4, 1, 4, 1, 4, 1, 4], Solution(GameCode.PLAYER_1_WIN)),
+        (7, 6, 4, [8], Solution(GameCode.ILLEGAL_COLUMN)),
+        (7, 6, 4, [1, None], Solution(GameCode.ILLEGAL_FILE)),
+        (2, 2, 3, [], Solution(GameCode.ILLEGAL_GAME)),
+    ),
+)
+@pytest.mark.parametrize("max_nodes", (None, 10**6))
+def test_solve(
+    width: int,
+    height: int,
+    winning_moves: int,
+    moves: List[Optional[int]],
+    solution: Solution,
+    max_nodes: Optional[int],
+) -> None:
+    result = solve(width, height, winning_moves, moves, max_nodes=max_nodes)
+    assert result[:3] == solution[:3]
+
+
+@pytest.mark.parametrize(
+    "moves,solution",
+    (
+        ([4] * 6 + [3] * 4, Solution(GameCode.PLAYER_1_WIN, 15, 5)),
+        ([4, 1, 4, 1, 4, 1], Solution(GameCode.PLAYER_1_WIN, 18, 4)),
+    ),
+)
+def test_solve_workers(moves: List[int], solution: Solution) -> None:
+    assert solve(7, 6, 4, moves, workers=2)[:3] == solution[:3]
+
+
+@pytest.mark.parametrize(
+    "content,status,best_move",
+    (
+        ("4 4 3\n", GameCode.PLAYER_1_WIN, 2),
+        ("4 4 3\n2\nx\n", GameCode.ILLEGAL_FILE, None),
+        ("4 4\n", GameCode.ILLEGAL_FILE, None),
+        ("", GameCode.ILLEGAL_FILE, None),
+    ),
+)
+def test_solve_game(content: str, status: GameCode, best_move: int) -> None:
+    solution = solve_game(io.StringIO(content))
+    assert (solution.status, solution.best_move) == (status, best_move)
@@ -0,0 +1,129 @@
+import io
+import tracemalloc
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+
+from game_solver.bitboard import BitBoard
+from game_solver.config import GameCode
+from game_solver.game import Game, GameError
+from game_solver.sparse import SparseBoard
+
+
+class TestSparseBoard:
+    @pytest.fixture
+    def sparse_board(self) -> SparseBoard:
+        return SparseBoard(3, 4, 3, Mock())
+
+    def test_init(self, sparse_board: SparseBoard) -> None:
+        assert sparse_board.pieces == {}
+        assert sparse_board.heights == {}
+
+    def test_add_piece(self, sparse_board: SparseBoard) -> None:
+        for move in (1, 2, 1):
+            sparse_board.add_piece(move)
+        assert sparse_board.pieces == {(0, 0): 1, (1, 0): 2, (0, 1): 1}
+        assert sparse_board.heights == {0: 2, 1: 1}
+
+    def test_add_piece_illegal_row(self, sparse_board: SparseBoard) -> None:
+        for _ in range(4):
+            sparse_board.add_piece(1)
+
+        with pytest.raises(GameError) as exc:
+            sparse_board.add_piece(1)
+
+        assert int(str(exc.value)) == 5
+
+    def test_legal_moves(self, sparse_board: SparseBoard) -> None:
+        for _ in range(4):
+            sparse_board.add_piece(2)
+        assert sparse_board.legal_moves() == [1, 3]
+
+    @pytest.mark.parametrize(
+        "column_step,row_step,count", ((1, 0, 0), (-1, -1, 1), (0, -1, 1))
+    )
+    def test_count_pieces(
+        self, column_step: int, row_step: int, count: int, sparse_board: SparseBoard
+    ) -> None:
+        sparse_board.pieces = {(0, 0): 1, (1, 0): 1, (2, 0): 2, (1, 1): 1}
+        sparse_board.current_player = 1
+        sparse_board.current_column, sparse_board.current_row = 1, 1
+        assert sparse_board.count_pieces(column_step, row_step) == count
+
+    @pytest.mark.parametrize(
+        "width,height,winning_moves,moves,winner",
+        [
+            (3, 4, 3, [1, 2, 1, 2, 1], 1),
+            (4, 4, 3, [1, 1, 2, 2, 4, 3], None),
+            (4, 4, 3, [1, 1, 2, 2, 3], 1),
+            (4, 4, 3, [1, 2, 2, 3, 4, 3, 3], 1),
+            (4, 4, 3, [3, 2, 2, 1, 4, 1, 1], 1),
+            (4, 4, 3, [1, 2, 3, 1, 2, 3], None),
+            (4, 4, 4, [1, 2, 1, 2, 1, 2], None),
+            (1, 5, 5, [1, 1, 1, 1, 1], None),
+            (5, 1, 3, [1, 2, 3, 4, 5], None),
+            (5, 1, 1, [3], 1),
+        ],
+    )
+    def test_check_for_wins(
+        self,
+        width: int,
+        height: int,
+        winning_moves: int,
+        moves: List[int],
+        winner: int,
+    ) -> None:
+        sparse_board = SparseBoard(width, height, winning_moves, Mock())
+        for move in moves:
+            sparse_board.make_move(move)
+
+        assert sparse_board.winner == winner
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_bitboard(self, seed: int) -> None:
+        width, height, winning_moves = 9, 7, 4
+        # A simple deterministic sequence of moves that fills the board
+        moves = [(seed * 7 + turn * (seed + 3)) % width + 1 for turn in range(200)]
+
+        boards = [
+            cls(width, height, winning_moves, Mock()) for cls in (BitBoard, SparseBoard)
+        ]
+        for board in boards:
+            for move in moves:
+                if board.winner is not None:
+                    break
+                if board.heights[move - 1] < height:
+                    board.make_move(move)
+
+        assert boards[0].winner == boards[1].winner
+        assert boards[0].total_moves == boards[1].total_moves
+
+    def test_huge_board(self) -> None:
+        # 10^10 cells, which only fit on a sparse board
+        moves = [50000, 1, 50001, 1, 50002, 1, 50003, 1, 50004]
+        text = "100000 100000 5\n" + "".join(f"{move}\n" for move in moves)
+        game = Game(io.StringIO(text))
+
+        board = game.setup()
+        assert isinstance(board, SparseBoard)
+        assert board.run() == GameCode.PLAYER_1_WIN
+        assert len(board.pieces) == len(moves)
+
+    def test_huge_board_memory(self) -> None:
+        # Nothing the size of the board is allocated
+        moves = [(index * 7919) % 50_000_000 + 1 for index in range(100)]
+        text = "50000000 3 4\n" + "".join(f"{move}\n" for move in moves)
+        tracemalloc.start()
+        try:
+            status = Game(io.StringIO(text)).play()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert status == GameCode.INCOMPLETE_GAME
+        assert peak < 10**6
+
+    def test_huge_board_incomplete(self) -> None:
+        text = "100000 100000 5\n1\n2\n"
+        assert Game(io.StringIO(text)).play() == GameCode.INCOMPLETE_GAME
@@ -0,0 +1,87 @@
+from typing import List, Optional, Set, Tuple
+
+import pytest
+
+from game_solver.threats import ThreatTracker
+
+
+def play(tracker: ThreatTracker, moves: List[int]) -> int:
+    """Play the moves (counted from 1) and get the player that moved last"""
+    player = 2
+    for move in moves:
+        player = 3 - player
+        column = move - 1
+        tracker.add_piece(column, tracker.heights[column], player)
+    return player
+
+
+class TestThreatTracker:
+    @pytest.fixture
+    def tracker(self) -> ThreatTracker:
+        return ThreatTracker(7, 6, 4)
+
+    @pytest.mark.parametrize(
+        "moves,threats,playable",
+        (
+            ([], set(), set()),
+            # Three in a column, with the cell above it free
+            ([1, 2, 1, 2, 1], {(0, 3)}, {(0, 3)}),
+            # Both ends of three in a row on the bottom
+            ([4, 4, 3, 3, 5], {(1, 0), (5, 0)}, {(1, 0), (5, 0)}),
+            # The gap in a row, above an empty cell
+            ([7, 1, 1, 2, 2, 4, 4], {(2, 1)}, set()),
+            # Threats of the other player are filled by the piece
+            ([4, 4, 3, 3, 5, 2], {(5, 0)}, {(5, 0)}),
+        ),
+    )
+    def test_threats(
+        self,
+        tracker: ThreatTracker,
+        moves: List[int],
+        threats: Set[Tuple[int, int]],
+        playable: Set[Tuple[int, int]],
+    ) -> None:
+        play(tracker, moves)
+        assert tracker.threats[1] == threats
+        assert tracker.playable[1] == playable
+
+    def test_playable_once_column_is_up_to_it(self, tracker: ThreatTracker) -> None:
+        play(tracker, [7, 1, 1, 2, 2, 4, 4])
+        assert tracker.playable[1] == set()
+        play(tracker, [6, 3])
+        assert tracker.playable[1] == {(2, 1)}
+
+    @pytest.mark.parametrize(
+        "moves,winner",
+        (
+            ([], None),
+            # A single threat can be blocked
+            ([1, 2, 1, 2, 1], None),
+            # Two threats, only one of which can be blocked
+            ([4, 4, 3, 3, 5], 1),
+            # Player 2 didn't block, so player 1 wins with the next piece
+            ([1, 2, 1, 2, 1, 7], 1),
+            # Player 2 wins first with their own playable threat
+            ([1, 2, 3, 2, 3, 2, 5, 7, 4], 2),
+        ),
+    )
+    def test_get_forced_winner(
+        self, tracker: ThreatTracker, moves: List[int], winner: Optional[int]
+    ) -> None:
+        player = play(tracker, moves)
+        assert tracker.get_forced_winner(player) == winner
+
+    def test_get_forced_winner_stacked(self) -> None:
+        tracker = ThreatTracker(4, 4, 3)
+        # Player 1 has threats at the bottom and second cell of the second
+        # column, so blocking the first one lets them win with the second
+        player = play(tracker, [3, 4, 1, 1, 1])
+        assert tracker.threats[1] == {(1, 0), (1, 1)}
+        assert tracker.playable[1] == {(1, 0)}
+        assert tracker.get_forced_winner(player) == 1
+
+    def test_huge_board(self) -> None:
+        tracker = ThreatTracker(10**9, 10**9, 3)
+        play(tracker, [10**8, 10**8, 10**8 + 1])
+        assert tracker.threats[1] == {(10**8 - 2, 0), (10**8 + 1, 0)}
+        assert len(tracker.pieces) == 3
@@ -0,0 +1,120 @@
+import pytest
+
+from game_solver.transposition import (
+    EXACT,
+    LOWER,
+    NO_MOVE,
+    UPPER,
+    TranspositionTable,
+    get_zobrist_keys,
+)
+
+
+def test_get_zobrist_keys() -> None:
+    keys = get_zobrist_keys(49)
+    assert keys == get_zobrist_keys(49)
+    assert [len(player_keys) for player_keys in keys] == [49, 49]
+    assert len(set(keys[0] + keys[1])) == 98
+    assert all(0 <= key < 2**64 for key in keys[0] + keys[1])
+
+
+class TestTranspositionTable:
+    @pytest.fixture
+    def table(self) -> TranspositionTable:
+        # 15 bytes per entry, so 1000 bytes hold 66 entries, rounded down to 64
+        return TranspositionTable(1000)
+
+    def test_init(self, table: TranspositionTable) -> None:
+        assert table.entry_size == 15
+        assert table.size == 64
+        assert table.memory == 960
+        assert len(table.keys) == len(table.moves) == 64
+        assert table.hits == table.misses == table.stores == 0
+
+    @pytest.mark.parametrize("memory", (0, 1, 15, 29))
+    def test_init_small(self, memory: int) -> None:
+        assert TranspositionTable(memory).size == 1
+
+    def test_get_missing(self, table: TranspositionTable) -> None:
+        assert table.get(5) is None
+        assert table.misses == 1
+        assert table.hit_rate == 0
+
+    def test_put_get(self, table: TranspositionTable) -> None:
+        table.put(5, 10, LOWER, -3, 2)
+        assert table.get(5) == (10, LOWER, -3, 2)
+        assert table.get(5 + 64) is None
+        assert (table.hits, table.misses, table.stores) == (1, 1, 1)
+        assert table.hit_rate == 0.5
+
+    def test_put_same_position(self, table: TranspositionTable) -> None:
+        table.put(5, 10, LOWER, -3, 2)
+        table.put(5, 10, EXACT, 1, NO_MOVE)
+        assert table.get(5) == (10, EXACT, 1, NO_MOVE)
+        assert table.replaced == table.rejected == 0
+
+    @pytest.mark.parametrize(
+        "depth,expected",
+        ((9, (10, LOWER, -3, 2)), (11, (11, EXACT, 1, NO_MOVE))),
+    )
+    def test_put_same_position_depth_preferred(
+        self, depth: int, expected: tuple, table: TranspositionTable
+    ) -> None:
+        table.put(5, 10, LOWER, -3, 2)
+        table.put(5, depth, EXACT, 1, NO_MOVE)
+        assert table.get(5) == expected
+        assert table.replaced == 0
+        assert table.rejected == (depth < 10)
+
+    @pytest.mark.parametrize(
+        "depth,score,move",
+        (
+            (2**16, 0, 0),
+            (-1, 0, 0),
+            (10, 2**15, 0),
+            (10, -(2**15) - 1, 0),
+            (10, 0, 2**15),
+        ),
+    )
+    def test_put_too_large(
+        self, depth: int, score: int, move: int, table: TranspositionTable
+    ) -> None:
+        with pytest.raises(ValueError, match="too large for the transposition table"):
+            table.put(5, depth, EXACT, score, move)
+        assert table.get(5) is None
+        assert table.stores == 0
+
+    def test_put_largest(self, table: TranspositionTable) -> None:
+        table.put(5, 2**16 - 1, EXACT, -(2**15), 2**15 - 1)
+        assert table.get(5) == (2**16 - 1, EXACT, -(2**15), 2**15 - 1)
+
+    @pytest.mark.parametrize(
+        "depth,expected,replaced,rejected",
+        (
+            (9, (10, LOWER, -3, 2), 0, 1),
+            (10, (10, UPPER, 4, 1), 1, 0),
+            (11, (11, UPPER, 4, 1), 1, 0),
+        ),
+    )
+    def test_put_depth_preferred(
+        self,
+        depth: int,
+        expected: tuple,
+        replaced: int,
+        rejected: int,
+        table: TranspositionTable,
+    ) -> None:
+        table.put(5, 10, LOWER, -3, 2)
+        # Both hashes go to the same entry
+        table.put(5 + 64, depth, UPPER, 4, 1)
+
+        key = 5 if expected[1] == LOWER else 5 + 64
+        assert table.get(key) == expected
+        assert (table.replaced, table.rejected) == (replaced, rejected)
+
+    def test_report(self, table: TranspositionTable) -> None:
+        table.put(5, 10, LOWER, -3, 2)
+        table.get(5)
+        assert table.report() == (
+            "Table: 1 hits, 0 misses (100% hit rate), 1 stores, 0 replaced, 0 rejected"
+        )
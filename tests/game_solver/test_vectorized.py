@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from check_game import start_checking
+from game_solver import vectorized
+from game_solver.binary import (
+    check_binary_archive_lockstep,
+    convert_text_games,
+    play_binary_game,
+)
+from game_solver.bitboard import BitBoard
+from game_solver.config import GameCode
+from game_solver.vectorized import (
+    check_lockstep,
+    check_lockstep_stream,
+    chunked,
+    get_batch_size,
+)
+
+np = pytest.importorskip("numpy")
+
+BASE_TEST_DIR = Path(__file__).resolve().parents[1] / "sample_games"
+
+GAMES = [
+    [1, 2, 1, 2, 1],
+    [1, 2, 1, 2, 3, 2, 3],
+    [1, 2, 2, 3, 3, 1, 3],
+    [3, 2, 2, 1, 1, 3, 1],
+    [1, 2, 1, 3, 2, 3, 2, 1, 3],
+    [1, 2, 1, 2, 1, 3],
+    [1, 2, 1, 2, 1, 0],
+    [1, 2, 0],
+    [1, 1, 1, 1],
+    [1, 2, 4],
+    [1],
+    [],
+]
+
+
+def test_check_lockstep() -> None:
+    statuses = check_lockstep(3, 3, 3, GAMES)
+    expected = [
+        play_binary_game(3, 3, 3, memoryview(bytes(moves)), BitBoard) for moves in GAMES
+    ]
+    assert statuses.tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "width,height,winning_moves,status",
+    ((3, 3, 4, GameCode.ILLEGAL_GAME), (3, 0, 3, GameCode.ILLEGAL_FILE)),
+)
+def test_check_lockstep_invalid_setup(
+    width: int, height: int, winning_moves: int, status: GameCode
+) -> None:
+    statuses = check_lockstep(width, height, winning_moves, GAMES)
+    assert statuses.tolist() == [status] * len(GAMES)
+
+
+def test_check_lockstep_random_games() -> None:
+    rng = np.random.default_rng(0)
+    games = [rng.integers(1, 8, size=rng.integers(0, 43)).tolist() for _ in range(500)]
+    statuses = check_lockstep(7, 6, 4, games)
+    expected = [
+        play_binary_game(7, 6, 4, memoryview(bytes(moves)), BitBoard) for moves in games
+    ]
+    assert statuses.tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "size,expected", ((2, [[1, 2], [3, 4], [5]]), (5, [[1, 2, 3, 4, 5]]))
+)
+def test_chunked(size: int, expected: List[List[int]]) -> None:
+    assert list(chunked([1, 2, 3, 4, 5], size)) == expected
+
+
+def test_check_lockstep_stream() -> None:
+    games = [(3, 3, 3, moves) for moves in GAMES[:3]] + [(3, 3, 4, [])]
+    games += [(3, 3, 3, moves) for moves in GAMES[3:]]
+    statuses = list(check_lockstep_stream(games, batch_size=2))
+    expected = [
+        play_binary_game(*game[:3], memoryview(bytes(game[3])), BitBoard)
+        for game in games
+    ]
+    assert statuses == expected
+
+
+@pytest.mark.parametrize(
+    "width,height,batch_size,batch_cells,expected",
+    (
+        (7, 6, 65536, 2**24, 65536),
+        (1000, 1000, 65536, 2**24, 16),
+        (5000, 5000, 65536, 2**24, 1),
+        (3, 3, 10, 18, 2),
+        (3, 3, 10, 8, 1),
+    ),
+)
+def test_get_batch_size(
+    width: int, height: int, batch_size: int, batch_cells: int, expected: int
+) -> None:
+    assert get_batch_size(width, height, batch_size, batch_cells) == expected
+
+
+def test_check_lockstep_stream_batch_cells() -> None:
+    games = [(3, 3, 3, moves) for moves in GAMES]
+    with patch.object(
+        vectorized, "check_lockstep", wraps=vectorized.check_lockstep
+    ) as mock_check_lockstep:
+        statuses = list(check_lockstep_stream(games, batch_size=4, batch_cells=18))
+
+    assert [len(call.args[3]) for call in mock_check_lockstep.call_args_list] == [2] * (
+        len(GAMES) // 2
+    ) + [1] * (len(GAMES) % 2)
+    assert statuses == list(check_lockstep_stream(games))
+
+
+def test_check_binary_archive_lockstep(tmp_path: Path) -> None:
+    archive = tmp_path / "games.c4b"
+    files = sorted(file for file in BASE_TEST_DIR.rglob("*") if file.is_file())
+    skipped = convert_text_games(files, archive)
+
+    assert list(check_binary_archive_lockstep(archive)) == [
+        start_checking(file) for file in files if file not in skipped
+    ]
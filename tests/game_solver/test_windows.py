@@ -0,0 +1,70 @@
+import pytest
+
+from game_solver.windows import WindowCounter, count_windows, get_offsets
+
+
+@pytest.mark.parametrize(
+    "width,height,winning_moves,total",
+    (
+        # 24 horizontal, 21 vertical and 12 on each diagonal
+        (7, 6, 4, 69),
+        (3, 1, 3, 1),
+        (1, 5, 3, 3),
+        (2, 2, 1, 16),
+        (10**6, 10**6, 4, 2 * 10**6 * (10**6 - 3) + 2 * (10**6 - 3) ** 2),
+    ),
+)
+def test_count_windows(width: int, height: int, winning_moves: int, total: int) -> None:
+    assert count_windows(width, height, winning_moves) == total
+
+
+@pytest.mark.parametrize(
+    "position,step,offsets",
+    (
+        (0, 0, (0, 3)),
+        (0, 1, (0, 0)),
+        (2, 1, (0, 2)),
+        (6, 1, (3, 3)),
+        (0, -1, (3, 3)),
+        (5, -1, (0, 1)),
+    ),
+)
+def test_get_offsets(position: int, step: int, offsets: tuple) -> None:
+    assert get_offsets(position, step, 7, 3) == offsets
+
+
+class TestWindowCounter:
+    @pytest.fixture
+    def counter(self) -> WindowCounter:
+        return WindowCounter(7, 6, 4)
+
+    def test_init(self, counter: WindowCounter) -> None:
+        assert counter.open_windows == [69, 69]
+        assert not counter.no_win_possible
+
+    def test_add_piece(self, counter: WindowCounter) -> None:
+        # A corner cell is in one window of every direction but one
+        counter.add_piece(0, 0, 1)
+        assert counter.open_windows == [69, 66]
+
+        # Windows are only closed once for each player
+        counter.add_piece(1, 0, 1)
+        assert counter.open_windows == [69, 63]
+        # Both vertical windows through the cell close for player 1
+        counter.add_piece(0, 1, 2)
+        assert counter.open_windows == [65, 63]
+
+    def test_no_win_possible(self) -> None:
+        counter = WindowCounter(3, 1, 3)
+        counter.add_piece(0, 0, 1)
+        assert counter.open_windows == [1, 0]
+        counter.add_piece(2, 0, 2)
+        assert counter.no_win_possible
+
+    def test_huge_board(self) -> None:
+        counter = WindowCounter(10**9, 10**9, 4)
+        counter.add_piece(500, 0, 1)
+        # Only the windows with pieces are kept: one vertical window,
+        # four horizontal windows and one on each diagonal
+        assert sum(map(len, counter.windows)) == 7
+        assert counter.open_windows[0] - counter.open_windows[1] == 7
@@ -1,11 +1,28 @@
+import io
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from check_game import ArgParser, main, start_checking
-from game_solver.config import GameCode
+from check_game import (
+    ArgParser,
+    check_file,
+    main,
+    start_batch,
+    start_checking,
+    start_container,
+    start_conversion,
+    start_following,
+    start_solving,
+)
+from game_solver.book import build_book
+from game_solver.cache import ResultCache
+from game_solver.config import ENGINE_NAMES, GAME_OUTPUT_MESSAGES, GameCode
+from game_solver.container import check_container
+from game_solver.engines import get_engine
+from game_solver.game import GameBoard
+from game_solver.snapshot import SnapshotStore, get_digest
 
 BASE_TEST_DIR = Path(__file__).resolve().parent / "sample_games"
 
@@ -25,6 +42,12 @@ def test_start_checking(status: str, file: Path) -> None:
     assert start_checking(file) == status
 
 
+@pytest.mark.parametrize("engine_name", ENGINE_NAMES)
+@pytest.mark.parametrize("status,file", get_files())
+def test_start_checking_engine(status: str, file: Path, engine_name: str) -> None:
+    assert start_checking(file, get_engine(engine_name)) == status
+
+
 def test_start_checking_file_doesnt_exist() -> None:
     missing_file = BASE_TEST_DIR / "I_don't_exist.txt"
     assert not missing_file.exists()
@@ -32,22 +55,656 @@ def test_start_checking_file_doesnt_exist() -> None:
     assert not missing_file.exists()
 
 
-@patch("check_game.start_checking")
+@patch.object(ArgParser, "get_threats", return_value=False)
+@patch.object(ArgParser, "get_stop_early", return_value=False)
+@patch.object(ArgParser, "get_open_windows", return_value=False)
+@patch("check_game.check_file")
 @patch("check_game.show_summary")
+@patch.object(ArgParser, "get_solve", return_value=False)
+@patch.object(ArgParser, "get_snapshot_path", return_value=None)
+@patch.object(ArgParser, "get_cache_path", return_value=None)
+@patch.object(ArgParser, "get_follow_patterns", return_value=None)
+@patch.object(ArgParser, "get_serve_address", return_value=None)
+@patch.object(ArgParser, "get_container", return_value=None)
+@patch.object(ArgParser, "get_batch_patterns", return_value=None)
+@patch.object(ArgParser, "get_engine_name", return_value="default")
 @patch.object(ArgParser, "get_path")
+@patch.object(ArgParser, "get_profile", return_value=False)
 @patch.object(ArgParser, "__init__", return_value=None)
 def test_main(
     mock_init: MagicMock,
+    mock_get_profile: MagicMock,
     mock_get_path: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_container: MagicMock,
+    mock_get_serve_address: MagicMock,
+    mock_get_follow_patterns: MagicMock,
+    mock_get_cache_path: MagicMock,
+    mock_get_snapshot_path: MagicMock,
+    mock_get_solve: MagicMock,
     mock_show_summary: MagicMock,
-    mock_start_checking: MagicMock,
+    mock_check_file: MagicMock,
+    mock_get_open_windows: MagicMock,
+    mock_get_stop_early: MagicMock,
+    mock_get_threats: MagicMock,
 ) -> None:
     status = GameCode.INCOMPLETE_GAME
     filename = Path("some_path")
     mock_get_path.return_value = filename
-    mock_start_checking.return_value = status
+    mock_check_file.return_value = status, None, None, None
+
+    main()
+
+    mock_check_file.assert_called_once_with(
+        filename, GameBoard, None, False, False, False, None
+    )
+    mock_show_summary.assert_called_once_with(status, None, None, None)
+
+
+@pytest.mark.parametrize("engine_name", ENGINE_NAMES)
+@pytest.mark.parametrize(
+    "content,expected",
+    (
+        ("7 6 4\n1\n2\nx\n", (GameCode.ILLEGAL_FILE, 4, None, None)),
+        ("7 6 4\n0\n", (GameCode.ILLEGAL_FILE, 2, None, None)),
+        ("7 6 4\n1\n2\n", (GameCode.INCOMPLETE_GAME, None, None, None)),
+        ("7 6\n1\n", (GameCode.ILLEGAL_FILE, None, None, None)),
+    ),
+)
+def test_check_file(
+    content: str,
+    expected: Tuple[GameCode, Optional[int], Optional[int], None],
+    engine_name: str,
+    tmp_path: Path,
+) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text(content)
+    assert check_file(file, get_engine(engine_name)) == expected
+
+
+def test_check_file_cache(tmp_path: Path) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text("7 6 4\n1\nx\n")
+    with ResultCache(tmp_path / "results.db") as cache:
+        assert check_file(file, cache=cache) == (
+            GameCode.ILLEGAL_FILE,
+            None,
+            None,
+            None,
+        )
+
+
+def test_check_file_doesnt_exist() -> None:
+    missing_file = BASE_TEST_DIR / "I_don't_exist.txt"
+    assert check_file(missing_file) == (GameCode.FILE_ERROR, None, None, None)
+
+
+@pytest.mark.parametrize("engine_name", ENGINE_NAMES)
+@pytest.mark.parametrize(
+    "content,stop_early,expected",
+    (
+        # The only line on the board has pieces of both players
+        ("3 1 3\n1\n2\n", False, (GameCode.INCOMPLETE_GAME, None, 2, None)),
+        ("3 1 3\n1\n2\n", True, (GameCode.DRAW, None, 2, None)),
+        ("3 1 3\n1\n2\n3\n", False, (GameCode.DRAW, None, 2, None)),
+        # Later moves are not checked once the game is stopped
+        ("3 1 3\n1\n2\nx\n", False, (GameCode.ILLEGAL_FILE, 4, 2, None)),
+        ("3 1 3\n1\n2\nx\n", True, (GameCode.DRAW, None, 2, None)),
+        ("7 6 4\n1\n2\n", False, (GameCode.INCOMPLETE_GAME, None, None, None)),
+    ),
+)
+def test_check_file_open_windows(
+    content: str,
+    stop_early: bool,
+    expected: Tuple[GameCode, Optional[int], Optional[int], None],
+    engine_name: str,
+    tmp_path: Path,
+) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text(content)
+    engine = get_engine(engine_name)
+    assert check_file(file, engine, None, True, stop_early) == expected
+
+
+@pytest.mark.parametrize("engine_name", ENGINE_NAMES)
+@pytest.mark.parametrize(
+    "content,expected",
+    (
+        # Player 1 threatens both ends of the line on the bottom row
+        ("7 6 4\n4\n4\n3\n3\n5\n", (GameCode.INCOMPLETE_GAME, None, None, (1, 5))),
+        ("7 6 4\n4\n4\n3\n3\n5\n1\n6\n", (GameCode.PLAYER_1_WIN, None, None, (1, 5))),
+        # Player 2 doesn't block the line, so player 1 wins with the next piece
+        (
+            "7 6 4\n1\n7\n1\n7\n1\n7\n",
+            (GameCode.INCOMPLETE_GAME, None, None, (1, 6)),
+        ),
+        ("7 6 4\n1\n7\n1\n", (GameCode.INCOMPLETE_GAME, None, None, None)),
+    ),
+)
+def test_check_file_threats(
+    content: str,
+    expected: Tuple[GameCode, None, None, Optional[Tuple[int, int]]],
+    engine_name: str,
+    tmp_path: Path,
+) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text(content)
+    engine = get_engine(engine_name)
+    assert check_file(file, engine, None, threats=True) == expected
+
+
+@patch("check_game.start_batch")
+@patch.object(ArgParser, "get_cache_size", return_value=10)
+@patch.object(ArgParser, "get_snapshot_path", return_value=Path("snapshots.db"))
+@patch.object(ArgParser, "get_cache_path", return_value=Path("results.db"))
+@patch.object(ArgParser, "get_follow_patterns", return_value=None)
+@patch.object(ArgParser, "get_serve_address", return_value=None)
+@patch.object(ArgParser, "get_workers", return_value=2)
+@patch.object(ArgParser, "get_conversion_output", return_value=None)
+@patch.object(ArgParser, "get_batch_patterns", return_value=["games/"])
+@patch.object(ArgParser, "get_engine_name", return_value="bitboard")
+@patch.object(ArgParser, "get_profile", return_value=False)
+@patch.object(ArgParser, "__init__", return_value=None)
+def test_main_batch(
+    mock_init: MagicMock,
+    mock_get_profile: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_conversion_output: MagicMock,
+    mock_get_workers: MagicMock,
+    mock_get_serve_address: MagicMock,
+    mock_get_follow_patterns: MagicMock,
+    mock_get_cache_path: MagicMock,
+    mock_get_snapshot_path: MagicMock,
+    mock_get_cache_size: MagicMock,
+    mock_start_batch: MagicMock,
+) -> None:
+    main()
+    patterns, engine, workers, cache, snapshots = mock_start_batch.call_args.args
+    assert (patterns, engine, workers) == (["games/"], get_engine("bitboard"), 2)
+    assert (cache.file, cache.max_size) == (Path("results.db"), 10)
+    assert snapshots.file == Path("snapshots.db")
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_batch(mock_stdout: MagicMock) -> None:
+    start_batch([str(BASE_TEST_DIR / "draw")], GameBoard, 1)
+    output = mock_stdout.getvalue().splitlines()
+
+    assert output[0] == f"{BASE_TEST_DIR / 'draw' / 'draw.txt'}: DRAW"
+    assert output[1] == "DRAW: 1"
+    assert output[2].startswith("Checked 1 games in")
+
+
+@patch("check_game.start_following")
+@patch.object(ArgParser, "get_follow_patterns", return_value=["games/"])
+@patch.object(ArgParser, "get_conversion_output", return_value=None)
+@patch.object(ArgParser, "get_batch_patterns", return_value=None)
+@patch.object(ArgParser, "get_engine_name", return_value="flat")
+@patch.object(ArgParser, "get_profile", return_value=False)
+@patch.object(ArgParser, "__init__", return_value=None)
+def test_main_follow(
+    mock_init: MagicMock,
+    mock_get_profile: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_conversion_output: MagicMock,
+    mock_get_follow_patterns: MagicMock,
+    mock_start_following: MagicMock,
+) -> None:
+    main()
+    mock_start_following.assert_called_once_with(["games/"], get_engine("flat"))
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_following(mock_stdout: MagicMock, tmp_path: Path) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text("7 6 4\n1\n8\n")
+    start_following([str(tmp_path), str(tmp_path / "missing.txt")], GameBoard)
+
+    assert mock_stdout.getvalue().splitlines() == [
+        f"{file}: ILLEGAL_COLUMN after 1 moves",
+        f"{tmp_path / 'missing.txt'}: FILE_ERROR after 0 moves",
+    ]
+
+
+@patch("check_game.GameFollower.follow", side_effect=KeyboardInterrupt)
+def test_start_following_interrupted(mock_follow: MagicMock, tmp_path: Path) -> None:
+    start_following([str(tmp_path)], GameBoard)
+    mock_follow.assert_called_once()
+
+
+@patch("check_game.start_container")
+@patch.object(ArgParser, "get_snapshot_path", return_value=None)
+@patch.object(ArgParser, "get_cache_path", return_value=None)
+@patch.object(ArgParser, "get_follow_patterns", return_value=None)
+@patch.object(ArgParser, "get_serve_address", return_value=None)
+@patch.object(ArgParser, "get_lockstep", return_value=False)
+@patch.object(ArgParser, "get_container", return_value=Path("games.jsonl"))
+@patch.object(ArgParser, "get_batch_patterns", return_value=None)
+@patch.object(ArgParser, "get_engine_name", return_value="default")
+@patch.object(ArgParser, "get_profile", return_value=False)
+@patch.object(ArgParser, "__init__", return_value=None)
+def test_main_container(
+    mock_init: MagicMock,
+    mock_get_profile: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_container: MagicMock,
+    mock_get_lockstep: MagicMock,
+    mock_get_serve_address: MagicMock,
+    mock_get_follow_patterns: MagicMock,
+    mock_get_cache_path: MagicMock,
+    mock_get_snapshot_path: MagicMock,
+    mock_start_container: MagicMock,
+) -> None:
+    main()
+    mock_start_container.assert_called_once_with(Path("games.jsonl"), GameBoard, False)
+
+
+@pytest.mark.parametrize("status,file", get_files())
+def test_start_checking_snapshots(status: str, file: Path, tmp_path: Path) -> None:
+    with SnapshotStore(tmp_path / "snapshots.db") as snapshots:
+        assert start_checking(file, snapshots=snapshots) == status
+        assert start_checking(file, snapshots=snapshots) == status
+
+
+@pytest.mark.parametrize("engine_name", ENGINE_NAMES)
+def test_check_file_snapshots(engine_name: str, tmp_path: Path) -> None:
+    engine = get_engine(engine_name)
+    file = tmp_path / "game.txt"
+    lines = ["7 6 4\n", "4\n4\n", "3\n3\n", "5\n5", "\n", "6\n", "1\n"]
+    with SnapshotStore(tmp_path / "snapshots.db") as snapshots:
+        for end in range(1, len(lines) + 1):
+            file.write_text("".join(lines[:end]))
+            expected = check_file(file, engine)
+            assert check_file(file, engine, snapshots=snapshots) == expected
+
+
+def test_check_file_snapshots_new_moves(tmp_path: Path) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text("7 6 4\n" + "1\n2\n" * 3)
+    with SnapshotStore(tmp_path / "snapshots.db") as snapshots:
+        check_file(file, snapshots=snapshots)
+
+        with file.open(mode="a") as fp:
+            fp.write("3\n")
+        content = file.read_bytes()
+        with patch.object(
+            GameBoard, "play_move", autospec=True, side_effect=GameBoard.play_move
+        ) as mock_play_move:
+            assert check_file(file, snapshots=snapshots)[0] == GameCode.INCOMPLETE_GAME
+        # Only the appended move is played
+        assert mock_play_move.call_count == 1
+        offset, digest, snapshot = snapshots.get(str(file.resolve()))
+        assert (offset, digest) == (len(content), get_digest(content))
+        assert snapshot.heights == {0: 3, 1: 3, 2: 1}
+
+
+@pytest.mark.parametrize(
+    "content,offset,expected",
+    (
+        # The last line may still be written to
+        (
+            "7 6 4\n1\n2\n1\n2\n1\n2\n1",
+            18,
+            (GameCode.PLAYER_1_WIN, None, None, None),
+        ),
+        ("7 6 4\n1\n2\nx\n", 10, (GameCode.ILLEGAL_FILE, 4, None, None)),
+        ("7 6 4\n1\n2\n8\n1\n", 10, (GameCode.ILLEGAL_COLUMN, None, None, None)),
+    ),
+)
+def test_check_file_snapshots_taken(
+    content: str,
+    offset: int,
+    expected: Tuple[GameCode, Optional[int], None, None],
+    tmp_path: Path,
+) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text(content)
+    with SnapshotStore(tmp_path / "snapshots.db") as snapshots:
+        assert check_file(file, snapshots=snapshots) == expected
+        # Snapshots are taken before the last line and the invalid move
+        digest = get_digest(content[:offset].encode())
+        assert snapshots.get(str(file.resolve()))[:2] == (offset, digest)
+        assert check_file(file, snapshots=snapshots) == expected
+
+
+def test_check_file_snapshots_rewritten(tmp_path: Path) -> None:
+    file = tmp_path / "game.txt"
+    with SnapshotStore(tmp_path / "snapshots.db") as snapshots:
+        file.write_text("7 6 4\n1\n2\n1\n2\n1\n2\n")
+        assert check_file(file, snapshots=snapshots)[0] == GameCode.INCOMPLETE_GAME
+        # The game file is rewritten with another game of the same length
+        file.write_text("7 6 4\n1\n2\n3\n2\n1\n2\n1\n")
+        assert check_file(file, snapshots=snapshots)[0] == GameCode.INCOMPLETE_GAME
+        file.write_text("7 6 3\n1\n2\n1\n2\n1\n")
+        assert check_file(file, snapshots=snapshots)[0] == GameCode.PLAYER_1_WIN
+
+
+@pytest.mark.parametrize(
+    "content,status",
+    ((b"7 6\n1\n", GameCode.ILLEGAL_FILE), (b"7 6 4\n1\n\xff\n", GameCode.FILE_ERROR)),
+)
+def test_check_file_snapshots_errors(
+    content: bytes, status: GameCode, tmp_path: Path
+) -> None:
+    file = tmp_path / "game.txt"
+    file.write_bytes(content)
+    with SnapshotStore(tmp_path / "snapshots.db") as snapshots:
+        assert check_file(file, snapshots=snapshots)[0] == status
+        assert check_file(tmp_path / "missing.txt", snapshots=snapshots)[0] == (
+            GameCode.FILE_ERROR
+        )
+        assert len(snapshots) == 0
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_batch_cache(mock_stdout: MagicMock, tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "results.db")
+    start_batch([str(BASE_TEST_DIR / "draw")], GameBoard, 1, cache)
+    start_batch([str(BASE_TEST_DIR / "draw")], GameBoard, 1, cache)
+    output = mock_stdout.getvalue().splitlines()
+
+    assert output[3] == "Cache: 0 hits, 1 misses (0% hit rate)"
+    assert output[7] == "Cache: 1 hits, 0 misses (100% hit rate)"
+
+
+@pytest.mark.parametrize("status,file", get_files())
+def test_start_checking_cache(status: str, file: Path, tmp_path: Path) -> None:
+    with ResultCache(tmp_path / "results.db") as cache:
+        assert start_checking(file, cache=cache) == status
+        assert start_checking(file, cache=cache) == status
+        # File errors are not cached
+        assert cache.hits == int(status != GameCode.FILE_ERROR)
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_container(mock_stdout: MagicMock) -> None:
+    start_container(BASE_TEST_DIR / "draw" / "draw.txt", GameBoard)
+    output = mock_stdout.getvalue().splitlines()
+
+    assert output[:2] == ["1: DRAW", "DRAW: 1"]
+    assert output[2].startswith("Checked 1 games in")
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_container_file_error(mock_stdout: MagicMock) -> None:
+    start_container(BASE_TEST_DIR / "I_don't_exist.txt", GameBoard)
+    output = mock_stdout.getvalue()
+
+    assert output.startswith(GAME_OUTPUT_MESSAGES[GameCode.FILE_ERROR])
+    assert "FILE_ERROR: 1" in output
+
+
+@patch("check_game.start_serving")
+@patch.object(ArgParser, "get_workers", return_value=1)
+@patch.object(ArgParser, "get_follow_patterns", return_value=None)
+@patch.object(ArgParser, "get_serve_address", return_value="127.0.0.1:8765")
+@patch.object(ArgParser, "get_batch_patterns", return_value=None)
+@patch.object(ArgParser, "get_engine_name", return_value="default")
+@patch.object(ArgParser, "get_profile", return_value=False)
+@patch.object(ArgParser, "__init__", return_value=None)
+def test_main_serve(
+    mock_init: MagicMock,
+    mock_get_profile: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_serve_address: MagicMock,
+    mock_get_follow_patterns: MagicMock,
+    mock_get_workers: MagicMock,
+    mock_start_serving: MagicMock,
+) -> None:
+    main()
+    mock_start_serving.assert_called_once_with("127.0.0.1:8765", GameBoard, 1)
+
+
+@patch("check_game.start_conversion")
+@patch.object(ArgParser, "get_conversion_output", return_value=Path("games.c4b"))
+@patch.object(ArgParser, "get_batch_patterns", return_value=["games/"])
+@patch.object(ArgParser, "get_engine_name", return_value="default")
+@patch.object(ArgParser, "get_profile", return_value=False)
+@patch.object(ArgParser, "__init__", return_value=None)
+def test_main_conversion(
+    mock_init: MagicMock,
+    mock_get_profile: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_conversion_output: MagicMock,
+    mock_start_conversion: MagicMock,
+) -> None:
+    main()
+    mock_start_conversion.assert_called_once_with(["games/"], Path("games.c4b"))
+
+
+@patch.object(ArgParser, "get_threats", return_value=False)
+@patch.object(ArgParser, "get_stop_early", return_value=False)
+@patch.object(ArgParser, "get_open_windows", return_value=False)
+@patch("sys.stdout", new_callable=io.StringIO)
+@patch.object(ArgParser, "get_solve", return_value=False)
+@patch.object(ArgParser, "get_snapshot_path", return_value=None)
+@patch.object(ArgParser, "get_cache_path", return_value=None)
+@patch.object(ArgParser, "get_follow_patterns", return_value=None)
+@patch.object(ArgParser, "get_serve_address", return_value=None)
+@patch.object(ArgParser, "get_container", return_value=None)
+@patch.object(ArgParser, "get_batch_patterns", return_value=None)
+@patch.object(ArgParser, "get_path", return_value=BASE_TEST_DIR / "draw" / "draw.txt")
+@patch.object(ArgParser, "get_engine_name", return_value="default")
+@patch.object(ArgParser, "get_profile", return_value=True)
+@patch.object(ArgParser, "__init__", return_value=None)
+def test_main_profile(
+    mock_init: MagicMock,
+    mock_get_profile: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_path: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_container: MagicMock,
+    mock_get_serve_address: MagicMock,
+    mock_get_follow_patterns: MagicMock,
+    mock_get_cache_path: MagicMock,
+    mock_get_snapshot_path: MagicMock,
+    mock_get_solve: MagicMock,
+    mock_stdout: MagicMock,
+    mock_get_open_windows: MagicMock,
+    mock_get_stop_early: MagicMock,
+    mock_get_threats: MagicMock,
+) -> None:
+    main()
+    output = mock_stdout.getvalue().splitlines()
+
+    assert output[0] == GAME_OUTPUT_MESSAGES[GameCode.DRAW]
+    assert output[1].startswith("Phase")
+    assert any(line.startswith("check_for_wins") for line in output)
+
+
+@patch.object(ArgParser, "get_threats", return_value=False)
+@patch.object(ArgParser, "get_stop_early", return_value=False)
+@patch.object(ArgParser, "get_open_windows", return_value=False)
+@patch("sys.stdout", new_callable=io.StringIO)
+@patch.object(ArgParser, "get_solve", return_value=False)
+@patch.object(ArgParser, "get_snapshot_path", return_value=None)
+@patch.object(ArgParser, "get_cache_path", return_value=None)
+@patch.object(ArgParser, "get_follow_patterns", return_value=None)
+@patch.object(ArgParser, "get_serve_address", return_value=None)
+@patch.object(ArgParser, "get_container", return_value=None)
+@patch.object(ArgParser, "get_batch_patterns", return_value=None)
+@patch.object(ArgParser, "get_path")
+@patch.object(ArgParser, "get_engine_name", return_value="default")
+@patch.object(ArgParser, "get_profile", return_value=False)
+@patch.object(ArgParser, "__init__", return_value=None)
+def test_main_invalid_line(
+    mock_init: MagicMock,
+    mock_get_profile: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_path: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_container: MagicMock,
+    mock_get_serve_address: MagicMock,
+    mock_get_follow_patterns: MagicMock,
+    mock_get_cache_path: MagicMock,
+    mock_get_snapshot_path: MagicMock,
+    mock_get_solve: MagicMock,
+    mock_stdout: MagicMock,
+    mock_get_open_windows: MagicMock,
+    mock_get_stop_early: MagicMock,
+    mock_get_threats: MagicMock,
+    tmp_path: Path,
+) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text("7 6 4\n4\n1\n-4\n")
+    mock_get_path.return_value = file
 
     main()
 
-    mock_start_checking.assert_called_once_with(filename)
-    mock_show_summary.assert_called_once_with(status)
+    assert mock_stdout.getvalue().splitlines() == [
+        *GAME_OUTPUT_MESSAGES[GameCode.ILLEGAL_FILE].splitlines(),
+        " >> The first invalid move is on line 4",
+    ]
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+@patch.object(ArgParser, "get_book_path", return_value=None)
+@patch.object(ArgParser, "get_workers", return_value=2)
+@patch.object(ArgParser, "get_time_limit", return_value=None)
+@patch.object(ArgParser, "get_solve", return_value=True)
+@patch.object(ArgParser, "get_snapshot_path", return_value=None)
+@patch.object(ArgParser, "get_cache_path", return_value=None)
+@patch.object(ArgParser, "get_follow_patterns", return_value=None)
+@patch.object(ArgParser, "get_serve_address", return_value=None)
+@patch.object(ArgParser, "get_container", return_value=None)
+@patch.object(ArgParser, "get_batch_patterns", return_value=None)
+@patch.object(ArgParser, "get_path")
+@patch.object(ArgParser, "get_engine_name", return_value="default")
+@patch.object(ArgParser, "get_profile", return_value=False)
+@patch.object(ArgParser, "__init__", return_value=None)
+def test_main_solve(
+    mock_init: MagicMock,
+    mock_get_profile: MagicMock,
+    mock_get_engine_name: MagicMock,
+    mock_get_path: MagicMock,
+    mock_get_batch_patterns: MagicMock,
+    mock_get_container: MagicMock,
+    mock_get_serve_address: MagicMock,
+    mock_get_follow_patterns: MagicMock,
+    mock_get_cache_path: MagicMock,
+    mock_get_snapshot_path: MagicMock,
+    mock_get_solve: MagicMock,
+    mock_get_time_limit: MagicMock,
+    mock_get_workers: MagicMock,
+    mock_get_book_path: MagicMock,
+    mock_stdout: MagicMock,
+    tmp_path: Path,
+) -> None:
+    # Player 1 wins by playing in the fourth column
+    file = tmp_path / "game.txt"
+    file.write_text("7 6 4\n4\n1\n4\n1\n4\n1\n")
+    mock_get_path.return_value = file
+
+    main()
+
+    assert mock_stdout.getvalue().splitlines() == [
+        "Solution: Player 1 win with perfect play",
+        "Best move: 4 (score 18)",
+    ]
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    (
+        ("7 6 4\n1\n8\n", GAME_OUTPUT_MESSAGES[GameCode.ILLEGAL_COLUMN]),
+        ("7 6 4\n1\n1\n2\n2\n3\n3\n4\n", GAME_OUTPUT_MESSAGES[GameCode.PLAYER_1_WIN]),
+        (
+            "7 6 4\n" + "4\n" * 6 + "3\n" * 4,
+            "Solution: Player 1 win with perfect play\nBest move: 5 (score 15)",
+        ),
+    ),
+)
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_solving(
+    mock_stdout: MagicMock, content: str, expected: str, tmp_path: Path
+) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text(content)
+    start_solving(file)
+    assert mock_stdout.getvalue().strip() == expected
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    (
+        # Nobody can win within the moves searched in time
+        ("7 6 4\n", ["Solution: Undecided within", "Best move: 4 (score 0)"]),
+        (
+            "7 6 4\n" + "4\n" * 6 + "3\n" * 4,
+            ["Solution: Player 1 win with perfect play", "Best move: 5 (score 15)"],
+        ),
+    ),
+)
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_solving_time_limit(
+    mock_stdout: MagicMock, content: str, expected: List[str], tmp_path: Path
+) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text(content)
+    start_solving(file, time_limit=0.05)
+
+    output = mock_stdout.getvalue().splitlines()
+    assert len(output) == 2
+    assert output[0].startswith(expected[0])
+    assert output[1] == expected[1]
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_solving_workers(mock_stdout: MagicMock, tmp_path: Path) -> None:
+    file = tmp_path / "game.txt"
+    file.write_text("7 6 4\n" + "4\n" * 6 + "3\n" * 4)
+    start_solving(file, workers=2)
+    assert mock_stdout.getvalue().splitlines() == [
+        "Solution: Player 1 win with perfect play",
+        "Best move: 5 (score 15)",
+    ]
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_solving_book(mock_stdout: MagicMock, tmp_path: Path) -> None:
+    book_file = tmp_path / "book.c4ob"
+    build_book(4, 4, 3, 2, book_file)
+    file = tmp_path / "game.txt"
+    file.write_text("4 4 3\n2\n")
+    start_solving(file, book_file=book_file)
+    assert mock_stdout.getvalue().splitlines() == [
+        "Solution: Player 1 win with perfect play",
+        "Best move: 3 (score -4)",
+    ]
+
+
+@pytest.mark.parametrize("content", ("", "C4OB"))
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_solving_book_error(
+    mock_stdout: MagicMock, content: str, tmp_path: Path
+) -> None:
+    book_file = tmp_path / "book.c4ob"
+    book_file.write_text(content)
+    start_solving(BASE_TEST_DIR / "draw" / "draw.txt", book_file=book_file)
+    assert mock_stdout.getvalue().strip() == GAME_OUTPUT_MESSAGES[GameCode.FILE_ERROR]
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_solving_file_error(mock_stdout: MagicMock) -> None:
+    start_solving(BASE_TEST_DIR / "I_don't_exist.txt")
+    assert mock_stdout.getvalue().strip() == GAME_OUTPUT_MESSAGES[GameCode.FILE_ERROR]
+
+
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_start_conversion(mock_stdout: MagicMock, tmp_path: Path) -> None:
+    output = tmp_path / "games.c4b"
+    start_conversion(
+        [str(BASE_TEST_DIR / "draw"), str(BASE_TEST_DIR / "file_error")], output
+    )
+
+    assert mock_stdout.getvalue().splitlines() == [
+        f"{BASE_TEST_DIR / 'file_error' / 'bad_file.pdf'}: skipped",
+        f"Converted 1 games into {output}",
+    ]
+    assert list(check_container(output)) == [GameCode.DRAW]